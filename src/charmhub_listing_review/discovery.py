@@ -0,0 +1,113 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Find the charms in a repository.
+
+Monorepos can hold many charms, alongside large trees that never contain one,
+such as ``node_modules``, virtual environments, and vendored wheels. Rather
+than globbing for ``**/charmcraft.yaml``, the repository is walked with
+:func:`os.scandir`, without descending into hidden, vendored, or build
+directories, or following symbolic links.
+"""
+
+import os
+import pathlib
+import re
+from typing import NamedTuple
+
+# Directories that hold dependencies or build output, rather than charms.
+SKIPPED_DIRS = frozenset({
+    '__pycache__',
+    'build',
+    'dist',
+    'node_modules',
+    'parts',
+    'prime',
+    'site-packages',
+    'stage',
+    'vendor',
+    'venv',
+    'wheelhouse',
+})
+# How deep in the repository to look for charms.
+MAX_DEPTH = 6
+
+# The metadata is read from the top-level keys, rather than by parsing the
+# whole file, which can be long for charms with many options.
+_TOP_LEVEL_KEY = re.compile(r'^(name|type|base):[ \t]*([^#\r\n]*)', re.MULTILINE)
+_MAX_METADATA_BYTES = 64 * 1024
+
+
+class Charm(NamedTuple):
+    """A charm found in a repository."""
+
+    path: str
+    """The directory containing ``charmcraft.yaml``, relative to the repository root."""
+    name: str
+    """The charm's name, or '' if it isn't set in ``charmcraft.yaml``."""
+    type: str
+    """The ``type`` in ``charmcraft.yaml``, such as 'charm', or '' if it isn't set."""
+    base: str
+    """The ``base`` in ``charmcraft.yaml``, or '' if it isn't set (such as when ``bases`` is)."""
+
+
+def find_charms(repo_dir: pathlib.Path, max_depth: int = MAX_DEPTH) -> list[Charm]:
+    """Every directory in ``repo_dir`` that contains a ``charmcraft.yaml``, sorted by path."""
+    charms: list[Charm] = []
+    pending: list[tuple[str, int]] = [('', 0)]
+    while pending:
+        relative, depth = pending.pop()
+        try:
+            with os.scandir(os.path.join(repo_dir, relative)) as entries:
+                for entry in entries:
+                    if entry.name == 'charmcraft.yaml' and entry.is_file():
+                        charms.append(_read_charm(relative or '.', entry.path))
+                    elif (
+                        depth < max_depth
+                        and not entry.name.startswith('.')
+                        and entry.name not in SKIPPED_DIRS
+                        and entry.is_dir(follow_symlinks=False)
+                    ):
+                        pending.append((f'{relative}/{entry.name}'.lstrip('/'), depth + 1))
+        except OSError:
+            continue
+    return sorted(charms)
+
+
+def _read_charm(path: str, charmcraft_yaml: str) -> Charm:
+    try:
+        with open(charmcraft_yaml, encoding='utf-8', errors='replace') as f:
+            content = f.read(_MAX_METADATA_BYTES)
+    except OSError:
+        content = ''
+    metadata: dict[str, str] = {}
+    for key, value in _TOP_LEVEL_KEY.findall(content):
+        metadata.setdefault(key, value.strip().strip('\'"'))
+    return Charm(
+        path, metadata.get('name', ''), metadata.get('type', ''), metadata.get('base', '')
+    )
+
+
+def suggest(charms: list[Charm], charm_dir: str, charm_name: str = '') -> list[Charm]:
+    """The charms that were most likely meant by ``charm_dir``, best first.
+
+    A charm with the expected name is the best match, then ones with similar
+    paths.
+    """
+    import difflib
+
+    named = [charm for charm in charms if charm_name and charm.name == charm_name]
+    paths = difflib.get_close_matches(charm_dir, [charm.path for charm in charms], n=3)
+    similar = [charm for path in paths for charm in charms if charm.path == path]
+    return list(dict.fromkeys(named + similar))
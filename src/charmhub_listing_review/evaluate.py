@@ -23,43 +23,507 @@ for the reviewer, and is also a way for charm publishers to check their charm
 against the listing requirements before submitting a listing request.
 """
 
+import errno
 import fnmatch
+import functools
 import hashlib
 import math
+import os
 import pathlib
 import re
 import shutil
+import signal
 import subprocess  # noqa: S404
-import tempfile
-import tomllib
-import urllib.error
-import urllib.request
-import xml.etree.ElementTree as ET  # noqa: S405
-from typing import Any
+import sys
+import threading
+import time
+import types
+import urllib.parse
+from collections.abc import Callable, Collection, Iterator
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-import yaml
+from . import links
 
+if TYPE_CHECKING:
+    import resource
 
-def _url_ok(url: str, *, method: str = 'HEAD', timeout: int = 5) -> bool:
-    """Whether ``url`` resolves with a successful (non-error) status."""
+    from .discovery import Charm
+
+
+class Cancelled(Exception):  # noqa: N818
+    """The evaluation was cancelled, typically because newer input arrived."""
+
+
+# How many charms to list when the charm directory is wrong.
+_MAX_LISTED_CHARMS = 10
+
+
+class CharmDirError(ValueError):
+    """The charm directory is not a charm in the repository.
+
+    The message suggests the charms that were probably meant, or lists the
+    charms in the repository.
+
+    Attributes:
+        charm_dir: The charm directory that was given.
+        charms: The charms found in the repository.
+        suggestions: The charms that were most likely meant, best first.
+    """
+
+    def __init__(
+        self, problem: str, charm_dir: str, charms: list['Charm'], suggestions: list['Charm']
+    ):
+        self.charm_dir = charm_dir
+        self.charms = charms
+        self.suggestions = suggestions
+        hint = self.hint()
+        super().__init__(f'{problem}. {hint}' if hint else problem)
+
+    def hint(self, quote: Callable[[str], str] = repr) -> str:
+        """Suggest the charms that were probably meant, or list the charms in the repository.
+
+        Each path is formatted with ``quote``. If there are no charms, the
+        hint is empty.
+        """
+        if self.suggestions:
+            return f'Did you mean {" or ".join(quote(c.path) for c in self.suggestions)}?'
+        if not self.charms:
+            return ''
+        listed = ', '.join(quote(c.path) for c in self.charms[:_MAX_LISTED_CHARMS])
+        more = len(self.charms) - _MAX_LISTED_CHARMS
+        return f'The charms in the repository are in {listed}' + (
+            f', and {more} more.' if more > 0 else '.'
+        )
+
+
+def _check_cancelled(cancel: threading.Event | None):
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+
+
+def _run(cmd: list[str], cancel: threading.Event | None = None):
+    """Run a command to completion, discarding its output.
+
+    If ``cancel`` is set while the command is running, the command (and
+    anything it started) is killed, and :class:`Cancelled` is raised.
+
+    Raises:
+        subprocess.CalledProcessError: if the command fails.
+    """
+    if cancel is None:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    returncode, _ = _wait(cmd, cancel)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+class ResourceLimits(NamedTuple):
+    """The resources that each command run by a check may use.
+
+    The limits apply to each process separately (``tox`` and the test runner
+    it starts each get their own), since they are set with
+    :func:`resource.setrlimit`. ``None`` means no limit.
+    """
+
+    memory: int | None = 8 * 1024**3
+    """The address space of each process, in bytes."""
+    cpu_time: int | None = 30 * 60
+    """The CPU time of each process, in seconds."""
+    open_files: int | None = 4096
+    """The number of files each process may have open."""
+    file_size: int | None = 4 * 1024**3
+    """The size of each file a process writes, in bytes.
+
+    There is no quota for the total disk space used, which would need the
+    file system to support quotas.
+    """
+
+
+_RLIMITS = {
+    'memory': 'RLIMIT_AS',
+    'cpu_time': 'RLIMIT_CPU',
+    'open_files': 'RLIMIT_NOFILE',
+    'file_size': 'RLIMIT_FSIZE',
+}
+_SIZE_SUFFIXES = {'K': 1024, 'M': 1024**2, 'G': 1024**3}
+
+# Run in a new interpreter, just before the command, to set the limits.
+# Setting them with ``preexec_fn`` isn't safe while other threads are running.
+# Python ignores SIGPIPE and SIGXFSZ, so they are restored for the command.
+_SET_LIMITS = """
+import os, resource, signal, sys
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+signal.signal(signal.SIGXFSZ, signal.SIG_DFL)
+end = sys.argv.index('--')
+for limit in sys.argv[1:end]:
+    name, value = limit.split('=')
+    which = getattr(resource, name)
+    _, hard = resource.getrlimit(which)
+    value = int(value) if hard == resource.RLIM_INFINITY else min(int(value), hard)
+    resource.setrlimit(which, (value, value))
+os.execv(sys.argv[end + 1], sys.argv[end + 1:])
+"""
+
+
+def tooling_limits() -> ResourceLimits:
+    """The limits for the charm's tooling commands.
+
+    The defaults can be changed with the ``CHARMHUB_LISTING_REVIEW_TOOLING_LIMITS``
+    environment variable, which is a comma-separated list of ``name=value``
+    pairs, such as ``memory=2G,cpu_time=600``. The names are the fields of
+    :class:`ResourceLimits`, sizes can have a ``K``, ``M``, or ``G`` suffix, and
+    ``unlimited`` removes the limit.
+
+    The ``update-issue``, ``self-review``, and service commands read it once,
+    when they start, and pass the limits to :func:`evaluate`, so that a bad
+    value is reported before any review runs.
+
+    Raises:
+        ValueError: if the environment variable is not valid.
+    """
+    setting = os.environ.get('CHARMHUB_LISTING_REVIEW_TOOLING_LIMITS', '')
+    limits: dict[str, int | None] = {}
+    for pair in filter(None, (pair.strip() for pair in setting.split(','))):
+        name, _, value = pair.partition('=')
+        name, value = name.strip(), value.strip().upper()
+        if name not in ResourceLimits._fields:
+            expected = ', '.join(ResourceLimits._fields)
+            raise ValueError(f'Unknown tooling limit {name!r}, expected one of: {expected}')
+        if value == 'UNLIMITED':
+            limits[name] = None
+            continue
+        scale = _SIZE_SUFFIXES.get(value[-1:], 1)
+        number = value[:-1] if scale > 1 else value
+        if not number.isdigit():
+            raise ValueError(f'Invalid value for tooling limit {name!r}: {value!r}')
+        limits[name] = int(number) * scale
+    return ResourceLimits(**limits)
+
+
+class ResourceUsage(NamedTuple):
+    """The resources that the commands run by a check used."""
+
+    cpu_time: float
+    """The user and system CPU time, in seconds."""
+    max_rss: int
+    """The peak resident memory of the largest process, in bytes."""
+
+
+_usage = threading.local()
+
+
+def _run_limited(
+    cmd: list[str],
+    limits: ResourceLimits,
+    cancel: threading.Event | None = None,
+    cwd: pathlib.Path | None = None,
+) -> ResourceUsage:
+    """Run a command to completion within ``limits``, discarding its output.
+
+    The command's resource usage (including anything it started and waited
+    for) is returned, and added to the usage of the check that is running.
+
+    Raises:
+        FileNotFoundError: if the command is not installed.
+        subprocess.CalledProcessError: if the command fails, including when
+            it is killed for exceeding a limit.
+        Cancelled: if ``cancel`` is set while the command is running.
+    """
+    executable = shutil.which(cmd[0])
+    if executable is None:
+        raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), cmd[0])
+    rlimits = [
+        f'{_RLIMITS[name]}={value}'
+        for name, value in limits._asdict().items()
+        if value is not None
+    ]
+    returncode, rusage = _wait(
+        [sys.executable, '-I', '-S', '-c', _SET_LIMITS, *rlimits, '--', executable, *cmd[1:]],
+        cancel,
+        cwd,
+    )
+    # ru_maxrss is in kilobytes on Linux.
+    usage = ResourceUsage(rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss * 1024)
+    total = getattr(_usage, 'total', None)
+    if total is not None:
+        _usage.total = ResourceUsage(
+            total.cpu_time + usage.cpu_time, max(total.max_rss, usage.max_rss)
+        )
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return usage
+
+
+def _wait(
+    cmd: list[str], cancel: threading.Event | None, cwd: pathlib.Path | None = None
+) -> 'tuple[int, resource.struct_rusage]':
+    """Run a command, and return its exit code and resource usage.
+
+    If ``cancel`` is set while the command is running, the command (and
+    anything it started) is killed, and :class:`Cancelled` is raised.
+    """
+    with subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    ) as proc:
+        while True:
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if cancel is not None and cancel.is_set():
+                os.killpg(proc.pid, signal.SIGKILL)
+                _, status, _ = os.wait4(proc.pid, 0)
+                proc.returncode = os.waitstatus_to_exitcode(status)
+                raise Cancelled()
+            time.sleep(0.1)
+        # The process has been reaped here, so Popen mustn't wait for it.
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, rusage
+
+
+class LocalRepository:
+    """A local copy of the repository under review.
+
+    Links into the same repository and branch (such as the ``.../blob/main/LICENSE``
+    links that are built from the issue form) can be answered from this copy,
+    rather than fetched over the network.
+    """
+
+    def __init__(self, repository_url: str, branch: str, path: pathlib.Path):
+        self.path = path
+        self.repository_url = _normalise_url(repository_url)
+        self.branch = branch or _checked_out_branch(path)
+
+    def local_path(self, url: str) -> pathlib.Path | None:
+        """The path that ``url`` refers to, if it is in this repository and branch.
+
+        The path is returned whether or not it exists. If ``url`` is not a link
+        into this repository and branch, return ``None``.
+        """
+        target = _normalise_url(url)
+        if target == self.repository_url:
+            return self.path
+        for prefix in _repository_prefixes(self.repository_url, self.branch):
+            if not target.startswith(prefix):
+                continue
+            relative = urllib.parse.unquote(target[len(prefix) :])
+            root = self.path.resolve()
+            candidate = (root / relative).resolve()
+            if candidate.is_relative_to(root):
+                return candidate
+        return None
+
+
+def _normalise_url(url: str) -> str:
+    """Normalise ``url`` for comparison, dropping the query, fragment, and any ``.git``."""
+    parts = urllib.parse.urlsplit(url.strip())
+    path = parts.path.rstrip('/').removesuffix('.git')
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, '', ''))
+
+
+def _repository_prefixes(repository_url: str, branch: str) -> list[str]:
+    """The URL prefixes of files on ``branch`` of the (normalised) repository URL."""
+    if not branch:
+        return []
+    prefixes = [f'{repository_url}/{kind}/{branch}/' for kind in ('blob', 'raw', 'tree')]
+    github = 'https://github.com/'
+    if repository_url.startswith(github):
+        owner_repo = repository_url.removeprefix(github)
+        raw = f'https://raw.githubusercontent.com/{owner_repo}'
+        prefixes.append(f'{raw}/{branch}/')
+        prefixes.append(f'{raw}/refs/heads/{branch}/')
+    return prefixes
+
+
+def _links_into_repository(url: str, repository_url: str, branch: str) -> bool:
+    """Whether ``url`` may be answered from a clone of ``branch`` of the repository.
+
+    This can be decided before the clone exists, except when the branch is not
+    known yet, in which case any link might be into the repository.
+    """
+    if not branch:
+        return True
+    target = _normalise_url(url)
+    repository_url = _normalise_url(repository_url)
+    return target == repository_url or any(
+        target.startswith(prefix) for prefix in _repository_prefixes(repository_url, branch)
+    )
+
+
+def _checked_out_branch(repo_dir: pathlib.Path) -> str:
+    """The name of the branch checked out in ``repo_dir``, or '' if it is unknown."""
     try:
-        request = urllib.request.Request(url, method=method)  # noqa: S310
-        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
-            return response.status < 400
-    except (urllib.error.URLError, OSError, ValueError):
-        return False
+        head = (repo_dir / '.git' / 'HEAD').read_text().strip()
+    except OSError:
+        return ''
+    return head.removeprefix('ref: refs/heads/') if head.startswith('ref: refs/heads/') else ''
+
+
+class WorkingTree(NamedTuple):
+    """A local checkout of a charm repository, to be evaluated in place."""
 
+    path: pathlib.Path
+    """The top of the working tree."""
+    repository_url: str
+    """The URL of the repository, or a ``file:`` URL of the working tree if it has no remote."""
+    branch: str
+    """The branch that is checked out, or ``HEAD`` if that is not known."""
+    charm_dir: str
+    """The directory that was given, relative to the top of the working tree."""
+
+
+def working_tree(path: pathlib.Path) -> WorkingTree:
+    """Work out the repository and branch of a local checkout from its git metadata.
+
+    ``path`` may be the top of the working tree or, in a monorepo, the charm
+    directory within it. A directory that is not in a git repository is
+    treated as a working tree with no remote.
+
+    Raises:
+        ValueError: if ``path`` is not a directory.
+    """
+    path = path.resolve()
+    if not path.is_dir():
+        raise ValueError(f'not a directory: {str(path)!r}')
+    top = _git(path, 'rev-parse', '--show-toplevel')
+    root = pathlib.Path(top).resolve() if top else path
+    branch = _git(path, 'symbolic-ref', '--short', '-q', 'HEAD')
+    remote = _git(path, 'config', '--get', f'branch.{branch}.remote') if branch else ''
+    remote_url = _git(path, 'config', '--get', f'remote.{remote or "origin"}.url')
+    return WorkingTree(
+        root,
+        _remote_to_url(remote_url) if remote_url else root.as_uri(),
+        branch or 'HEAD',
+        path.relative_to(root).as_posix(),
+    )
 
-def _fetch_url(url: str, *, timeout: int = 5) -> str | None:
-    """Fetch ``url`` as text, or return ``None`` on any error or non-2xx/3xx status."""
+
+def _git(repo_dir: pathlib.Path, *args: str) -> str:
+    """The output of a git command run in ``repo_dir``, or '' if it fails."""
     try:
-        request = urllib.request.Request(url, method='GET')  # noqa: S310
-        with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
-            if response.status >= 400:
+        result = subprocess.run(
+            ['/usr/bin/git', '-C', str(repo_dir), *args],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=5,
+        )
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError):
+        return ''
+    return result.stdout.strip()
+
+
+def _remote_to_url(remote_url: str) -> str:
+    """The web URL of a git remote, such as ``git@github.com:org/repo.git``.
+
+    Any credentials in the URL are dropped, since the URL ends up in links.
+    """
+    scp_like = re.fullmatch(r'(?:[^@/]+@)?([^:/]+):(?!//)(.+)', remote_url)
+    if scp_like:
+        remote_url = f'https://{scp_like[1]}/{scp_like[2]}'
+    parts = urllib.parse.urlsplit(remote_url)
+    if parts.scheme in ('ssh', 'git', 'git+ssh'):
+        parts = parts._replace(scheme='https')
+    netloc = parts.hostname or ''
+    if parts.scheme == 'https' and parts.port not in (None, 22, 443):
+        netloc = f'{netloc}:{parts.port}'
+    path = parts.path.rstrip('/').removesuffix('.git')
+    return urllib.parse.urlunsplit((parts.scheme, netloc, path, '', ''))
+
+
+def _url_ok(url: str, local_repo: LocalRepository | None = None) -> bool:
+    """Whether ``url`` resolves with a successful (non-error) status.
+
+    Links into ``local_repo`` are checked against the local copy. Other
+    results are shared across the whole run (and cached between runs), so
+    checks can ask about the same URL without probing it again.
+    """
+    if local_repo is not None:
+        path = local_repo.local_path(url)
+        if path is not None:
+            return path.exists()
+    return links.url_ok(url)
+
+
+def _fetch_url(url: str, local_repo: LocalRepository | None = None) -> str | None:
+    """Fetch ``url`` as text, or return ``None`` on any error or non-2xx/3xx status.
+
+    Links into ``local_repo`` are read from the local copy.
+    """
+    if local_repo is not None:
+        path = local_repo.local_path(url)
+        if path is not None:
+            try:
+                return path.read_bytes().decode('utf-8', errors='replace')
+            except OSError:
                 return None
-            return response.read().decode('utf-8', errors='replace')
-    except (urllib.error.URLError, OSError, ValueError):
-        return None
+    return links.fetch(url)
+
+
+class CheckResult(NamedTuple):
+    """The result of one of the automated checks."""
+
+    name: str
+    """The name of the check."""
+    item: str
+    """The Markdown checklist item, ticked if the check passed."""
+    index: int
+    """The position of the item in the checklist."""
+    total: int
+    """The number of checks in the evaluation."""
+    duration: float
+    """How long the check took, in seconds."""
+    timed_out: bool = False
+    """Whether the check did not finish before the deadline."""
+    usage: ResourceUsage | None = None
+    """The resources used by the commands the check ran, if it ran any."""
+
+    @property
+    def passed(self) -> bool:
+        """Whether the check determined that the criteria is met."""
+        return self.item.startswith('* [x]')
+
+
+# What a check can need before it runs. The clone and the parsed charmcraft.yaml
+# are stages that the check waits for; the others describe what the check does.
+CLONE = 'clone'
+CHARMCRAFT_YAML = 'charmcraft.yaml'
+NETWORK = 'network'
+SUBPROCESS = 'subprocess'
+
+_MAX_WORKERS = 8
+# The clone may use at most this share of the deadline, so that there is
+# always time left for the checks that need it.
+_CLONE_SHARE = 0.5
+_TIMED_OUT_ITEM = '* [ ] Timed out: the `{}` check did not finish in time.'
+
+
+class Check(NamedTuple):
+    """An automated check, and what it needs before it can run.
+
+    ``args`` names the arguments that ``function`` is called with: any of the
+    arguments to :func:`evaluate`, or ``charm_path`` (the charm directory in
+    the clone), ``local_repo`` (a :class:`LocalRepository` for the clone), and
+    ``cancel``. A check that takes a link and ``local_repo`` only waits for the
+    clone if the link is into the repository; otherwise it is given ``None``.
+
+    ``files`` are glob patterns, relative to the charm directory, for the
+    files that the check reads, so that it can be run again when they change.
+    """
+
+    function: types.FunctionType
+    args: tuple[str, ...]
+    needs: frozenset[str] = frozenset()
+    files: tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        """The name of the check."""
+        return self.function.__name__
 
 
 def evaluate(
@@ -71,6 +535,11 @@ def evaluate(
     security_url: str,
     branch: str = '',
     charm_dir: str = '.',
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+    deadline: float | None = None,
+    repo_dir: pathlib.Path | None = None,
+    limits: ResourceLimits | None = None,
 ) -> list[str]:
     """Evaluate the charm for listing on Charmhub.
 
@@ -88,39 +557,264 @@ def evaluate(
     The ``charm_dir`` parameter allows specifying a relative path to the charm
     directory within the repository, defaulting to '.' (repository root). This
     is useful for monorepos where charms live in subdirectories.
+
+    If ``mirror_dir`` is provided, the repository is cloned via a local mirror
+    in that directory, which speeds up repeated reviews of the same repository.
+
+    If ``cancel`` is set during the evaluation, any running command is killed,
+    the clone is removed, and :class:`Cancelled` is raised.
+
+    If ``deadline`` is provided, the evaluation takes at most that many
+    seconds. The clone may use up to half of the time, and the checks the rest.
+    When the time runs out, any running command is killed, and the checks that
+    have not finished are returned as unticked "Timed out" items, rather than
+    an error being raised.
+
+    If ``repo_dir`` is provided, that working tree (see :func:`working_tree`)
+    is evaluated in place, rather than cloning the repository. It is never
+    copied or removed. ``repository_url`` and ``branch`` are then only used to
+    recognise links into the repository, which are answered from the working
+    tree.
+
+    ``limits`` are the resources that each of the charm's tooling commands may
+    use, defaulting to those of :class:`ResourceLimits` (see
+    :func:`tooling_limits`).
+
+    To see each result as soon as it is available, use :func:`evaluate_iter`.
     """
-    results: list[str] = []
+    results = sorted(
+        evaluate_iter(
+            charm_name,
+            repository_url,
+            linting_url,
+            contribution_url,
+            license_url,
+            security_url,
+            branch,
+            charm_dir=charm_dir,
+            mirror_dir=mirror_dir,
+            cancel=cancel,
+            deadline=deadline,
+            repo_dir=repo_dir,
+            limits=limits,
+        ),
+        key=lambda result: result.index,
+    )
+    return [result.item for result in results]
+
+
+def evaluate_iter(
+    charm_name: str,
+    repository_url: str,
+    linting_url: str,
+    contribution_url: str,
+    license_url: str,
+    security_url: str,
+    branch: str = '',
+    charm_dir: str = '.',
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+    deadline: float | None = None,
+    repo_dir: pathlib.Path | None = None,
+    checks: Collection[int] | None = None,
+    limits: ResourceLimits | None = None,
+) -> Iterator[CheckResult]:
+    """Evaluate the charm, yielding the result of each check as it completes.
+
+    The arguments are the same as for :func:`evaluate`. The checks in
+    :data:`CHECKS` are run concurrently, each starting as soon as what it needs
+    is available: checks that only need links and names run while the
+    repository is being cloned, and the rest start when the clone (and then the
+    parsed charmcraft.yaml) is ready.
+
+    Results are not necessarily yielded in checklist order: use their ``index``
+    to put them in order. The clone is removed when the generator finishes or
+    is closed (a ``repo_dir`` is left as it is).
+
+    If ``checks`` is provided, only the checks in :data:`CHECKS` at those
+    indexes are run.
+    """
+    import concurrent.futures
+
     charm_dir_path = pathlib.PurePosixPath(charm_dir)
     if charm_dir_path.is_absolute() or '..' in charm_dir_path.parts:
         raise ValueError(
             f"charm_dir must be a relative path without '..' components, got: {charm_dir!r}"
         )
-    repo_dir = _clone_repo(repository_url, branch)
+    # Commands are stopped with these, rather than with ``cancel``, so that
+    # they can also be stopped when time runs out or the generator is closed.
+    # The clone has its own, since its share of the time runs out first.
+    stop = threading.Event()
+    stop_clone = threading.Event()
+    started = time.monotonic()
+    expires = math.inf if deadline is None else started + deadline
+    clone_expires = math.inf if deadline is None else started + deadline * _CLONE_SHARE
+    values: dict[str, Any] = {
+        'charm_name': charm_name,
+        'repository_url': repository_url,
+        'linting_url': linting_url,
+        'contribution_url': contribution_url,
+        'license_url': license_url,
+        'security_url': security_url,
+        'cancel': stop,
+        'limits': limits or ResourceLimits(),
+    }
+    # The stages that each check is waiting for. Checks that only look at
+    # links outside the repository don't wait for the clone at all.
+    waiting: dict[int, set[str]] = {}
+    for index, check in enumerate(CHECKS):
+        if checks is not None and index not in checks:
+            continue
+        stages = set(check.needs & {CLONE, CHARMCRAFT_YAML})
+        if CLONE not in stages and 'local_repo' in check.args:
+            url = values[check.args[0]]
+            if _links_into_repository(url, repository_url, branch):
+                stages.add(CLONE)
+        waiting[index] = stages
+    ready: set[str] = set()
+    check_started: dict[int, float] = {}
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=_MAX_WORKERS, thread_name_prefix='evaluate'
+    )
+    if repo_dir is None:
+        clone = executor.submit(_clone_repo, repository_url, branch, mirror_dir, stop_clone)
+    else:
+        # The working tree is used as it is, so is ready straight away.
+        clone = concurrent.futures.Future()
+        clone.set_result(repo_dir)
+    running: dict[concurrent.futures.Future[Any], str | int] = {clone: CLONE}
+    out_of_time = False
     try:
-        charm_path = (repo_dir / charm_dir).resolve()
-        if not charm_path.is_dir():
-            raise ValueError(f'charm_dir does not exist or is not a directory: {charm_dir!r}')
-        if not str(charm_path).startswith(str(repo_dir.resolve())):
-            raise ValueError(f'charm_dir resolves outside the repository: {charm_dir!r}')
-        results.append(coding_conventions(linting_url))
-        results.append(contribution_guidelines(contribution_url))
-        results.append(license_statement(license_url))
-        results.append(security_doc(security_url))
-        results.append(metadata_links(charm_path))
-        results.append(check_charm_name(charm_name))
-        results.append(action_names(charm_path))
-        results.append(option_names(charm_path))
-        results.append(repository_name(repository_url, charm_name))
-        results.append(relations_includes_optional(charm_path))
-        results.append(charmcraft_tooling(charm_path))
-        results.append(charm_plugin_strict_dependencies(charm_path))
-        results.append(python_requires_version(charm_path))
-        results.append(repo_has_lock_file(charm_path))
-        results.append(charm_has_icon(charm_path))
-        results.append(charm_lib_docs(charm_path))
+        while running or waiting:
+            _check_cancelled(cancel)
+            # Start the commands first, since they are usually the slowest.
+            startable = [index for index, stages in waiting.items() if stages <= ready]
+            startable.sort(key=lambda index: SUBPROCESS not in CHECKS[index].needs)
+            for index in startable:
+                del waiting[index]
+                check = CHECKS[index]
+                args = [values.get(name) for name in check.args]
+                check_started[index] = time.monotonic()
+                running[executor.submit(_run_check, check, args)] = index
+            next_expiry = expires if CLONE in ready else min(expires, clone_expires)
+            done, _ = concurrent.futures.wait(
+                running,
+                timeout=max(0, min(0.1, next_expiry - time.monotonic())),
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in done:
+                task = running.pop(future)
+                if task == CLONE:
+                    if stop_clone.is_set() and isinstance(future.exception(), Cancelled):
+                        # The clone ran out of time, so everything that needs
+                        # it has too.
+                        for index in [i for i, stages in waiting.items() if CLONE in stages]:
+                            del waiting[index]
+                            yield _timed_out(index, 0)
+                        continue
+                    checkout = future.result()
+                    charm_path = (checkout / charm_dir).resolve()
+                    if not charm_path.is_dir():
+                        raise _charm_dir_error(
+                            f'charm_dir does not exist or is not a directory: {charm_dir!r}',
+                            checkout,
+                            charm_dir,
+                            charm_name,
+                        )
+                    if not str(charm_path).startswith(str(checkout.resolve())):
+                        raise ValueError(
+                            f'charm_dir resolves outside the repository: {charm_dir!r}'
+                        )
+                    if not (charm_path / 'charmcraft.yaml').is_file():
+                        error = _charm_dir_error(
+                            f'charm_dir does not contain a charmcraft.yaml: {charm_dir!r}',
+                            checkout,
+                            charm_dir,
+                            charm_name,
+                        )
+                        # If there are no charms at all, let the checks report
+                        # what is missing.
+                        if error.charms:
+                            raise error
+                    local_repo = LocalRepository(repository_url, branch, checkout)
+                    values.update(charm_path=charm_path, local_repo=local_repo)
+                    if any(CHARMCRAFT_YAML in stages for stages in waiting.values()):
+                        running[executor.submit(_read_charmcraft_yaml, charm_path, local_repo)] = (
+                            CHARMCRAFT_YAML
+                        )
+                    else:
+                        ready.add(CHARMCRAFT_YAML)
+                    ready.add(CLONE)
+                elif task == CHARMCRAFT_YAML:
+                    future.result()
+                    ready.add(CHARMCRAFT_YAML)
+                elif isinstance(task, int):
+                    item, duration, usage = future.result()
+                    yield CheckResult(
+                        CHECKS[task].name, item, task, len(CHECKS), duration, usage=usage
+                    )
+            now = time.monotonic()
+            if now >= expires:
+                out_of_time = True
+                unfinished = [task for task in running.values() if isinstance(task, int)]
+                for index in sorted([*unfinished, *waiting]):
+                    yield _timed_out(index, now - check_started.get(index, now))
+                return
+            if now >= clone_expires and CLONE not in ready:
+                stop_clone.set()
     finally:
-        shutil.rmtree(str(repo_dir), ignore_errors=True)
-    return results
+        stop.set()
+        stop_clone.set()
+        # Checks that ran out of time may be waiting on the network, which
+        # can't be interrupted, so are left to finish in the background.
+        executor.shutdown(wait=not out_of_time, cancel_futures=True)
+        concurrent.futures.wait([clone])
+        if repo_dir is None and not clone.cancelled() and clone.exception() is None:
+            shutil.rmtree(str(clone.result()), ignore_errors=True)
+
+
+def _charm_dir_error(
+    problem: str, repo_dir: pathlib.Path, charm_dir: str, charm_name: str
+) -> CharmDirError:
+    """An error for a charm directory that isn't a charm, suggesting the ones in the repository.
+
+    The repository is only searched once the directory is known to be wrong,
+    so correct requests don't pay for it.
+    """
+    from .discovery import find_charms, suggest
+
+    charms = find_charms(repo_dir)
+    normalised = pathlib.PurePosixPath(charm_dir).as_posix()
+    return CharmDirError(problem, charm_dir, charms, suggest(charms, normalised, charm_name))
+
+
+def _timed_out(index: int, duration: float) -> CheckResult:
+    """The result for a check that did not finish before the deadline."""
+    name = CHECKS[index].name
+    item = _TIMED_OUT_ITEM.format(name)
+    return CheckResult(name, item, index, len(CHECKS), duration, timed_out=True)
+
+
+def _run_check(check: 'Check', args: list[Any]) -> tuple[str, float, ResourceUsage | None]:
+    """Run the check, returning the checklist item, its duration, and what its commands used."""
+    start = time.monotonic()
+    _usage.total = ResourceUsage(0, 0) if SUBPROCESS in check.needs else None
+    try:
+        item = check.function(*args)
+        total = _usage.total
+    finally:
+        _usage.total = None
+    return item, time.monotonic() - start, total
+
+
+def _read_charmcraft_yaml(charm_path: pathlib.Path, local_repo: LocalRepository):
+    """Parse charmcraft.yaml for the checks that need it, and probe the links in it.
+
+    The links are probed concurrently, so that :func:`metadata_links` doesn't
+    have to check them one at a time.
+    """
+    urls = _metadata_link_urls(charm_path)
+    links.check_urls(url for url in urls if local_repo.local_path(url) is None)
 
 
 def coding_conventions(linting_url: str) -> str:
@@ -136,7 +830,9 @@ def coding_conventions(linting_url: str) -> str:
     return '* [ ] The charm implements coding conventions in CI.'
 
 
-def contribution_guidelines(contribution_url: str) -> str:
+def contribution_guidelines(
+    contribution_url: str, local_repo: LocalRepository | None = None
+) -> str:
     """The documentation for contribution resolves with a 2xx status code.
 
     The documentation for contributing to the charm should be separate from the
@@ -145,7 +841,7 @@ def contribution_guidelines(contribution_url: str) -> str:
     description = '* [ ] The charm provides contribution guidelines.'
     # Ideally, this would also check that the content of the URL is actually a
     # reasonable contribution guide, but that is more difficult to automate.
-    if _url_ok(contribution_url):
+    if _url_ok(contribution_url, local_repo):
         return description.replace('* [ ]', '* [x]')
     return description
 
@@ -159,14 +855,14 @@ _known_licenses = {
 }
 
 
-def license_statement(license_url: str) -> str:
+def license_statement(license_url: str, local_repo: LocalRepository | None = None) -> str:
     """The charm's license statement resolves with a 2xx status code.
 
     For the charm shared, OSS or not, the licensing terms of the charm are
     clarified (which also implies an identified authorship of the charm).
     """
     description = '* [ ] The charm provides a license statement.'
-    text = _fetch_url(license_url)
+    text = _fetch_url(license_url, local_repo)
     if text is None:
         return description
     # Check for known licenses, with a simple hash.
@@ -177,7 +873,7 @@ def license_statement(license_url: str) -> str:
     return description
 
 
-def security_doc(security_url: str) -> str:
+def security_doc(security_url: str, local_repo: LocalRepository | None = None) -> str:
     """The charm's security documentation resolves with a 2xx status code.
 
     The charm's security documentation explains which versions are supported,
@@ -186,7 +882,7 @@ def security_doc(security_url: str) -> str:
     description = '* [ ] The charm provides a security statement.'
     # Ideally, this would also check some of the content of the security doc,
     # like that it has a section on how to report security issues.
-    if _url_ok(security_url):
+    if _url_ok(security_url, local_repo):
         return description.replace('* [ ]', '* [x]')
     return description
 
@@ -209,38 +905,115 @@ def get_default_branch(repository_url: str) -> str:
     return 'main'
 
 
-def _clone_repo(charm_repo_url: str, branch: str = '') -> pathlib.Path:
-    """Clone the charm repository to a temporary directory."""
+_mirror_locks: dict[pathlib.Path, threading.Lock] = {}
+_mirror_locks_lock = threading.Lock()
+
+
+def _update_mirror(
+    charm_repo_url: str, mirror_dir: pathlib.Path, cancel: threading.Event | None = None
+) -> pathlib.Path:
+    """Create or refresh a local mirror of the repository, and return its path.
+
+    Mirrors let a long-running process fetch only what has changed since the
+    last review of the same repository, rather than cloning it from scratch.
+    """
+    key = hashlib.sha256(charm_repo_url.encode('utf-8')).hexdigest()[:16]
+    mirror = mirror_dir / f'{key}.git'
+    with _mirror_locks_lock:
+        lock = _mirror_locks.setdefault(mirror, threading.Lock())
+    with lock:
+        if (mirror / 'HEAD').is_file():
+            cmd = ['/usr/bin/git', '-C', str(mirror), 'remote', 'update', '--prune']
+        else:
+            mirror_dir.mkdir(parents=True, exist_ok=True)
+            shutil.rmtree(mirror, ignore_errors=True)
+            cmd = ['/usr/bin/git', 'clone', '--mirror', charm_repo_url, str(mirror)]
+        _run(cmd, cancel)
+    return mirror
+
+
+def _clone_repo(
+    charm_repo_url: str,
+    branch: str = '',
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+) -> pathlib.Path:
+    """Clone the charm repository to a temporary directory.
+
+    If ``mirror_dir`` is provided, the repository is cloned from a local
+    mirror kept in that directory, which is first brought up to date.
+    """
+    source = charm_repo_url
+    if mirror_dir is not None:
+        try:
+            source = _update_mirror(charm_repo_url, mirror_dir, cancel).as_uri()
+        except subprocess.CalledProcessError:
+            # Fall back to cloning directly from the repository.
+            pass
+    import tempfile
+
     temp_dir = tempfile.mkdtemp()
     try:
         cmd = ['/usr/bin/git', 'clone', '--depth', '1']
         if branch:
             cmd += ['--branch', branch]
-        cmd += [charm_repo_url, temp_dir]
-        subprocess.run(
-            cmd,
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
+        cmd += [source, temp_dir]
+        _run(cmd, cancel)
         return pathlib.Path(temp_dir)
-    except subprocess.CalledProcessError:
+    except (subprocess.CalledProcessError, Cancelled):
         shutil.rmtree(temp_dir)
         raise
 
 
 def _get_charmcraft_yaml(repo_dir: pathlib.Path) -> dict[Any, Any] | None:
+    """The parsed charmcraft.yaml in ``repo_dir``, or ``None`` if it can't be read.
+
+    Most checks need this, so the file is only parsed again if it changes. The
+    result is shared between the checks, so must not be modified.
+    """
     charmcraft_path = repo_dir / 'charmcraft.yaml'
     if not charmcraft_path.is_file():
         return None
     try:
-        with charmcraft_path.open() as f:
+        stat = charmcraft_path.stat()
+    except OSError:
+        return None
+    return _parse_charmcraft_yaml(str(charmcraft_path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_charmcraft_yaml(path: str, mtime_ns: int, size: int) -> dict[Any, Any] | None:
+    import yaml
+
+    try:
+        with open(path, encoding='utf-8') as f:
             return yaml.safe_load(f)
-    except (yaml.YAMLError, OSError):
+    except (yaml.YAMLError, OSError, UnicodeDecodeError):
         return None
 
 
-def metadata_links(repo_dir: pathlib.Path) -> str:
+def _link_urls(value: Any) -> list[str]:
+    """The URLs in a charmcraft.yaml `links` entry, which may be a string or a list."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return [url for url in value if isinstance(url, str)]
+    return []
+
+
+def _metadata_link_urls(repo_dir: pathlib.Path) -> list[str]:
+    """All of the URLs that :func:`metadata_links` will check."""
+    data = _get_charmcraft_yaml(repo_dir)
+    if not data or not isinstance(data.get('links'), dict):
+        return []
+    return [
+        url
+        for field in ('documentation', 'issues', 'source', 'website')
+        for url in _link_urls(data['links'].get(field))
+    ]
+
+
+def metadata_links(repo_dir: pathlib.Path, local_repo: LocalRepository | None = None) -> str:
     """charmcraft.yaml includes the name, title, summary, and description.
 
     A complete and consistent appearance of the charm is required.
@@ -272,16 +1045,16 @@ Finally, a paragraph that describes whom the charm is useful for.\n"""
         if not value or value == default:
             return description
 
-    links = data.get('links', {})
+    link_data = data.get('links', {})
     link_fields = ['documentation', 'issues', 'source', 'website', 'contact']
     for field in link_fields:
-        url = links.get(field)
         # Contact only needs to be a string.
         if field == 'contact':
             continue
-        if not url:
+        urls = _link_urls(link_data.get(field))
+        if not urls:
             return description
-        if not _url_ok(url):
+        if not all(_url_ok(url, local_repo) for url in urls):
             return description
 
     return description.replace('* [ ]', '* [x]')
@@ -444,7 +1217,11 @@ def relations_includes_optional(repo_dir: pathlib.Path) -> str:
     return description.replace('* [ ]', '* [x]')
 
 
-def charmcraft_tooling(repo_dir: pathlib.Path) -> str:
+def charmcraft_tooling(
+    repo_dir: pathlib.Path,
+    cancel: threading.Event | None = None,
+    limits: ResourceLimits | None = None,
+) -> str:
     """The charm includes the expected tooling for linting and testing.
 
     The repository contains a Makefile, Justfile, or tox.ini that provides
@@ -492,7 +1269,7 @@ def charmcraft_tooling(repo_dir: pathlib.Path) -> str:
 
     for command in commands_to_run:
         try:
-            subprocess.check_output(command, stderr=subprocess.DEVNULL)
+            _run_limited(command, limits or ResourceLimits(), cancel, cwd=repo_dir)
         except subprocess.CalledProcessError:
             return description
 
@@ -552,6 +1329,8 @@ def python_requires_version(repo_dir: pathlib.Path) -> str:
     pyproject_path = repo_dir / 'pyproject.toml'
     if not pyproject_path.is_file():
         return description
+    import tomllib
+
     try:
         with pyproject_path.open('rb') as f:
             data = tomllib.load(f)
@@ -614,6 +1393,8 @@ def charm_has_icon(repo_dir: pathlib.Path) -> str:
     icon_path = repo_dir / 'icon.svg'
     if not icon_path.is_file():
         return description
+    import xml.etree.ElementTree as ET  # noqa: S405
+
     tree = ET.parse(icon_path)  # noqa: S314
     root = tree.getroot()
     width = root.attrib.get('width')
@@ -675,22 +1456,153 @@ def _icon_included_in_build(charmcraft: dict[Any, Any]) -> bool:
     return False
 
 
+class CharmLibrary(NamedTuple):
+    """What the header of a Charmhub library says about it."""
+
+    path: pathlib.Path
+    docstring: str | None
+    """The module docstring, or ``None`` if there isn't one."""
+    api: int | None
+    """The ``LIBAPI`` version, or ``None`` if it wasn't found."""
+    patch: int | None
+    """The ``LIBPATCH`` version, or ``None`` if it wasn't found."""
+
+
+# What a library's module docstring is expected to cover, other than its
+# purpose, and a pattern that suggests that it does. These only guide the
+# reviewer: the items are not ticked.
+_LIB_DOC_ELEMENTS = {
+    'interface': re.compile(r'\b(interfaces?|provides|requires|provider|requirer)\b', re.I),
+    'audience': re.compile(
+        r'\b(intended|audience|public|internal|any(one| charm)|only (by|for))\b', re.I
+    ),
+    'guidance': re.compile(
+        r'```|>>>|::\s*$|^\s*(from|import) \S|\b(usage|getting started|how to use|example)',
+        re.I | re.M,
+    ),
+}
+
+
+def _charm_libraries(charm_path: pathlib.Path, charm_name: str) -> list[pathlib.Path]:
+    """The Charmhub libraries that the charm provides, in ``lib/charms/<name>/v<N>/``."""
+    root = charm_path / 'lib' / 'charms' / charm_name.replace('-', '_')
+    libraries: list[pathlib.Path] = []
+    try:
+        with os.scandir(root) as versions:
+            for version in versions:
+                if not (version.name[1:].isdigit() and version.name.startswith('v')):
+                    continue
+                if not version.is_dir():
+                    continue
+                with os.scandir(version.path) as entries:
+                    libraries.extend(
+                        pathlib.Path(entry.path)
+                        for entry in entries
+                        if entry.name.endswith('.py')
+                        and entry.name != '__init__.py'
+                        and entry.is_file()
+                    )
+    except OSError:
+        return []
+    return sorted(libraries)
+
+
+def _read_charm_library(path: pathlib.Path) -> CharmLibrary:
+    """Read the module docstring, ``LIBAPI``, and ``LIBPATCH`` of a library.
+
+    Libraries can be long, so rather than importing or parsing the whole
+    module, the tokens are read only until both versions are found, or the
+    first top-level function or class (the versions are defined before any
+    code).
+    """
+    import ast
+    import tokenize
+
+    docstring = None
+    versions: dict[str, int] = {}
+    # The last few tokens that aren't blank lines or comments.
+    previous: list[tokenize.TokenInfo] = []
+    skip = {tokenize.ENCODING, tokenize.NL, tokenize.NEWLINE, tokenize.COMMENT}
+    try:
+        with tokenize.open(path) as f:
+            for token in tokenize.generate_tokens(f.readline):
+                if token.type in skip:
+                    continue
+                if not previous and token.type == tokenize.STRING:
+                    docstring = str(ast.literal_eval(token.string))
+                if token.start[1] == 0 and token.string in {'def', 'class', 'async', '@'}:
+                    break
+                previous = [*previous[-2:], token]
+                if (
+                    len(previous) == 3
+                    and previous[0].start[1] == 0
+                    and previous[0].string in {'LIBAPI', 'LIBPATCH'}
+                    and previous[1].string == '='
+                    and previous[2].type == tokenize.NUMBER
+                ):
+                    versions[previous[0].string] = int(previous[2].string, 0)
+                    if len(versions) == 2:
+                        break
+    except (OSError, SyntaxError, ValueError, tokenize.TokenError):
+        pass
+    return CharmLibrary(path, docstring, versions.get('LIBAPI'), versions.get('LIBPATCH'))
+
+
+# How many words a library's summary needs, other than its name and "library".
+_MIN_LIB_SUMMARY_WORDS = 3
+
+
+def _has_lib_summary(docstring: str, name_parts: Collection[str]) -> bool:
+    """Whether the docstring starts with a summary of what the library is for.
+
+    The summary is the text before the first blank line. It doesn't count if,
+    without the library's name, it's just a word or two, like "The redis
+    library.".
+    """
+    summary = re.split(r'\n\s*\n', docstring.strip(), maxsplit=1)[0]
+    ignored = {'lib', 'library', *(part.lower() for part in name_parts)}
+    words = [word for word in re.findall(r'[a-z0-9]+', summary.lower()) if word not in ignored]
+    return len(words) >= _MIN_LIB_SUMMARY_WORDS
+
+
+def _describe_charm_library(charm_path: pathlib.Path, library: CharmLibrary) -> str:
+    """A line for the reviewer about what the library's header contains."""
+    relative = library.path.relative_to(charm_path / 'lib').with_suffix('')
+    line = f'* `{".".join(relative.parts)}`'
+    version = relative.parts[-2]
+    if library.api is None or library.patch is None:
+        line += ': LIBAPI or LIBPATCH is missing'
+    else:
+        line += f' (LIBAPI {library.api}, LIBPATCH {library.patch})'
+        if version != f'v{library.api}':
+            line += f': LIBAPI does not match the {version} directory'
+    if not library.docstring or not library.docstring.strip():
+        return f'{line}; no module docstring.'
+    name_parts = re.findall(r'[A-Za-z0-9]+', '.'.join(relative.parts))
+    elements = {'purpose': _has_lib_summary(library.docstring, name_parts)}
+    for element, pattern in _LIB_DOC_ELEMENTS.items():
+        elements[element] = pattern.search(library.docstring) is not None
+    found = [element for element, present in elements.items() if present]
+    missing = [element for element, present in elements.items() if not present]
+    if found:
+        line += f'; the docstring mentions: {", ".join(found)}'
+    if missing:
+        line += f'; not found: {", ".join(missing)}'
+    return f'{line}.'
+
+
 def charm_lib_docs(repo_dir: pathlib.Path) -> str:
     """If the charm contains Charmhub libraries, they are appropriately documented."""
     # We don't actually automate checking this, we just provide (or not) the
     # checks the reviewer is expected to do.
-    charmcraft_path = repo_dir / 'charmcraft.yaml'
-    if not charmcraft_path.exists():
+    data = _get_charmcraft_yaml(repo_dir)
+    if not isinstance(data, dict):
         return ''
-    try:
-        with charmcraft_path.open() as f:
-            data = yaml.safe_load(f)
-            charm_name = data.get('name', '')
-            if not charm_name:
-                return ''
-    except (yaml.YAMLError, OSError, KeyError):
+    charm_name = data.get('name', '')
+    if not charm_name:
         return ''
-    if not (repo_dir / 'lib' / 'charms' / charm_name).glob('*/*.py'):
+    libraries = _charm_libraries(repo_dir, str(charm_name))
+    if not libraries:
         # The charm does not provide a Charmhub library, so skip including any items.
         return ''
     # fmt: off
@@ -712,4 +1624,62 @@ If the charm provides a general library, the library's module docstring must con
     )
     # fmt: on
 
-    return description
+    found = '\n'.join(
+        _describe_charm_library(repo_dir, _read_charm_library(path)) for path in libraries
+    )
+    return f'{description}\n\nThe charm provides these libraries:\n{found}'
+
+
+# The automated checks, in checklist order.
+CHECKS = (
+    Check(coding_conventions, ('linting_url',)),
+    Check(contribution_guidelines, ('contribution_url', 'local_repo'), frozenset({NETWORK})),
+    Check(license_statement, ('license_url', 'local_repo'), frozenset({NETWORK})),
+    Check(security_doc, ('security_url', 'local_repo'), frozenset({NETWORK})),
+    Check(
+        metadata_links,
+        ('charm_path', 'local_repo'),
+        frozenset({CLONE, CHARMCRAFT_YAML, NETWORK}),
+        ('charmcraft.yaml',),
+    ),
+    Check(check_charm_name, ('charm_name',)),
+    Check(
+        action_names, ('charm_path',), frozenset({CLONE, CHARMCRAFT_YAML}), ('charmcraft.yaml',)
+    ),
+    Check(
+        option_names, ('charm_path',), frozenset({CLONE, CHARMCRAFT_YAML}), ('charmcraft.yaml',)
+    ),
+    Check(repository_name, ('repository_url', 'charm_name')),
+    Check(
+        relations_includes_optional,
+        ('charm_path',),
+        frozenset({CLONE, CHARMCRAFT_YAML}),
+        ('charmcraft.yaml',),
+    ),
+    Check(
+        charmcraft_tooling,
+        ('charm_path', 'cancel', 'limits'),
+        frozenset({CLONE, SUBPROCESS}),
+        ('Makefile', 'Justfile', 'tox.ini'),
+    ),
+    Check(charm_plugin_strict_dependencies, ('charm_path',), frozenset({CLONE})),
+    Check(python_requires_version, ('charm_path',), frozenset({CLONE}), ('pyproject.toml',)),
+    Check(
+        repo_has_lock_file,
+        ('charm_path',),
+        frozenset({CLONE}),
+        ('pyproject.toml', 'poetry.lock', 'uv.lock'),
+    ),
+    Check(
+        charm_has_icon,
+        ('charm_path',),
+        frozenset({CLONE, CHARMCRAFT_YAML}),
+        ('charmcraft.yaml', 'icon.svg'),
+    ),
+    Check(
+        charm_lib_docs,
+        ('charm_path',),
+        frozenset({CLONE, CHARMCRAFT_YAML}),
+        ('charmcraft.yaml', 'lib/charms/*/*/*.py'),
+    ),
+)
@@ -0,0 +1,643 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Read and update listing request issues with as few GitHub API calls as possible.
+
+Everything the review needs from an issue (the body, the assignees, and the
+comment that we posted) is fetched with a single GraphQL query, and all of
+the changes (the title, the assignee, and the comment) are applied with a
+single GraphQL request containing one mutation per change.
+
+The comment that we posted is the most recent one that GitHub says the
+authenticated user wrote *and* that ends with the hidden content hash marker
+that only the bot adds. Neither a comment that the issue author wrote (even
+pasting the marker), nor one that a reviewer running the tools with their own
+token wrote by hand, is mistaken for it. The last few comments are fetched
+with the issue, and only issues with a long discussion since then need more
+queries, paging back through all of the comments. Nothing that the issue
+author can edit is used to find it.
+
+Requests are sent either through the `gh` CLI (the default), or directly from
+this process over pooled HTTPS connections, which avoids starting a `gh`
+process (and a new TLS connection) for every request. Either way, requests
+are paced by a shared :class:`~charmhub_listing_review.ratelimit.RateLimitGovernor`,
+and retried after GitHub reports that a rate limit was hit.
+"""
+
+import dataclasses
+import http.client
+import json
+import os
+import re
+import subprocess  # noqa: S404
+import threading
+import time
+import urllib.parse
+from typing import Any, Protocol
+
+from . import ratelimit
+
+_ISSUE_FIELDS = """
+      number
+      id
+      title
+      body
+      assignees(first: 20) { nodes { login } }
+      comments(last: 10) {
+        totalCount
+        pageInfo { hasPreviousPage startCursor }
+        nodes { id databaseId viewerDidAuthor body }
+      }"""
+
+_ISSUE_QUERY = """
+query($owner: String!, $name: String!, $number: Int!%(params)s) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {%(fields)s
+    }
+  }
+  rateLimit { limit remaining resetAt }%(users)s
+}
+"""
+
+_OPEN_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 25, after: $after, labels: [$label], states: OPEN) {
+      pageInfo { hasNextPage endCursor }
+      nodes {%(fields)s
+      }
+    }
+  }
+  rateLimit { limit remaining resetAt }
+}
+"""
+
+_COMMENTS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $before: String!) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      comments(last: 100, before: $before) {
+        pageInfo { hasPreviousPage startCursor }
+        nodes { id databaseId viewerDidAuthor body }
+      }
+    }
+  }
+  rateLimit { limit remaining resetAt }
+}
+"""
+
+# The hidden marker that update_issue.update_gh_issue ends the bot comment
+# with, holding a hash of the comment's content.
+_BOT_COMMENT_MARKER_RE = re.compile(r'<!-- listing-review-hash: [0-9a-f]+ -->')
+# How the bot comment started before it had the marker, so that those
+# comments are still updated rather than duplicated.
+_LEGACY_BOT_COMMENT_RE = re.compile(r'@\S+ - please assign this review to someone in your team')
+
+_ASSIGNMENT_FIELDS = """
+      pageInfo { hasNextPage endCursor }
+      nodes { number state updatedAt assignees(first: 20) { nodes { login } } }"""
+
+_OPEN_ASSIGNMENTS_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $after, labels: [$label], states: OPEN) {%(fields)s
+    }
+  }
+  rateLimit { limit remaining resetAt }
+}
+"""
+
+_CHANGED_ASSIGNMENTS_QUERY = """
+query($owner: String!, $name: String!, $label: String!, $since: DateTime!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $after, filterBy: {labels: [$label], since: $since}) {%(fields)s
+    }
+  }
+  rateLimit { limit remaining resetAt }
+}
+"""
+
+_USER_QUERY = """
+query($login: String!) {
+  user(login: $login) { id }
+  rateLimit { limit remaining resetAt }
+}
+"""
+
+
+@dataclasses.dataclass
+class IssueComment:
+    """A comment on an issue."""
+
+    id: str
+    """The GraphQL node ID of the comment."""
+    database_id: int
+    """The REST API ID of the comment."""
+    body: str
+
+
+@dataclasses.dataclass
+class IssueAssignment:
+    """Who an issue is assigned to, for working out how busy reviewers are."""
+
+    number: int
+    open: bool
+    assignees: list[str]
+    """The logins of the users the issue is assigned to."""
+    updated_at: str
+    """When the issue was last updated, as an ISO 8601 timestamp."""
+
+
+@dataclasses.dataclass
+class Issue:
+    """The parts of a listing request issue that the review uses."""
+
+    number: int
+    id: str
+    """The GraphQL node ID of the issue."""
+    title: str
+    body: str
+    assignees: list[str]
+    """The logins of the users the issue is assigned to."""
+    bot_comment: IssueComment | None
+    """The review comment made by the authenticated user, if any."""
+    user_ids: dict[str, str] = dataclasses.field(default_factory=dict)
+    """GraphQL node IDs for users that were looked up along with the issue."""
+    comment_count: int = 0
+    """The number of comments on the issue."""
+
+
+class Transport(Protocol):
+    """Something that can send GraphQL requests to GitHub."""
+
+    def graphql(self, query: str, variables: dict[str, str | int]) -> dict[str, Any]:
+        """Run a GraphQL query or mutation and return the ``data`` of the response."""
+        ...
+
+
+class GitHubError(Exception):
+    """The GitHub API returned an error."""
+
+    def __init__(self, message: str, status: int = 0):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimitError(GitHubError):
+    """GitHub rejected a request because a rate limit was exceeded."""
+
+    def __init__(self, message: str, status: int = 0, retry_after: float | None = None):
+        super().__init__(message, status)
+        self.retry_after = retry_after
+        """How long GitHub asked us to wait, in seconds, if it said."""
+
+
+def _is_rate_limit_message(message: str) -> bool:
+    message = message.lower()
+    return 'rate limit' in message or 'submitted too quickly' in message
+
+
+class GhCli:
+    """Send GraphQL requests through the `gh` CLI, which handles authentication.
+
+    Requires `gh` CLI to be installed and authenticated.
+    """
+
+    def graphql(self, query: str, variables: dict[str, str | int]) -> dict[str, Any]:
+        """Run a GraphQL query or mutation and return the ``data`` of the response."""
+        cmd = ['gh', 'api', 'graphql', '-f', f'query={query}']
+        for key, value in variables.items():
+            # `-F` converts numbers and expands the {owner} and {repo}
+            # placeholders, but also reads files for values starting with '@',
+            # so is only used where that's safe. Everything else is passed as a
+            # raw string.
+            if isinstance(value, int) or value in ('{owner}', '{repo}'):
+                cmd.extend(['-F', f'{key}={value}'])
+            else:
+                cmd.extend(['-f', f'{key}={value}'])
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            if _is_rate_limit_message(f'{e.stdout}\n{e.stderr}'):
+                raise RateLimitError(e.stderr.strip()) from e
+            raise
+        return json.loads(result.stdout)['data']
+
+
+class HttpTransport:
+    """Send requests to the GitHub API from this process, reusing connections.
+
+    Args:
+        token: The token to authenticate with. Defaults to the ``GH_TOKEN``
+            environment variable (as used by `gh`), then ``GITHUB_TOKEN``.
+        api_url: The base URL of the REST API. Defaults to the
+            ``GITHUB_API_URL`` environment variable (which is set in GitHub
+            Actions), then ``https://api.github.com``.
+        max_idle: The maximum number of idle connections to keep open.
+        timeout: The timeout, in seconds, for each request.
+    """
+
+    def __init__(
+        self,
+        token: str | None = None,
+        api_url: str | None = None,
+        *,
+        max_idle: int = 4,
+        timeout: float = 30,
+    ):
+        token = token or os.environ.get('GH_TOKEN') or os.environ.get('GITHUB_TOKEN')
+        if not token:
+            raise ValueError('A GitHub token is required: set GH_TOKEN.')
+        self._token = token
+        api_url = api_url or os.environ.get('GITHUB_API_URL') or 'https://api.github.com'
+        parts = urllib.parse.urlsplit(api_url)
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._base_path = parts.path.rstrip('/')
+        # GitHub Enterprise Server serves REST from /api/v3 and GraphQL from
+        # /api/graphql; github.com serves both from the root.
+        self._graphql_path = self._base_path.removesuffix('/v3') + '/graphql'
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle: list[http.client.HTTPConnection] = []
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self._scheme == 'http':
+            return http.client.HTTPConnection(self._netloc, timeout=self.timeout)
+        return http.client.HTTPSConnection(self._netloc, timeout=self.timeout)
+
+    def _acquire(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def request(self, method: str, path: str, body: Any = None) -> Any:
+        """Send a request to the REST API and return the decoded JSON response.
+
+        Args:
+            method: The HTTP method, such as ``GET`` or ``PATCH``.
+            path: The path of the endpoint, such as ``/repos/OWNER/REPO/issues/1``.
+            body: The request body, which is sent as JSON.
+        """
+        return self._request(method, self._base_path + path, body)
+
+    def graphql(self, query: str, variables: dict[str, str | int]) -> dict[str, Any]:
+        """Run a GraphQL query or mutation and return the ``data`` of the response."""
+        result = self._request(
+            'POST', self._graphql_path, {'query': query, 'variables': variables}
+        )
+        if result.get('errors'):
+            message = '; '.join(e.get('message', '') for e in result['errors'])
+            if any(e.get('type') == 'RATE_LIMITED' for e in result['errors']):
+                raise RateLimitError(message)
+            raise GitHubError(message)
+        return result['data']
+
+    def _request(self, method: str, path: str, body: Any) -> Any:
+        headers = {
+            'Authorization': f'Bearer {self._token}',
+            'Accept': 'application/vnd.github+json',
+            'User-Agent': 'charmhub-listing-review',
+            'X-GitHub-Api-Version': '2022-11-28',
+        }
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        conn, reused = self._acquire()
+        while True:
+            sent = False
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                sent = True
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                # The server may have closed the idle connection, in which case
+                # the request couldn't be sent, or the server closed it without
+                # responding: retry once on a fresh one. Nothing else is
+                # retried, because the request might have been handled (for
+                # example, if reading the response timed out), and a mutation
+                # must not be applied twice.
+                dropped = isinstance(e, http.client.RemoteDisconnected) or (
+                    not sent and isinstance(e, (BrokenPipeError, ConnectionResetError))
+                )
+                if not (reused and dropped):
+                    raise
+                conn, reused = self._connect(), False
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        if response.status >= 400:
+            try:
+                message = json.loads(data).get('message', '')
+            except ValueError:
+                message = data.decode('utf-8', errors='replace')
+            message = f'{method} {path}: {response.status} {message}'
+            if response.status in (403, 429):
+                retry_after = _retry_after(response)
+                if retry_after is not None or _is_rate_limit_message(message):
+                    raise RateLimitError(message, response.status, retry_after)
+            raise GitHubError(message, response.status)
+        return json.loads(data) if data else None
+
+
+def _retry_after(response: http.client.HTTPResponse) -> float | None:
+    """How long a rate limited response asks us to wait, if it says."""
+    retry_after = response.getheader('Retry-After')
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    reset = response.getheader('X-RateLimit-Reset')
+    if response.getheader('X-RateLimit-Remaining') == '0' and reset and reset.isdigit():
+        return max(float(reset) - time.time(), 0.0)
+    return None
+
+
+class GitHub:
+    """Access to listing request issues in a single repository.
+
+    Args:
+        repo: The repository in OWNER/REPO format. If not provided, the
+            ``GITHUB_REPOSITORY`` environment variable is used, and failing that
+            `gh` picks the repository from the current directory.
+        transport: Sends the GraphQL requests. Defaults to the `gh` CLI.
+        governor: Paces the requests. Defaults to the governor shared by
+            everything in the process.
+        max_retries: How many times to retry a request that was rejected
+            because of a rate limit.
+    """
+
+    def __init__(
+        self,
+        repo: str | None = None,
+        transport: Transport | None = None,
+        *,
+        governor: ratelimit.RateLimitGovernor | None = None,
+        max_retries: int = 3,
+    ):
+        repo = repo or os.environ.get('GITHUB_REPOSITORY')
+        if repo:
+            self.owner, self.name = repo.split('/', 1)
+        else:
+            self.owner, self.name = '{owner}', '{repo}'  # noqa: RUF027 - gh placeholders.
+        self.transport: Transport = transport or GhCli()
+        self.governor = governor or ratelimit.default_governor()
+        self.max_retries = max_retries
+
+    def _graphql(self, query: str, variables: dict[str, str | int]) -> dict[str, Any]:
+        """Send a request once the governor allows it, retrying if rate limited."""
+        retries = 0
+        while True:
+            self.governor.acquire()
+            try:
+                data = self.transport.graphql(query, variables)
+            except RateLimitError as e:
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                self.governor.backoff(e.retry_after)
+                continue
+            self.governor.update_from_graphql(data.get('rateLimit'))
+            return data
+
+    def get_issue(self, number: int, *, users: list[str] | tuple[str, ...] = ()) -> Issue:
+        """Fetch an issue, and look up the IDs of ``users``, in a single query.
+
+        Looking up users alongside the issue means that assigning one of them
+        later doesn't need another round trip.
+        """
+        variables: dict[str, str | int] = {
+            'owner': self.owner,
+            'name': self.name,
+            'number': number,
+        }
+        params = ''
+        lookups = ''
+        for i, login in enumerate(users):
+            variables[f'user{i}'] = login
+            params += f', $user{i}: String!'
+            lookups += f'\n  user{i}: user(login: $user{i}) {{ id }}'
+        query = _ISSUE_QUERY % {'params': params, 'fields': _ISSUE_FIELDS, 'users': lookups}
+        data = self._graphql(query, variables)
+        issue = self._issue_from_data(data['repository']['issue'])
+        issue.user_ids = {
+            login: data[f'user{i}']['id'] for i, login in enumerate(users) if data.get(f'user{i}')
+        }
+        return issue
+
+    def list_open_issues(self, label: str) -> list[Issue]:
+        """Fetch all of the open issues that have ``label``.
+
+        The issues include everything that :meth:`get_issue` provides (other
+        than user IDs), so reviewing them doesn't need any further reads.
+        """
+        variables: dict[str, str | int] = {'owner': self.owner, 'name': self.name, 'label': label}
+        query = _OPEN_ISSUES_QUERY % {'fields': _ISSUE_FIELDS}
+        issues: list[Issue] = []
+        while True:
+            data = self._graphql(query, variables)
+            page = data['repository']['issues']
+            issues.extend(self._issue_from_data(raw) for raw in page['nodes'])
+            if not page['pageInfo']['hasNextPage']:
+                return issues
+            variables['after'] = page['pageInfo']['endCursor']
+
+    def _issue_from_data(self, raw: dict[str, Any]) -> Issue:
+        """The issue in a query response, with its bot comment.
+
+        If the bot comment isn't among the comments in the response, the older
+        comments are searched too.
+        """
+        comments = raw['comments']
+        issue = Issue(
+            number=raw['number'],
+            id=raw['id'],
+            title=raw['title'],
+            body=raw['body'],
+            assignees=[a['login'] for a in raw['assignees']['nodes']],
+            bot_comment=_bot_comment(comments['nodes']),
+            comment_count=comments['totalCount'],
+        )
+        if issue.bot_comment is None and comments['pageInfo']['hasPreviousPage']:
+            issue.bot_comment = self._search_bot_comment(
+                issue.number, comments['pageInfo']['startCursor']
+            )
+        return issue
+
+    def _search_bot_comment(self, number: int, before: str) -> IssueComment | None:
+        """Find the bot comment among the comments before the ``before`` cursor."""
+        variables: dict[str, str | int] = {
+            'owner': self.owner,
+            'name': self.name,
+            'number': number,
+            'before': before,
+        }
+        while True:
+            data = self._graphql(_COMMENTS_QUERY, variables)
+            comments = data['repository']['issue']['comments']
+            bot_comment = _bot_comment(comments['nodes'])
+            if bot_comment is not None or not comments['pageInfo']['hasPreviousPage']:
+                return bot_comment
+            variables['before'] = comments['pageInfo']['startCursor']
+
+    def list_assignments(self, label: str, since: str | None = None) -> list[IssueAssignment]:
+        """Fetch who the issues that have ``label`` are assigned to.
+
+        Only the fields needed to track reviewer load are fetched, so this is
+        much cheaper than :meth:`list_open_issues`.
+
+        Args:
+            label: Only include issues with this label.
+            since: If provided, an ISO 8601 timestamp, and issues updated since
+                then are returned whether they are open or closed. Otherwise,
+                all of the open issues are returned.
+        """
+        variables: dict[str, str | int] = {'owner': self.owner, 'name': self.name, 'label': label}
+        if since is None:
+            query = _OPEN_ASSIGNMENTS_QUERY % {'fields': _ASSIGNMENT_FIELDS}
+        else:
+            query = _CHANGED_ASSIGNMENTS_QUERY % {'fields': _ASSIGNMENT_FIELDS}
+            variables['since'] = since
+        assignments: list[IssueAssignment] = []
+        while True:
+            data = self._graphql(query, variables)
+            page = data['repository']['issues']
+            assignments.extend(
+                IssueAssignment(
+                    number=raw['number'],
+                    open=raw['state'] == 'OPEN',
+                    assignees=[a['login'] for a in raw['assignees']['nodes']],
+                    updated_at=raw['updatedAt'],
+                )
+                for raw in page['nodes']
+            )
+            if not page['pageInfo']['hasNextPage']:
+                return assignments
+            variables['after'] = page['pageInfo']['endCursor']
+
+    def update_issue(
+        self,
+        issue: Issue,
+        *,
+        title: str | None = None,
+        assignee: str | None = None,
+        comment: str | None = None,
+    ):
+        """Apply all of the changes to ``issue`` in a single request.
+
+        Args:
+            issue: The issue, as returned by :meth:`get_issue`.
+            title: The new title for the issue.
+            assignee: The login of a user to add to the issue's assignees.
+            comment: The new body for the bot comment. If the issue doesn't
+                have a bot comment yet, one is created.
+        """
+        variables: dict[str, str | int] = {'issue': issue.id}
+        params = ['$issue: ID!']
+        mutations: list[str] = []
+        if title is not None:
+            variables['title'] = title
+            params.append('$title: String!')
+            mutations.append(
+                'title: updateIssue(input: {id: $issue, title: $title}) { clientMutationId }'
+            )
+        if assignee is not None:
+            variables['assignee'] = issue.user_ids.get(assignee) or self._user_id(assignee)
+            params.append('$assignee: ID!')
+            mutations.append(
+                'assign: addAssigneesToAssignable('
+                'input: {assignableId: $issue, assigneeIds: [$assignee]}) { clientMutationId }'
+            )
+        if comment is not None:
+            variables['body'] = comment
+            params.append('$body: String!')
+            if issue.bot_comment is None:
+                mutations.append(
+                    'comment: addComment(input: {subjectId: $issue, body: $body}) '
+                    '{ commentEdge { node { id databaseId } } }'
+                )
+            else:
+                variables['comment'] = issue.bot_comment.id
+                params.append('$comment: ID!')
+                mutations.append(
+                    'comment: updateIssueComment(input: {id: $comment, body: $body}) '
+                    '{ issueComment { id databaseId } }'
+                )
+        if not mutations:
+            return
+        query = f'mutation({", ".join(params)}) {{\n  ' + '\n  '.join(mutations) + '\n}'
+        data = self._graphql(query, variables)
+        if comment is None:
+            return
+        if issue.bot_comment is None:
+            node = data['comment']['commentEdge']['node']
+        else:
+            node = data['comment']['issueComment']
+        issue.bot_comment = IssueComment(node['id'], node['databaseId'], comment)
+
+    def _user_id(self, login: str) -> str:
+        data = self._graphql(_USER_QUERY, {'login': login})
+        if not data.get('user'):
+            raise ValueError(f'Unknown GitHub user: {login!r}')
+        return data['user']['id']
+
+
+def _bot_comment(comments: list[dict[str, Any]]) -> IssueComment | None:
+    """The most recent of ``comments`` that is the bot comment, if any.
+
+    That's a comment that the authenticated user wrote, and that has the
+    marker, or (for comments posted before the marker existed) starts the
+    way the bot comment does.
+    """
+    for comment in reversed(comments):
+        if not comment['viewerDidAuthor']:
+            continue
+        body = comment['body']
+        if _BOT_COMMENT_MARKER_RE.search(body) or _LEGACY_BOT_COMMENT_RE.match(body):
+            return IssueComment(comment['id'], comment['databaseId'], body)
+    return None
+
+
+def connect(repo: str | None = None, transport: str = 'gh') -> GitHub:
+    """Create a :class:`GitHub` that uses the named transport, 'gh' or 'http'.
+
+    Raises:
+        ValueError: if the transport can't be used with the given arguments.
+    """
+    if transport == 'gh':
+        return GitHub(repo)
+    if transport == 'http':
+        if not (repo or os.environ.get('GITHUB_REPOSITORY')):
+            raise ValueError('The http transport requires --repo (or GITHUB_REPOSITORY)')
+        return GitHub(repo, HttpTransport())
+    raise ValueError(f'Unknown GitHub transport: {transport!r}')
@@ -0,0 +1,172 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parse the body of an issue created with the listing request issue form.
+
+GitHub renders each field of an issue form as a ``### Label`` heading followed
+by the answer, with ``_No response_`` for optional fields that were left
+empty. The body is split into sections in a single pass over its lines, so
+parsing stays linear in the size of the body, even when authors paste long
+logs into it. Headings inside fenced code blocks are part of the answer, not
+the start of a new field, and lines that are hidden HTML comments are ignored.
+"""
+
+import re
+import urllib.parse
+from typing import NamedTuple
+
+NO_RESPONSE = '_No response_'
+
+
+class FormField(NamedTuple):
+    """A field of the listing request issue form.
+
+    This mirrors ``.github/ISSUE_TEMPLATE/listing-request.yml``.
+    """
+
+    key: str
+    label: str
+    required: bool = True
+    multiline: bool = False
+    url: bool = False
+    # Labels that older versions of the form used for the same field.
+    aliases: tuple[str, ...] = ()
+
+
+FIELDS = (
+    FormField('name', 'Charm name'),
+    FormField('demo', 'Demo', multiline=True),
+    FormField('project_repo', 'Project Repository', url=True),
+    FormField('charm_dir', 'Charm Directory', required=False),
+    FormField('ci_linting', 'CI Linting', url=True),
+    FormField('ci_release_url', 'CI Release', url=True),
+    FormField('ci_integration_url', 'CI Integration Tests', url=True),
+    FormField('documentation_link', 'Documentation Link', url=True),
+    FormField('default_branch', 'Default Branch', required=False, aliases=('Review Branch',)),
+)
+
+_FIELDS_BY_LABEL = {
+    label.casefold(): field for field in FIELDS for label in (field.label, *field.aliases)
+}
+_URL_RE = re.compile(r'https?://\S+')
+
+
+class ListingRequest(NamedTuple):
+    """The answers given in a listing request, and any problems with them.
+
+    Fields that were not answered are ``None``. ``errors`` maps the key of a
+    field to a description of what is wrong with it.
+    """
+
+    name: str | None
+    demo: str | None
+    project_repo: str | None
+    charm_dir: str | None
+    ci_linting: str | None
+    ci_release_url: str | None
+    ci_integration_url: str | None
+    documentation_link: str | None
+    default_branch: str | None
+    errors: dict[str, str]
+
+    @property
+    def valid(self) -> bool:
+        """Whether all the fields were answered correctly."""
+        return not self.errors
+
+    @property
+    def demo_url(self) -> str | None:
+        """The first link in the demo answer, or its first line if it has none."""
+        if not self.demo:
+            return None
+        match = _URL_RE.search(self.demo)
+        if match:
+            return match.group(0).rstrip('.,;:)>')
+        return self.demo.splitlines()[0].strip()
+
+
+def split_sections(body: str) -> dict[str, str]:
+    """Split the body into the content under each ``###`` heading.
+
+    Returns:
+        A mapping of heading to content, in the order they appear. If a heading
+        appears more than once, the first one is used.
+    """
+    sections: dict[str, str] = {}
+    heading = None
+    lines: list[str] = []
+    fence = ''
+    for line in body.splitlines():
+        stripped = line.lstrip()
+        if fence:
+            if stripped.startswith(fence):
+                fence = ''
+        elif stripped.startswith(('```', '~~~')):
+            fence = stripped[:3]
+        elif stripped.startswith('<!--') and stripped.rstrip().endswith('-->'):
+            # Hidden comments, such as the marker that older versions added.
+            continue
+        elif line.startswith('### '):
+            if heading is not None:
+                sections.setdefault(heading, '\n'.join(lines).strip())
+            heading = line[4:].strip()
+            lines = []
+            continue
+        if heading is not None:
+            lines.append(line)
+    if heading is not None:
+        sections.setdefault(heading, '\n'.join(lines).strip())
+    return sections
+
+
+def _validate(field: FormField, value: str | None) -> str | None:
+    """Describe what is wrong with the answer to the field, if anything."""
+    if not value:
+        return f'"{field.label}" is required.' if field.required else None
+    if not field.multiline and '\n' in value:
+        return f'"{field.label}" should be a single line.'
+    if field.url:
+        parsed = urllib.parse.urlparse(value)
+        if parsed.scheme not in ('http', 'https', 'file') or not (parsed.netloc or parsed.path):
+            return f'"{field.label}" should be a link, got {value!r}.'
+    if field.key == 'charm_dir' and (value.startswith('/') or '..' in value.split('/')):
+        return f'"{field.label}" should be a path relative to the repository root.'
+    return None
+
+
+def parse(body: str) -> ListingRequest:
+    """Parse the body of a listing request issue.
+
+    Problems with the answers are collected in the ``errors`` of the result,
+    rather than raised, so that as much of the request as possible can still
+    be reviewed.
+    """
+    values: dict[str, str | None] = {}
+    for heading, content in split_sections(body).items():
+        field = _FIELDS_BY_LABEL.get(heading.casefold())
+        if field is None or field.key in values:
+            continue
+        values[field.key] = None if content in ('', NO_RESPONSE) else content
+    answers: dict[str, str | None] = {}
+    errors = {}
+    for field in FIELDS:
+        value = values.get(field.key)
+        error = _validate(field, value)
+        if error:
+            errors[field.key] = error
+        if value and not field.multiline:
+            # Use the first line, as GitHub's single-line inputs would.
+            value = value.splitlines()[0].strip()
+        answers[field.key] = value
+    return ListingRequest(**answers, errors=errors)
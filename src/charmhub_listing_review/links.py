@@ -0,0 +1,461 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Check that links resolve, without probing the same URL more than needed.
+
+A single evaluation references the same URLs in several places (the issue form,
+the charmcraft.yaml `links`, and the contribution and security documents), and
+the same popular destinations (Charmhub, the Ubuntu documentation) appear in
+almost every review. URLs are deduplicated within a run, probed concurrently
+(with a limit on the number of simultaneous requests to any one host), and the
+results are kept in a small on-disk cache so that later runs can skip them.
+
+Requests are also made resilient to flaky hosts. Transient failures (timeouts,
+dropped connections, and 429 or 5xx responses) are retried after a short,
+randomised delay, and only definite answers are cached. Each host's timeout
+adapts to how quickly it usually responds, and a host that keeps failing is
+assumed to be down for a while, so that requests to it fail immediately rather
+than each waiting for a timeout.
+"""
+
+import contextlib
+import json
+import os
+import pathlib
+import random
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import concurrent.futures
+
+# How long a probe result stays valid. Failures are retried sooner, so that a
+# fixed link is noticed quickly.
+POSITIVE_TTL = 24 * 60 * 60
+NEGATIVE_TTL = 60 * 60
+
+# Some hosts refuse HEAD requests. For these status codes we try again with a
+# GET that asks for only the first byte.
+_HEAD_REJECTED_STATUSES = {403, 405, 501}
+
+_CACHE_FILENAME = 'links.json'
+
+# Statuses that suggest trying again later, rather than that the URL is wrong.
+_TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+# Retries use exponential backoff, with "full jitter": a random delay of up to
+# this many seconds, doubled for each retry.
+_BACKOFF = 0.25
+# Each host's timeout is this multiple of its smoothed response time, but no
+# less than the minimum. The first request to a host uses the full timeout.
+_TIMEOUT_FACTOR = 4
+_MIN_TIMEOUT = 1.0
+# How much each response time contributes to the smoothed response time.
+_LATENCY_WEIGHT = 0.3
+# After this many failures in a row, requests to the host fail immediately,
+# until a single trial request is let through after the cooldown.
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN = 30
+
+
+class _TransientError(Exception):
+    """The request failed in a way that may succeed if tried again."""
+
+
+class _HostDown(Exception):  # noqa: N818
+    """The host has failed repeatedly, so the request was not made."""
+
+
+def cache_dir() -> pathlib.Path:
+    """The directory used for caches that persist between runs."""
+    override = os.environ.get('CHARMHUB_LISTING_REVIEW_CACHE_DIR')
+    if override:
+        return pathlib.Path(override)
+    base = os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    return pathlib.Path(base) / 'charmhub-listing-review'
+
+
+class LinkCache:
+    """A TTL cache of link health results, optionally persisted as JSON.
+
+    Args:
+        path: Where to load and save the cache. If ``None``, the cache only
+            lives in memory.
+        positive_ttl: Seconds that a successful result remains valid.
+        negative_ttl: Seconds that a failed result remains valid.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | None = None,
+        *,
+        positive_ttl: float = POSITIVE_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+    ):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[bool, float]] = {}
+        self._dirty = False
+        if path is not None:
+            self._entries.update(self._load(path))
+
+    @staticmethod
+    def _load(path: pathlib.Path) -> dict[str, tuple[bool, float]]:
+        try:
+            with path.open('r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict):
+            return {}
+        entries: dict[str, tuple[bool, float]] = {}
+        for url, value in raw.items():
+            if isinstance(value, list) and len(value) == 2:
+                entries[url] = (bool(value[0]), float(value[1]))
+        return entries
+
+    def get(self, url: str) -> bool | None:
+        """The cached result for ``url``, or ``None`` if unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is None:
+            return None
+        ok, checked_at = entry
+        ttl = self.positive_ttl if ok else self.negative_ttl
+        if time.time() - checked_at > ttl:
+            return None
+        return ok
+
+    def set(self, url: str, ok: bool):
+        """Record the result of probing ``url``."""
+        with self._lock:
+            self._entries[url] = (ok, time.time())
+            self._dirty = True
+
+    def save(self):
+        """Write the cache to disk, dropping expired entries.
+
+        Failing to write the cache is not an error: the next run will simply
+        need to probe the links again.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            max_ttl = max(self.positive_ttl, self.negative_ttl)
+            data = {
+                url: [ok, checked_at]
+                for url, (ok, checked_at) in self._entries.items()
+                if now - checked_at <= max_ttl
+            }
+            self._dirty = False
+        import tempfile
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix='.links-')
+        except OSError:
+            return
+        # Write to a temporary file and rename, so that concurrent runs never
+        # see a partially written cache.
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+
+
+class _HostHealth:
+    """How a host has been responding, for adaptive timeouts and circuit breaking.
+
+    This is not thread-safe: the checker's lock must be held.
+    """
+
+    def __init__(self):
+        self.latency: float | None = None
+        self.failures = 0
+        self.open_until = 0.0
+        self.trial_in_flight = False
+
+    def timeout(self, max_timeout: float) -> float:
+        if self.latency is None:
+            return max_timeout
+        return min(max_timeout, max(_MIN_TIMEOUT, _TIMEOUT_FACTOR * self.latency))
+
+    def allow(self, now: float) -> bool:
+        """Whether a request can be made, or the host should be assumed down."""
+        if self.failures < _BREAKER_THRESHOLD:
+            return True
+        if now < self.open_until or self.trial_in_flight:
+            return False
+        # The cooldown is over: let one request through to see if it's back.
+        self.trial_in_flight = True
+        return True
+
+    def succeeded(self, latency: float):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += _LATENCY_WEIGHT * (latency - self.latency)
+        self.failures = 0
+        self.trial_in_flight = False
+
+    def failed(self, now: float):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.failures >= _BREAKER_THRESHOLD:
+            self.open_until = now + _BREAKER_COOLDOWN
+
+
+class LinkChecker:
+    """Probe URLs concurrently, at most once each, with per-host limits.
+
+    Args:
+        cache: Results from previous runs. Results from this checker are also
+            stored there.
+        max_workers: The maximum number of probes in flight overall.
+        max_per_host: The maximum number of probes in flight to any one host.
+        timeout: The maximum timeout, in seconds, for each request. Hosts that
+            have responded quickly before are given less time.
+        retries: How many times to retry a request that failed transiently.
+        clock: Returns the current time, in seconds.
+        sleep: Waits for the given number of seconds.
+    """
+
+    def __init__(
+        self,
+        cache: LinkCache | None = None,
+        *,
+        max_workers: int = 16,
+        max_per_host: int = 4,
+        timeout: float = 5,
+        retries: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        import concurrent.futures
+
+        self.cache = cache if cache is not None else LinkCache()
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.Semaphore] = {}
+        self._hosts: dict[str, _HostHealth] = {}
+        self._in_flight: dict[str, concurrent.futures.Future[bool]] = {}
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='link-check'
+        )
+
+    def check(self, urls: Iterable[str]) -> dict[str, bool]:
+        """Whether each URL resolves with a successful (non-error) status.
+
+        Duplicate and empty URLs are ignored. Probes for URLs that are already
+        in flight (for example, from another thread) are shared.
+        """
+        futures = {url: self._submit(url) for url in dict.fromkeys(urls) if url}
+        results = {url: future.result() for url, future in futures.items()}
+        self.cache.save()
+        return results
+
+    def ok(self, url: str) -> bool:
+        """Whether ``url`` resolves with a successful (non-error) status."""
+        return self.check([url]).get(url, False)
+
+    def fetch(self, url: str) -> str | None:
+        """The content of ``url`` as text, or ``None`` if it can't be fetched.
+
+        Transient failures are retried in the same way as for probes. The
+        content is not cached.
+        """
+
+        def get(attempt: int) -> str | None:
+            status, body = self._request(url, 'GET', attempt=attempt, read=True)
+            return body.decode('utf-8', errors='replace') if status < 400 else None
+
+        try:
+            with self._host_slot(url):
+                return self._with_retries(get)
+        except ValueError:
+            return None
+
+    def _submit(self, url: str) -> 'concurrent.futures.Future[bool]':
+        import concurrent.futures
+
+        with self._lock:
+            future = self._in_flight.get(url)
+            if future is not None:
+                return future
+            future = concurrent.futures.Future()
+            cached = self.cache.get(url)
+            if cached is not None:
+                future.set_result(cached)
+                return future
+            future = self._executor.submit(self._probe_and_record, url)
+            self._in_flight[url] = future
+        future.add_done_callback(lambda _: self._done(url))
+        return future
+
+    def _done(self, url: str):
+        # Once the probe has finished, the result is answered from the cache.
+        with self._lock:
+            self._in_flight.pop(url, None)
+
+    def _host_slot(self, url: str) -> threading.Semaphore:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.Semaphore(self.max_per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _probe_and_record(self, url: str) -> bool:
+        with self._host_slot(url):
+            ok = self._with_retries(lambda attempt: self._probe(url, attempt))
+        # Failures that might be transient aren't cached, so that they are
+        # tried again next time.
+        if ok is not None:
+            self.cache.set(url, ok)
+        return bool(ok)
+
+    def _with_retries(self, request: Callable[[int], Any]) -> Any:
+        """Make the request, retrying transient failures; ``None`` if they persist."""
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self._sleep(random.uniform(0, _BACKOFF * 2**attempt))  # noqa: S311
+            try:
+                return request(attempt)
+            except _TransientError:
+                continue
+            except _HostDown:
+                break
+        return None
+
+    def _probe(self, url: str, attempt: int) -> bool:
+        try:
+            status, _ = self._request(url, 'HEAD', attempt=attempt)
+        except ValueError:
+            # Not a valid URL, which won't change.
+            return False
+        if status not in _HEAD_REJECTED_STATUSES:
+            return status < 400
+        # The host rejected HEAD, so ask for a single byte instead.
+        status, _ = self._request(url, 'GET', {'Range': 'bytes=0-0'}, attempt=attempt)
+        # An empty document can't satisfy the range, but it does exist.
+        return status < 400 or status == 416
+
+    def _health(self, url: str) -> _HostHealth:
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        health = self._hosts.get(host)
+        if health is None:
+            health = self._hosts[host] = _HostHealth()
+        return health
+
+    def _request(
+        self,
+        url: str,
+        method: str,
+        headers: dict[str, str] | None = None,
+        *,
+        attempt: int = 0,
+        read: bool = False,
+    ) -> tuple[int, bytes]:
+        """Make a request, and return the status and (if ``read``) the body.
+
+        Raises:
+            _TransientError: if the request failed in a way that may succeed
+                if tried again.
+            _HostDown: if the host has been failing, so no request was made.
+            ValueError: if the URL is not valid.
+        """
+        import http.client
+        import urllib.error
+        import urllib.request
+
+        request = urllib.request.Request(url, method=method, headers=headers or {})  # noqa: S310
+        with self._lock:
+            health = self._health(url)
+            if not health.allow(self._clock()):
+                raise _HostDown(url)
+            trial = health.trial_in_flight
+            # Retries get the full timeout, in case the host is just slow today.
+            timeout = self.timeout if attempt else health.timeout(self.timeout)
+        start = self._clock()
+        body = b''
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+                status = response.status
+                if read:
+                    body = response.read()
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except (OSError, http.client.HTTPException) as e:
+            # Including malformed responses, such as a non-HTTP status line.
+            with self._lock:
+                health.failed(self._clock())
+            raise _TransientError(url) from e
+        finally:
+            if trial:
+                # Whatever happened, the host mustn't wait forever for the
+                # trial request to report back.
+                with self._lock:
+                    health.trial_in_flight = False
+        with self._lock:
+            if status in _TRANSIENT_STATUSES:
+                health.failed(self._clock())
+            else:
+                health.succeeded(self._clock() - start)
+        if status in _TRANSIENT_STATUSES:
+            raise _TransientError(url)
+        return status, body
+
+
+_default_checker: LinkChecker | None = None
+_default_checker_lock = threading.Lock()
+
+
+def default_checker() -> LinkChecker:
+    """The checker shared by every check in this process."""
+    global _default_checker
+    with _default_checker_lock:
+        if _default_checker is None:
+            _default_checker = LinkChecker(LinkCache(cache_dir() / _CACHE_FILENAME))
+        return _default_checker
+
+
+def check_urls(urls: Iterable[str]) -> dict[str, bool]:
+    """Probe ``urls`` with the shared checker; see :meth:`LinkChecker.check`."""
+    return default_checker().check(urls)
+
+
+def url_ok(url: str) -> bool:
+    """Whether ``url`` resolves, using the shared checker."""
+    return default_checker().ok(url)
+
+
+def fetch(url: str) -> str | None:
+    """Fetch ``url`` as text with the shared checker; see :meth:`LinkChecker.fetch`."""
+    return default_checker().fetch(url)
@@ -0,0 +1,218 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Profile a run of one of the tools, to find out why it was slow or used a lot of memory.
+
+When the ``--profile DIR`` option is given, the run is wrapped in a
+:class:`Profiler`, which writes three files to DIR:
+
+* ``profile.pstats``: cProfile statistics, which cover every thread, for use
+  with :mod:`pstats` or a viewer such as snakeviz.
+* ``profile.collapsed``: stacks sampled from every thread, in the collapsed
+  format used by flame graph tools (such as ``flamegraph.pl`` or speedscope).
+* ``report.txt``: the time taken by each of the main parts of a review (see
+  :func:`section`), and the lines that allocated the most memory in each of
+  them and overall, from :mod:`tracemalloc`.
+
+Profiling adds a lot of overhead, so the times are only useful relative to
+each other. Nothing here is imported until profiling is requested.
+"""
+
+import collections
+import contextlib
+import pathlib
+import sys
+import threading
+import time
+from collections.abc import Generator
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+# How often to sample the stacks of every thread, in seconds.
+SAMPLE_INTERVAL = 0.005
+# How many lines to include in each allocation report.
+TOP_ALLOCATIONS = 25
+
+_current: 'Profiler | None' = None
+
+
+def profiled(directory: pathlib.Path | None) -> contextlib.AbstractContextManager[Any]:
+    """Profile the enclosed code, writing the results to ``directory``, if it is given."""
+    if directory is None:
+        return contextlib.nullcontext()
+    return Profiler(directory)
+
+
+@contextlib.contextmanager
+def section(name: str) -> Generator[None]:
+    """Measure a part of the run separately, if it is being profiled."""
+    profiler = _current
+    if profiler is None:
+        yield
+        return
+    with profiler.section(name):
+        yield
+
+
+class _Section:
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        # Bytes and blocks allocated (and not yet freed) by each line.
+        self.allocations: collections.Counter[str] = collections.Counter()
+        self.blocks: collections.Counter[str] = collections.Counter()
+
+
+class Profiler:
+    """Profile everything that runs while the profiler is active.
+
+    Args:
+        directory: Where to write the results. It is created if needed.
+        top: How many lines to include in each allocation report.
+        interval: How often to sample stacks, in seconds.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        *,
+        top: int = TOP_ALLOCATIONS,
+        interval: float = SAMPLE_INTERVAL,
+    ):
+        self.directory = directory
+        self.top = top
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._profile: cProfile.Profile | None = None
+        self._sections: dict[str, _Section] = {}
+        self._stacks: collections.Counter[str] = collections.Counter()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._start_snapshot: tracemalloc.Snapshot | None = None
+        self._started = 0.0
+        self._started_cpu = 0.0
+
+    def __enter__(self) -> 'Profiler':
+        global _current
+        import cProfile
+        import tracemalloc
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tracemalloc.start()
+        self._start_snapshot = tracemalloc.take_snapshot()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+        _current = self
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        global _current
+        import tracemalloc
+
+        _current = None
+        elapsed = time.perf_counter() - self._started
+        cpu = time.process_time() - self._started_cpu
+        if self._profile is not None:
+            self._profile.disable()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        overall = _Section()
+        overall.calls, overall.wall, overall.cpu = 1, elapsed, cpu
+        if self._start_snapshot is not None:
+            self._add_allocations(overall, snapshot.compare_to(self._start_snapshot, 'lineno'))
+        self._write_pstats()
+        self._write_collapsed()
+        self._write_report(overall)
+        print(f'Profile written to {self.directory}', file=sys.stderr)
+
+    @contextlib.contextmanager
+    def section(self, name: str) -> Generator[None]:
+        """Measure the time taken and memory allocated by the enclosed code."""
+        import tracemalloc
+
+        before = tracemalloc.take_snapshot()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            diff = tracemalloc.take_snapshot().compare_to(before, 'lineno')
+            with self._lock:
+                stats = self._sections.setdefault(name, _Section())
+                stats.calls += 1
+                stats.wall += wall
+                stats.cpu += cpu
+                self._add_allocations(stats, diff)
+
+    @staticmethod
+    def _add_allocations(stats: _Section, diff: 'list[tracemalloc.StatisticDiff]'):
+        for entry in diff:
+            frame = entry.traceback[0]
+            where = f'{frame.filename}:{frame.lineno}'
+            stats.allocations[where] += entry.size_diff
+            stats.blocks[where] += entry.count_diff
+
+    def _sample(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                names = []
+                current = frame
+                while current is not None:
+                    code = current.f_code
+                    names.append(f'{pathlib.Path(code.co_filename).name}:{code.co_qualname}')
+                    current = current.f_back
+                self._stacks[';'.join(reversed(names))] += 1
+
+    def _write_pstats(self):
+        if self._profile is not None:
+            self._profile.dump_stats(self.directory / 'profile.pstats')
+
+    def _write_collapsed(self):
+        with (self.directory / 'profile.collapsed').open('w', encoding='utf-8') as f:
+            for stack, count in sorted(self._stacks.items()):
+                f.write(f'{stack} {count}\n')
+
+    def _write_report(self, overall: _Section):
+        lines = [
+            f'{"Section":<28}{"Calls":>7}{"Wall (s)":>11}{"CPU (s)":>10}{"Allocated (KiB)":>17}'
+        ]
+        sections = [*self._sections.items(), ('(overall)', overall)]
+        for name, stats in sections:
+            allocated = sum(size for size in stats.allocations.values() if size > 0) / 1024
+            lines.append(
+                f'{name:<28}{stats.calls:>7}{stats.wall:>11.3f}{stats.cpu:>10.3f}'
+                f'{allocated:>17.1f}'
+            )
+        for name, stats in sections:
+            lines.append('')
+            lines.append(f'Top {self.top} allocations in {name}:')
+            for where, size in stats.allocations.most_common(self.top):
+                if size <= 0:
+                    break
+                lines.append(f'{size / 1024:>12.1f} KiB {stats.blocks[where]:>+9} blocks  {where}')
+        (self.directory / 'report.txt').write_text('\n'.join(lines) + '\n', encoding='utf-8')
@@ -0,0 +1,190 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pace GitHub API requests so that bursts of reviews don't exhaust the quota.
+
+GitHub has a primary rate limit (a quota of requests, or GraphQL points, that
+is reset every hour) and secondary rate limits (which reject requests that
+arrive too quickly, particularly ones that create content, such as comments).
+
+A single :class:`RateLimitGovernor` is shared by everything in the process
+that uses the same token. Before each request, it takes a token from a bucket
+that refills at a steady rate, slowing down further when the remaining quota
+would otherwise run out before it is reset, and pausing entirely when it has
+run out. When GitHub reports a secondary rate limit, requests are paused for
+the time GitHub asks for, or for an exponentially increasing time if it
+doesn't say.
+"""
+
+import datetime
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+# GitHub asks for no more than 80 content-creating requests a minute.
+DEFAULT_RATE = 80 / 60
+DEFAULT_BURST = 10
+# Leave some of the quota for anything else using the same token.
+DEFAULT_RESERVE = 50
+# How long to wait after a secondary rate limit when GitHub doesn't say.
+_MIN_BACKOFF = 60
+_MAX_BACKOFF = 15 * 60
+# Allow for rounding when the refill after a wait comes to a whisker under a
+# token, which would otherwise wait again for a vanishingly short time.
+_TOKEN_TOLERANCE = 1e-6
+
+
+class RateLimitGovernor:
+    """Track GitHub's rate limits, and pace requests to stay within them.
+
+    Args:
+        rate: The maximum sustained number of requests per second.
+        burst: The number of requests that can be made at once after a quiet
+            period.
+        reserve: The part of the primary quota to leave unused.
+        clock: Returns the current time, as seconds since the epoch.
+        sleep: Waits for the given number of seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        reserve: int = DEFAULT_RESERVE,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = clock()
+        self._paused_until = 0.0
+        self._backoffs = 0
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.requests = 0
+        self.secondary_limits = 0
+        self.waited = 0.0
+
+    def _current_rate(self, now: float) -> float:
+        """The rate that spreads the remaining quota until it is reset."""
+        if self.remaining is None or self.reset_at is None or self.reset_at <= now:
+            return self.rate
+        spare = self.remaining - self.reserve
+        if spare <= 0:
+            return 0.0
+        return min(self.rate, spare / (self.reset_at - now))
+
+    def _delay(self) -> float:
+        """Take a token if one is available, otherwise return how long to wait."""
+        now = self._clock()
+        if self._paused_until > now:
+            return self._paused_until - now
+        rate = self._current_rate(now)
+        if rate <= 0:
+            assert self.reset_at is not None  # A zero rate requires a reset time.
+            return self.reset_at - now
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+        if self._tokens >= 1 - _TOKEN_TOLERANCE:
+            self._tokens = max(self._tokens - 1, 0.0)
+            self.requests += 1
+            return 0.0
+        return (1 - self._tokens) / rate
+
+    def acquire(self):
+        """Wait until a request can be made."""
+        while True:
+            with self._lock:
+                delay = self._delay()
+                if delay <= 0:
+                    return
+                self.waited += delay
+            self._sleep(delay)
+
+    def update(self, limit: int, remaining: int, reset_at: float):
+        """Record the primary rate limit state reported by GitHub.
+
+        Args:
+            limit: The size of the quota.
+            remaining: How much of the quota is left.
+            reset_at: When the quota is reset, as seconds since the epoch.
+        """
+        with self._lock:
+            self.limit = limit
+            self.remaining = remaining
+            self.reset_at = reset_at
+            self._backoffs = 0
+
+    def update_from_graphql(self, rate_limit: dict[str, Any] | None):
+        """Record the ``rateLimit { limit remaining resetAt }`` of a GraphQL query."""
+        if not rate_limit:
+            return
+        reset_at = datetime.datetime.fromisoformat(rate_limit['resetAt']).timestamp()
+        self.update(rate_limit['limit'], rate_limit['remaining'], reset_at)
+
+    def backoff(self, retry_after: float | None = None):
+        """Pause all requests after GitHub rejected one for being too fast.
+
+        Args:
+            retry_after: How long GitHub asked us to wait, in seconds. If not
+                provided, the wait starts at a minute and doubles each time.
+        """
+        with self._lock:
+            if retry_after is None:
+                retry_after = min(_MIN_BACKOFF * 2**self._backoffs, _MAX_BACKOFF)
+            self._backoffs += 1
+            self.secondary_limits += 1
+            self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            # Don't follow the pause with a burst: start refilling when it ends.
+            self._tokens = 0.0
+            self._refilled_at = self._paused_until
+
+    def state(self) -> dict[str, Any]:
+        """The current state, suitable for including in a JSON report."""
+        with self._lock:
+            now = self._clock()
+            reset_at = None
+            if self.reset_at is not None:
+                reset_at = datetime.datetime.fromtimestamp(self.reset_at, datetime.UTC)
+            return {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'reset_at': reset_at.isoformat() if reset_at else None,
+                'rate': round(self._current_rate(now), 3),
+                'paused_for': round(max(self._paused_until - now, 0.0), 3),
+                'requests': self.requests,
+                'secondary_limits': self.secondary_limits,
+                'waited': round(self.waited, 3),
+            }
+
+
+_default_governor: RateLimitGovernor | None = None
+_default_governor_lock = threading.Lock()
+
+
+def default_governor() -> RateLimitGovernor:
+    """The governor shared by everything in this process."""
+    global _default_governor
+    with _default_governor_lock:
+        if _default_governor is None:
+            _default_governor = RateLimitGovernor()
+        return _default_governor
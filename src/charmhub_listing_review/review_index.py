@@ -0,0 +1,172 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Keep track of how many open listing reviews each reviewer is assigned.
+
+New reviews go to whoever has the fewest open reviews (see
+:func:`~charmhub_listing_review.update_issue.pick_reviewer`), so we need to
+know who each open listing request is assigned to. Rather than fetching every
+open request each time, the index is kept in a small on-disk cache, and
+refreshed by asking GitHub only for the requests that changed since the last
+refresh. A full refresh is done when the cache is missing or old, which also
+catches requests that have had the label removed.
+"""
+
+import collections
+import contextlib
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .links import cache_dir
+
+if TYPE_CHECKING:
+    from . import github
+
+# How often to ask GitHub for changes, at most. Assignments made by this
+# process are recorded immediately, so are never missed.
+MIN_REFRESH_INTERVAL = 60
+# How old the index can get before it is rebuilt from scratch.
+MAX_AGE = 24 * 60 * 60
+
+
+def default_path(owner: str, name: str) -> pathlib.Path | None:
+    """Where to keep the index for the OWNER/NAME repository.
+
+    Returns ``None`` if the repository is left for `gh` to work out (so the
+    owner and name are placeholders), in which case the index is not kept.
+    """
+    if owner == '{owner}':  # noqa: RUF027 - the gh placeholder.
+        return None
+    return cache_dir() / f'reviews-{owner}-{name}.json'
+
+
+class OpenReviewIndex:
+    """The assignees of each open listing request, optionally persisted as JSON.
+
+    Args:
+        label: The label that listing requests have.
+        path: Where to load and save the index. If ``None``, the index only
+            lives in memory.
+        min_refresh_interval: Seconds to wait between asking GitHub for
+            changes.
+        max_age: Seconds after which the index is rebuilt from scratch.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        path: pathlib.Path | None = None,
+        *,
+        min_refresh_interval: float = MIN_REFRESH_INTERVAL,
+        max_age: float = MAX_AGE,
+    ):
+        self.label = label
+        self.path = path
+        self.min_refresh_interval = min_refresh_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._issues: dict[int, list[str]] = {}
+        # The latest update time that GitHub reported, used to ask for changes
+        # since then. GitHub's clock is used so that clock skew can't cause
+        # changes to be missed.
+        self._since: str | None = None
+        self._built_at = 0.0
+        self._refreshed_at = 0.0
+        if path is not None:
+            self._load(path)
+
+    def _load(self, path: pathlib.Path):
+        try:
+            with path.open('r', encoding='utf-8') as f:
+                raw = json.load(f)
+            issues = {int(number): list(logins) for number, logins in raw['issues'].items()}
+            since = str(raw['since'])
+            built_at = float(raw['built_at'])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return
+        self._issues, self._since, self._built_at = issues, since, built_at
+
+    def _save(self):
+        if self.path is None:
+            return
+        data = {
+            'issues': {str(number): logins for number, logins in self._issues.items()},
+            'since': self._since,
+            'built_at': self._built_at,
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix='.reviews-')
+        except OSError:
+            return
+        # Write to a temporary file and rename, so that concurrent runs never
+        # see a partially written index.
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_name)
+
+    def refresh(self, client: 'github.GitHub'):
+        """Bring the index up to date with GitHub.
+
+        Nothing is fetched if the index was refreshed within the last
+        ``min_refresh_interval`` seconds.
+        """
+        with self._lock:
+            now = time.time()
+            if now - self._refreshed_at < self.min_refresh_interval:
+                return
+            full = self._since is None or now - self._built_at > self.max_age
+            assignments = client.list_assignments(self.label, None if full else self._since)
+            if full:
+                self._issues = {}
+                self._since = None
+                self._built_at = now
+            for assignment in assignments:
+                if assignment.open:
+                    self._issues[assignment.number] = assignment.assignees
+                else:
+                    self._issues.pop(assignment.number, None)
+                if self._since is None or assignment.updated_at > self._since:
+                    self._since = assignment.updated_at
+            if self._since is None:
+                # There are no open requests, so start the next refresh from now.
+                self._since = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+            self._refreshed_at = now
+            self._save()
+
+    def record(self, issue_number: int, login: str):
+        """Record that this process assigned the issue to ``login``."""
+        with self._lock:
+            assignees = self._issues.setdefault(issue_number, [])
+            if login not in assignees:
+                assignees.append(login)
+
+    def load(self) -> collections.Counter[str]:
+        """The number of open listing requests assigned to each reviewer.
+
+        Logins are lowercase, since GitHub logins are not case sensitive.
+        """
+        with self._lock:
+            return collections.Counter(
+                login.lower() for logins in self._issues.values() for login in logins
+            )
@@ -29,11 +29,29 @@ console in a user-friendly format instead of updating a GitHub issue.
 """
 
 import argparse
+import pathlib
 import sys
+import time
+from collections.abc import Iterable
+from typing import TextIO
 
-from .evaluate import evaluate, get_default_branch
+from . import profiling
+from .evaluate import (
+    CHECKS,
+    CheckResult,
+    LocalRepository,
+    ResourceLimits,
+    evaluate_iter,
+    get_default_branch,
+    tooling_limits,
+    working_tree,
+)
+from .sphinx_refs import convert_sphinx_refs
 from .update_issue import issue_comment
 
+# How often to look for changed files in watch mode, in seconds.
+WATCH_INTERVAL = 0.2
+
 
 def format_checklist_for_console(checklist_markdown: str) -> str:
     """Format the markdown checklist for console output."""
@@ -58,24 +76,72 @@ def format_checklist_for_console(checklist_markdown: str) -> str:
     return '\n'.join(formatted_lines)
 
 
-def print_self_review_results(
-    charm_name: str,
-    project_repo: str = '',
-    ci_linting: str = '',
-    branch: str = '',
-    charm_dir: str = '.',
-):
-    """Print the self-review results to console."""
-    print(f"\n\033[1m🔍 Charmhub Public Listing Self-Review for '{charm_name}'\033[0m")
-    print('=' * (45 + len(charm_name)))
+class ProgressReporter:
+    """Show each check result as soon as it is available.
 
-    comment = issue_comment(
-        charm_name,
-        '',  # demo_url is not used.
-        '',  # ci_release_url is not used.
-        '',  # ci_integration_url is not used.
-        '',  # documentation_link is not used.
-    )
+    Results are written as they arrive, so that authors can see that the
+    review is making progress. On a terminal, a live progress line below the
+    results shows how many checks have finished.
+
+    Args:
+        stream: Where to write the results. The final checklist is written to
+            stdout, so this defaults to stderr to keep the two separate when
+            the output is redirected.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stderr
+        self.live = self.stream.isatty()
+        self.started = time.monotonic()
+        self.done = 0
+
+    def _write(self, text: str):
+        if self.live:
+            # Replace the progress line.
+            text = f'\r\033[K{text}'
+        self.stream.write(text)
+        self.stream.flush()
+
+    def status(self, message: str):
+        """Show what is happening now, if the stream is a terminal."""
+        if self.live:
+            self._write(f'⏳ {message}')
+
+    def result(self, result: CheckResult):
+        """Show the result of a check, and update the progress line."""
+        self.done += 1
+        item = convert_sphinx_refs(result.item)
+        if not result.passed:
+            item = item.replace('* [ ]', '* [o]', 1)
+        line = format_checklist_for_console(item)
+        if result.usage is not None:
+            line += (
+                f' ({result.duration:.0f}s, {result.usage.cpu_time:.0f}s CPU,'
+                f' {result.usage.max_rss / 1024**2:.0f} MiB peak memory)'
+            )
+        elif result.duration >= 1:
+            line += f' ({result.duration:.0f}s)'
+        self._write(f'{line}\n')
+        elapsed = time.monotonic() - self.started
+        self.status(f'{self.done}/{result.total} automated checks done ({elapsed:.0f}s)')
+
+    def finish(self) -> float:
+        """Remove the progress line, and return how long the checks took."""
+        if self.live:
+            self._write('')
+        return time.monotonic() - self.started
+
+
+def _self_review_checklist(charm_name: str) -> str:
+    """The listing checklist, with every item unticked, in the form used for the console."""
+    with profiling.section('issue_comment'):
+        comment = issue_comment(
+            charm_name,
+            '',  # demo_url is not used.
+            '',  # ci_release_url is not used.
+            '',  # ci_integration_url is not used.
+            '',  # documentation_link is not used.
+        )
     # The initial items need to have the links removed.
     fixed_checks = """
     ### Basic Requirements
@@ -92,42 +158,111 @@ def print_self_review_results(
     )
 
     # TODO: it would be great if we had a better wrapping story, both for GitHub and console.
-    comment = comment.replace('are also\nrequired for listing.', 'are also required for listing.')
+    return comment.replace('are also\nrequired for listing.', 'are also required for listing.')
+
+
+def _apply_results(comment: str, results: Iterable[CheckResult]) -> str:
+    """Tick the items that passed, and mark the ones that failed with '* [o]'."""
+    with profiling.section('apply_automated_checks'):
+        for result in (r.item for r in sorted(results, key=lambda r: r.index)):
+            if not result:
+                continue
+
+            unchecked_version = result.replace('* [x]', '* [ ]')
+            if unchecked_version in comment:
+                if result.startswith('* [x]'):
+                    comment = comment.replace(unchecked_version, result)
+                else:
+                    failed_version = unchecked_version.replace('* [ ]', '* [o]')
+                    comment = comment.replace(unchecked_version, failed_version)
+
+        # For checks that weren't automated, we already leave them as '* [ ]' (unknown)
+    return comment
+
+
+def _print_checklist(comment: str):
+    with profiling.section('console_formatting'):
+        formatted_checklist = format_checklist_for_console(comment)
+    print(formatted_checklist)
+
+    completed_count = comment.count('* [x]')
+    failed_count = comment.count('* [o]')
+    unknown_count = comment.count('* [ ]')
+
+    print(
+        f'\n\033[1m📊 Progress: {completed_count} passed, {failed_count} failed, '
+        f'{unknown_count} manual review needed\033[0m'
+    )
+
+
+def _repository_urls(project_repo: str, branch: str) -> tuple[str, str, str, str]:
+    """The branch, and the contribution, license, and security URLs to check."""
+    # Like update-issue, this assumes it's GitHub for now.
+    default_branch = branch or get_default_branch(project_repo)
+    return (
+        default_branch,
+        f'{project_repo}/blob/{default_branch}/CONTRIBUTING.md',
+        f'{project_repo}/blob/{default_branch}/LICENSE',
+        f'{project_repo}/blob/{default_branch}/SECURITY.md',
+    )
+
+
+def print_self_review_results(
+    charm_name: str,
+    project_repo: str = '',
+    ci_linting: str = '',
+    branch: str = '',
+    charm_dir: str = '.',
+    repo_dir: pathlib.Path | None = None,
+    limits: ResourceLimits | None = None,
+):
+    """Print the self-review results to console.
+
+    If ``repo_dir`` is given, that local working tree is reviewed in place,
+    rather than cloning ``project_repo``. ``limits`` are the resources that
+    the charm's tooling commands may use.
+    """
+    print(f"\n\033[1m🔍 Charmhub Public Listing Self-Review for '{charm_name}'\033[0m")
+    print('=' * (45 + len(charm_name)))
+
+    comment = _self_review_checklist(charm_name)
 
     if project_repo:
-        # Like update-issue, this assumes it's GitHub for now.
-        default_branch = branch or get_default_branch(project_repo)
-        contribution_url = f'{project_repo}/blob/{default_branch}/CONTRIBUTING.md'
-        license_url = f'{project_repo}/blob/{default_branch}/LICENSE'
-        security_url = f'{project_repo}/blob/{default_branch}/SECURITY.md'
+        default_branch, contribution_url, license_url, security_url = _repository_urls(
+            project_repo, branch
+        )
 
+        progress = ProgressReporter()
+        print('\n\033[1m⚙️  Running automated checks\033[0m', file=progress.stream)
+        progress.status(
+            'Checking links' if repo_dir else 'Cloning the repository and checking links'
+        )
+        results: list[CheckResult] = []
         try:
-            results = evaluate(
-                charm_name,
-                project_repo,
-                ci_linting or '',
-                contribution_url,
-                license_url,
-                security_url,
-                default_branch,
-                charm_dir=charm_dir,
+            try:
+                with profiling.section('evaluate'):
+                    for check_result in evaluate_iter(
+                        charm_name,
+                        project_repo,
+                        ci_linting or '',
+                        contribution_url,
+                        license_url,
+                        security_url,
+                        default_branch,
+                        charm_dir=charm_dir,
+                        repo_dir=repo_dir,
+                        limits=limits,
+                    ):
+                        results.append(check_result)
+                        progress.result(check_result)
+            finally:
+                elapsed = progress.finish()
+            print(
+                f'   Finished {len(results)} automated checks in {elapsed:.0f}s.',
+                file=progress.stream,
             )
 
-            automated_checks = set()
-            for result in results:
-                if not result:
-                    continue
-
-                unchecked_version = result.replace('* [x]', '* [ ]')
-                automated_checks.add(unchecked_version)
-                if unchecked_version in comment:
-                    if result.startswith('* [x]'):
-                        comment = comment.replace(unchecked_version, result)
-                    else:
-                        failed_version = unchecked_version.replace('* [ ]', '* [o]')
-                        comment = comment.replace(unchecked_version, failed_version)
-
-            # For checks that weren't automated, we already leave them as '* [ ]' (unknown)
+            comment = _apply_results(comment, results)
         except Exception as e:
             print('\n⚠️  Warning: Could not run automated checks on repository.')
             print(
@@ -141,17 +276,7 @@ def print_self_review_results(
             else:
                 print(f'   Error details: {e}')
 
-    formatted_checklist = format_checklist_for_console(comment)
-    print(formatted_checklist)
-
-    completed_count = comment.count('* [x]')
-    failed_count = comment.count('* [o]')
-    unknown_count = comment.count('* [ ]')
-
-    print(
-        f'\n\033[1m📊 Progress: {completed_count} passed, {failed_count} failed, '
-        f'{unknown_count} manual review needed\033[0m'
-    )
+    _print_checklist(comment)
     print('\n💡 Note: This self-review covers automated checks only.')
     print('   A human reviewer will perform additional checks during the official review process.')
     print('\n📋 To submit your charm for official review, create an issue at:')
@@ -161,19 +286,139 @@ def print_self_review_results(
     )
 
 
-def main():
-    """Main entry point for the self-review tool."""
+def _file_states(
+    charm_path: pathlib.Path, local_files: dict[int, pathlib.Path]
+) -> dict[int, dict[pathlib.Path, tuple[int, int]]]:
+    """The modification time and size of the files that each check reads.
+
+    ``local_files`` are the files in the working tree that the link checks
+    refer to (such as the license), by the index of the check.
+    """
+    states: dict[int, dict[pathlib.Path, tuple[int, int]]] = {}
+    for index, check in enumerate(CHECKS):
+        paths = [path for pattern in check.files for path in charm_path.glob(pattern)]
+        if index in local_files:
+            paths.append(local_files[index])
+        state = states[index] = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+    return states
+
+
+def watch_self_review(
+    charm_name: str,
+    project_repo: str,
+    repo_dir: pathlib.Path,
+    ci_linting: str = '',
+    branch: str = '',
+    charm_dir: str = '.',
+    interval: float = WATCH_INTERVAL,
+    limits: ResourceLimits | None = None,
+):
+    """Review a local working tree, then re-run checks as the files they read change.
+
+    Only the few files that the checks read are polled, so a change is noticed
+    within ``interval`` seconds on any platform, and only the checks that read
+    the changed files are run again. The checklist is redrawn after each run,
+    until interrupted. ``limits`` are the resources that the charm's tooling
+    commands may use.
+    """
+    comment = _self_review_checklist(charm_name)
+    default_branch, contribution_url, license_url, security_url = _repository_urls(
+        project_repo, branch
+    )
+    urls = {
+        'contribution_url': contribution_url,
+        'license_url': license_url,
+        'security_url': security_url,
+    }
+    local_repo = LocalRepository(project_repo, default_branch, repo_dir)
+    local_files: dict[int, pathlib.Path] = {}
+    for index, check in enumerate(CHECKS):
+        path = local_repo.local_path(urls[check.args[0]]) if check.args[0] in urls else None
+        if path is not None:
+            local_files[index] = path
+    charm_path = repo_dir / charm_dir
+    results: dict[int, CheckResult] = {}
+    checks: set[int] | None = None
+    try:
+        while True:
+            # Look at the files before the checks read them, so that changes
+            # made during the run are not missed.
+            states = _file_states(charm_path, local_files)
+            started = time.monotonic()
+            try:
+                for result in evaluate_iter(
+                    charm_name,
+                    project_repo,
+                    ci_linting,
+                    contribution_url,
+                    license_url,
+                    security_url,
+                    default_branch,
+                    charm_dir=charm_dir,
+                    repo_dir=repo_dir,
+                    checks=checks,
+                    limits=limits,
+                ):
+                    results[result.index] = result
+                status = (
+                    f'Ran {len(CHECKS) if checks is None else len(checks)} of {len(CHECKS)} '
+                    f'automated checks in {(time.monotonic() - started) * 1000:.0f}ms.'
+                )
+            except Exception as e:
+                status = f'⚠️  Could not run the automated checks: {e}'
+            if sys.stdout.isatty():
+                # Redraw the checklist in place.
+                print('\033[H\033[2J', end='')
+            print(f"\033[1m🔍 Charmhub Public Listing Self-Review for '{charm_name}'\033[0m")
+            _print_checklist(_apply_results(comment, results.values()))
+            print(f'\n{status}')
+            print(f'👀 Watching {charm_path} for changes. Press Ctrl+C to stop.', flush=True)
+            while True:
+                time.sleep(interval)
+                current = _file_states(charm_path, local_files)
+                checks = {index for index, state in current.items() if state != states[index]}
+                if checks:
+                    break
+    except KeyboardInterrupt:
+        print()
+
+
+def main(argv: list[str] | None = None):
+    """Main entry point for the self-review tool.
+
+    This runs the review in this process: the ``self-review`` command runs it
+    in the background worker instead, if there is one (see
+    :mod:`~charmhub_listing_review.worker`).
+    """
     parser = argparse.ArgumentParser(
+        prog='self-review',
         description='Perform a self-review of charm listing requirements.',
         formatter_class=argparse.RawDescriptionHelpFormatter,
+        # Options such as --watch must not reach the worker, which can only
+        # tell them apart from the others if they are spelled out in full.
+        allow_abbrev=False,
     )
 
     parser.add_argument('--charm-name', required=True, help='Name of the charm to review')
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         '--repository',
-        required=True,
         help='URL of the charm repository (e.g., https://github.com/<user>/<workload>-operator)',
     )
+    source.add_argument(
+        '--path',
+        type=pathlib.Path,
+        help=(
+            'Review a local checkout of the charm in place, rather than cloning the repository. '
+            'The repository and branch are read from the git metadata.'
+        ),
+    )
     parser.add_argument('--ci-linting-url', help='URL to CI linting workflow')
     parser.add_argument(
         '--branch',
@@ -183,25 +428,77 @@ def main():
         '--charm-dir',
         default='.',
         help=(
-            'Relative path to the charm directory within the repository '
+            'Relative path to the charm directory within the repository, or within --path '
             '(default: repository root). Useful for monorepos.'
         ),
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        '--profile',
+        type=pathlib.Path,
+        metavar='DIR',
+        help=(
+            'Profile the run, and write CPU, flame graph, and memory allocation reports to this '
+            'directory'
+        ),
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help=(
+            'With --path, keep running, and re-run the checks that read a file whenever it changes'
+        ),
+    )
+
+    parser.add_argument(
+        '--no-worker',
+        action='store_true',
+        help='Run the review in this process, even if a self-review worker is running',
+    )
+
+    args = parser.parse_args(argv)
 
-    if not args.charm_name or not args.repository:
+    if not args.charm_name or not (args.repository or args.path):
         parser.print_help()
         sys.exit(1)
+    if args.watch and args.path is None:
+        parser.error('--watch can only be used with --path')
+    try:
+        limits = tooling_limits()
+    except ValueError as e:
+        parser.error(str(e))
 
     try:
-        print_self_review_results(
-            charm_name=args.charm_name,
-            project_repo=args.repository,
-            ci_linting=args.ci_linting_url or '',
-            branch=args.branch or '',
-            charm_dir=args.charm_dir,
-        )
+        repository, branch, charm_dir = args.repository, args.branch or '', args.charm_dir
+        repo_dir = None
+        if args.path is not None:
+            tree = working_tree(args.path)
+            repository, repo_dir = tree.repository_url, tree.path
+            branch = branch or tree.branch
+            charm_dir = str(pathlib.PurePosixPath(tree.charm_dir) / args.charm_dir)
+        if args.watch:
+            assert repo_dir is not None
+            with profiling.profiled(args.profile):
+                watch_self_review(
+                    args.charm_name,
+                    repository,
+                    repo_dir,
+                    ci_linting=args.ci_linting_url or '',
+                    branch=branch,
+                    charm_dir=charm_dir,
+                    limits=limits,
+                )
+            return
+        with profiling.profiled(args.profile):
+            print_self_review_results(
+                charm_name=args.charm_name,
+                project_repo=repository,
+                ci_linting=args.ci_linting_url or '',
+                branch=branch,
+                charm_dir=charm_dir,
+                repo_dir=repo_dir,
+                limits=limits,
+            )
     except KeyboardInterrupt:
         print('\n\n⚡ Review cancelled by user.')
         sys.exit(1)
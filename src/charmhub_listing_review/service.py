@@ -0,0 +1,461 @@
+#! /usr/bin/env python3
+
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Long-running service that reviews listing requests as issue events arrive.
+
+Running `update-issue` from a fresh GitHub Actions job for every event means
+that most of the time is spent installing the package, starting Python, and
+re-establishing connections. This service instead stays running, and keeps
+connections to GitHub, mirrors of the charm repositories, and the best practices
+list warm between reviews.
+
+Events are GitHub `issues` webhook payloads, either POSTed to the service's HTTP
+endpoint or written as `.json` files into a spool directory. Events are
+queued and reviewed by a fixed number of workers. When the queue is full, the
+HTTP endpoint responds with 503 (so that the sender retries later), and spooled
+files are left where they are until there is room. ``GET /status`` reports the
+queue and the GitHub rate limit state. Events POSTed to the endpoint must be
+signed with the webhook secret in `GITHUB_WEBHOOK_SECRET`: the service won't
+listen without one unless `--insecure` is given.
+
+Authors often edit an issue several times in a row, so events for the same
+issue are coalesced: an issue is queued at most once, and only one review of an
+issue runs at a time. If an event arrives while the issue is being reviewed,
+that review is cancelled (killing any commands it is running, and removing its
+clone), and the issue is reviewed again with the new input.
+"""
+
+import argparse
+import hashlib
+import hmac
+import http.server
+import json
+import logging
+import os
+import pathlib
+import queue
+import threading
+import time
+from typing import Any
+
+from . import github, links
+from .evaluate import Cancelled, ResourceLimits, tooling_limits
+from .review_index import OpenReviewIndex, default_path
+from .update_issue import LISTING_REQUEST_LABEL, review_issue
+
+logger = logging.getLogger(__name__)
+
+# The same issue actions that trigger the review workflow.
+_REVIEW_ACTIONS = {'opened', 'labeled', 'reopened'}
+
+
+def issue_number_from_event(event: Any) -> int | None:
+    """The number of the listing request issue that needs reviewing, if any.
+
+    Events for other issues, or for actions that don't affect the review (such
+    as comments or closing the issue), return ``None``.
+    """
+    if not isinstance(event, dict):
+        return None
+    issue = event.get('issue')
+    if not isinstance(issue, dict) or not isinstance(issue.get('number'), int):
+        return None
+    if event.get('action', 'opened') not in _REVIEW_ACTIONS:
+        return None
+    if issue.get('state', 'open') != 'open':
+        return None
+    labels = [label.get('name', '') for label in issue.get('labels', [])]
+    if not any(LISTING_REQUEST_LABEL in label for label in labels):
+        return None
+    return issue['number']
+
+
+class ReviewService:
+    """Queue listing request reviews and process them with a pool of workers.
+
+    Args:
+        client: Used to read and update the issues. Sharing one client keeps
+            its connections open between reviews.
+        workers: How many reviews to run at the same time.
+        queue_size: How many reviews can be waiting before new events are
+            rejected.
+        reviewers_file: Passed on to :func:`review_issue`.
+        assign_to: Passed on to :func:`review_issue`.
+        mirror_dir: Where to keep mirrors of the charm repositories.
+        dry_run: Print the updates rather than making them.
+        reviewer_index: Passed on to :func:`review_issue`. Sharing one index
+            means that each review sees the assignments made by the others.
+        limits: The resources that the charm's tooling commands may use.
+    """
+
+    def __init__(
+        self,
+        client: github.GitHub,
+        *,
+        workers: int = 2,
+        queue_size: int = 32,
+        reviewers_file: pathlib.Path | None = None,
+        assign_to: str | None = None,
+        mirror_dir: pathlib.Path | None = None,
+        dry_run: bool = False,
+        reviewer_index: OpenReviewIndex | None = None,
+        limits: ResourceLimits | None = None,
+    ):
+        self.client = client
+        self.workers = workers
+        self.reviewers_file = reviewers_file
+        self.assign_to = assign_to
+        self.mirror_dir = mirror_dir
+        self.dry_run = dry_run
+        self.reviewer_index = reviewer_index
+        self.limits = limits
+        self._queue: queue.Queue[int] = queue.Queue(maxsize=queue_size)
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        # Issues that are queued but not yet started, the cancellation events
+        # of the reviews that are in progress, and a lock per issue so that
+        # a new review waits for a cancelled one to clean up.
+        self._lock = threading.Lock()
+        self._pending: set[int] = set()
+        self._running: dict[int, threading.Event] = {}
+        self._issue_locks: dict[int, threading.Lock] = {}
+
+    def submit(self, event: Any) -> bool:
+        """Queue a review for the issue in ``event``, if it needs one.
+
+        If a review of the issue is already queued, the event is merged into
+        it. If a review of the issue is in progress, it is cancelled, and a new
+        one is queued.
+
+        Returns ``False`` if the queue is full, in which case the event should
+        be retried later. Events that don't need a review are accepted and
+        ignored.
+        """
+        issue_number = issue_number_from_event(event)
+        if issue_number is None:
+            return True
+        with self._lock:
+            if issue_number in self._pending:
+                logger.debug('Issue #%d is already queued', issue_number)
+                return True
+            try:
+                self._queue.put_nowait(issue_number)
+            except queue.Full:
+                return False
+            self._pending.add(issue_number)
+            cancel = self._running.get(issue_number)
+            if cancel is not None:
+                logger.info('Cancelling the superseded review of issue #%d', issue_number)
+                cancel.set()
+        return True
+
+    def start(self):
+        """Start the workers."""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'review-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None):
+        """Stop the workers once they finish any review that is in progress."""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def join(self):
+        """Wait until every queued review has been processed."""
+        self._queue.join()
+
+    def status(self) -> dict[str, Any]:
+        """The state of the service, suitable for reporting as JSON."""
+        with self._lock:
+            running = sorted(self._running)
+            pending = sorted(self._pending)
+        return {
+            'queued': pending,
+            'running': running,
+            'rate_limit': self.client.governor.state(),
+        }
+
+    def review(self, issue_number: int, cancel: threading.Event | None = None):
+        """Review a single issue."""
+        review_issue(
+            self.client,
+            issue_number,
+            reviewers_file=self.reviewers_file,
+            assign_to=self.assign_to,
+            dry_run=self.dry_run,
+            mirror_dir=self.mirror_dir,
+            cancel=cancel,
+            reviewer_index=self.reviewer_index,
+            limits=self.limits,
+        )
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                issue_number = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._review_exclusively(issue_number)
+            finally:
+                self._queue.task_done()
+
+    def _review_exclusively(self, issue_number: int):
+        with self._lock:
+            issue_lock = self._issue_locks.setdefault(issue_number, threading.Lock())
+        with issue_lock:
+            cancel = threading.Event()
+            with self._lock:
+                # Events that arrive from now on need a fresh review.
+                self._pending.discard(issue_number)
+                self._running[issue_number] = cancel
+            try:
+                logger.info('Reviewing issue #%d', issue_number)
+                self.review(issue_number, cancel)
+            except Cancelled:
+                logger.info('Review of issue #%d was superseded', issue_number)
+            except Exception:
+                logger.exception('Review of issue #%d failed', issue_number)
+            finally:
+                with self._lock:
+                    del self._running[issue_number]
+                    if issue_number not in self._pending:
+                        del self._issue_locks[issue_number]
+
+
+def _signature_ok(secret: str, body: bytes, signature: str | None) -> bool:
+    """Whether ``signature`` is GitHub's HMAC signature of ``body``."""
+    if not signature:
+        return False
+    expected = 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+class _EventHandler(http.server.BaseHTTPRequestHandler):
+    service: ReviewService
+    secret: str | None
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length)
+        if self.secret and not _signature_ok(
+            self.secret, body, self.headers.get('X-Hub-Signature-256')
+        ):
+            self._respond(401, 'Invalid signature')
+            return
+        try:
+            event = json.loads(body)
+        except ValueError:
+            self._respond(400, 'Invalid JSON')
+            return
+        if not self.service.submit(event):
+            self.send_response(503)
+            self.send_header('Retry-After', '30')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self._respond(202, 'Accepted')
+
+    def do_GET(self):
+        if self.path != '/status':
+            self._respond(404, 'Not found')
+            return
+        data = json.dumps(self.service.status()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _respond(self, status: int, message: str):
+        data = f'{message}\n'.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any):
+        logger.debug(format, *args)
+
+
+def make_http_server(
+    service: ReviewService, address: tuple[str, int], secret: str | None = None
+) -> http.server.ThreadingHTTPServer:
+    """Create an HTTP server that submits the POSTed events to ``service``.
+
+    If ``secret`` is provided, requests must be signed with it, in the same
+    way that GitHub signs webhook deliveries.
+    """
+    handler = type('EventHandler', (_EventHandler,), {'service': service, 'secret': secret})
+    return http.server.ThreadingHTTPServer(address, handler)
+
+
+def poll_spool(service: ReviewService, spool_dir: pathlib.Path) -> int:
+    """Submit the events in ``spool_dir`` to ``service``, oldest first.
+
+    Each event is a ``.json`` file. Files are removed once they have been
+    queued (or if they can't be parsed, in which case they are renamed with a
+    ``.invalid`` suffix). If the queue fills up, the remaining files are left
+    for the next poll. Returns the number of files processed.
+    """
+    paths = sorted(spool_dir.glob('*.json'), key=lambda p: (p.stat().st_mtime, p.name))
+    processed = 0
+    for path in paths:
+        try:
+            event = json.loads(path.read_text())
+        except (OSError, ValueError):
+            path.rename(path.with_suffix('.invalid'))
+            continue
+        if not service.submit(event):
+            break
+        path.unlink()
+        processed += 1
+    return processed
+
+
+def main():
+    """Run the review service."""
+    parser = argparse.ArgumentParser(
+        description='Review charm listing requests as issue events arrive.'
+    )
+    reviewer_group = parser.add_mutually_exclusive_group(required=True)
+    reviewer_group.add_argument(
+        '--reviewers-file',
+        type=pathlib.Path,
+        help='Path to the reviewers YAML file',
+    )
+    reviewer_group.add_argument(
+        '--assign-to',
+        type=str,
+        help='Override automatic reviewer assignment with this GitHub username',
+    )
+    parser.add_argument(
+        '--listen',
+        default='',
+        help='Accept webhook events over HTTP on this HOST:PORT (e.g. 127.0.0.1:8080)',
+    )
+    parser.add_argument(
+        '--insecure',
+        action='store_true',
+        help='With --listen, accept unsigned events if GITHUB_WEBHOOK_SECRET is not set',
+    )
+    parser.add_argument(
+        '--spool-dir',
+        type=pathlib.Path,
+        help='Read event JSON files from this directory',
+    )
+    parser.add_argument(
+        '--workers', type=int, default=2, help='How many reviews to run at once (default: 2)'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=32,
+        help='How many reviews can wait before new events are rejected (default: 32)',
+    )
+    parser.add_argument(
+        '--mirror-dir',
+        type=pathlib.Path,
+        help=(
+            'Keep mirrors of charm repositories in this directory between reviews '
+            '(default: a directory in the cache directory)'
+        ),
+    )
+    parser.add_argument(
+        '--repo',
+        type=str,
+        help='GitHub repository in OWNER/REPO format (e.g. canonical/charmhub-listing-review)',
+    )
+    parser.add_argument(
+        '--github-transport',
+        choices=['gh', 'http'],
+        default='http',
+        help=(
+            'How to talk to GitHub: directly over HTTPS using the token in GH_TOKEN '
+            '(default), or through the gh CLI'
+        ),
+    )
+    parser.add_argument(
+        '--dry-run', action='store_true', help='Do not update the issues, just print the output'
+    )
+    args = parser.parse_args()
+    if not args.listen and not args.spool_dir:
+        parser.error('At least one of --listen and --spool-dir is required')
+    if args.workers < 1 or args.queue_size < 1:
+        parser.error('--workers and --queue-size must be at least 1')
+    secret = os.environ.get('GITHUB_WEBHOOK_SECRET')
+    if args.listen and not secret and not args.insecure:
+        parser.error(
+            'GITHUB_WEBHOOK_SECRET is required with --listen, so that only signed events are '
+            'accepted (use --insecure to accept unsigned events)'
+        )
+    try:
+        limits = tooling_limits()
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        client = github.connect(args.repo, args.github_transport)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Assignments are balanced using an index of who has open reviews, unless
+    # every review goes to the same person.
+    reviewer_index = None
+    if not args.assign_to:
+        reviewer_index = OpenReviewIndex(
+            LISTING_REQUEST_LABEL, default_path(client.owner, client.name)
+        )
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(threadName)s %(message)s')
+    service = ReviewService(
+        client,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        reviewers_file=args.reviewers_file,
+        assign_to=args.assign_to,
+        mirror_dir=args.mirror_dir or links.cache_dir() / 'mirrors',
+        dry_run=args.dry_run,
+        reviewer_index=reviewer_index,
+        limits=limits,
+    )
+    service.start()
+
+    server = None
+    if args.listen:
+        host, _, port = args.listen.rpartition(':')
+        server = make_http_server(service, (host or '127.0.0.1', int(port)), secret)
+        threading.Thread(target=server.serve_forever, name='http', daemon=True).start()
+        logger.info('Listening for events on %s', args.listen)
+        if not secret:
+            logger.warning('GITHUB_WEBHOOK_SECRET is not set, so unsigned events are accepted')
+    try:
+        while True:
+            if args.spool_dir:
+                poll_spool(service, args.spool_dir)
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info('Shutting down')
+    finally:
+        if server is not None:
+            server.shutdown()
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
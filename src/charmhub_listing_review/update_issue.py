@@ -28,23 +28,80 @@ created issue to be user-friendly, and to include the current checklist.
 """
 
 import argparse
+import hashlib
 import json
 import pathlib
 import random
 import re
+import signal
 import subprocess  # noqa: S404
-import urllib.error
-import urllib.request
-from typing import TypedDict, cast
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, TypedDict, cast
+
+from . import issue_form
+from .evaluate import (
+    Cancelled,
+    CharmDirError,
+    ResourceLimits,
+    evaluate_iter,
+    get_default_branch,
+    tooling_limits,
+)
+from .sphinx_refs import convert_sphinx_refs
 
-import yaml
+if TYPE_CHECKING:
+    from . import github
+    from .review_index import OpenReviewIndex
 
-from .evaluate import evaluate, get_default_branch
-from .sphinx_refs import convert_sphinx_refs
+LISTING_REQUEST_LABEL = 'listing-request'
 
 BEST_PRACTICE_SOURCE = 'https://raw.githubusercontent.com/canonical/operator/refs/heads/main/docs/reuse/best-practices.txt'
 
 
+# How long to reuse the downloaded best practices in a long-running process.
+_BEST_PRACTICES_TTL = 60 * 60
+# How long to wait for the best practices to download, in seconds.
+_BEST_PRACTICES_TIMEOUT = 30
+_best_practices_cache: tuple[float, list[str]] | None = None
+_best_practices_lock = threading.Lock()
+
+
+def _best_practices() -> list[str]:
+    """The list of best practices, as Markdown list items.
+
+    The list is downloaded at most once per hour. A failed download is not
+    remembered, so that it's retried for the next issue. The lock is not held
+    while downloading, so a slow download doesn't hold up other reviews.
+    """
+    global _best_practices_cache
+    with _best_practices_lock:
+        if _best_practices_cache is not None:
+            fetched_at, best_practices = _best_practices_cache
+            if time.monotonic() - fetched_at < _BEST_PRACTICES_TTL:
+                return best_practices
+    import http.client
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(
+            BEST_PRACTICE_SOURCE, timeout=_BEST_PRACTICES_TIMEOUT
+        ) as response:
+            best_practices_content = response.read().decode()
+    except (OSError, http.client.HTTPException, UnicodeDecodeError):
+        # URLError and HTTPError are OSErrors, as are timeouts and connection
+        # resets while reading.
+        return []
+    best_practices_content = convert_sphinx_refs(best_practices_content)
+    # Remove the headings and empty lines.
+    best_practices = [line for line in best_practices_content.splitlines() if line.startswith('-')]
+    with _best_practices_lock:
+        _best_practices_cache = (time.monotonic(), best_practices)
+    return best_practices
+
+
 def issue_summary(name: str):
     """Provide a suitable issue title."""
     return f'Review `{name}` for public listing on Charmhub'
@@ -105,16 +162,7 @@ A charm's documentation should focus on the charm itself. For workload-specific
     )
 
     # fmt: on
-    try:
-        with urllib.request.urlopen(BEST_PRACTICE_SOURCE) as response:
-            best_practices_content = response.read().decode()
-    except (urllib.error.URLError, urllib.error.HTTPError):
-        best_practices = []
-    else:
-        best_practices_content = convert_sphinx_refs(best_practices_content)
-        best_practices = best_practices_content.splitlines()
-    # Remove the headings and empty lines.
-    best_practices = [line for line in best_practices if line.startswith('-')]
+    best_practices = _best_practices()
     if best_practices:
         description.append('\n\n')
         description.append(
@@ -137,6 +185,7 @@ class _IssueData(TypedDict):
     """Typed dictionary for issue data."""
 
     name: str
+    demo: str
     demo_url: str
     project_repo: str
     charm_dir: str
@@ -148,50 +197,20 @@ class _IssueData(TypedDict):
     contribution_link: str
     license_link: str
     security_link: str
+    form_errors: dict[str, str]
 
 
-def get_details_from_issue(issue_number: int, repo: str | None = None):
-    """Fetch details from the issue number using the GitHub CLI.
-
-    Requires `gh` CLI to be installed and authenticated.
-    """
-    cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'body']
-    if repo:
-        cmd.extend(['--repo', repo])
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    body = json.loads(result.stdout)['body']
-
-    # Define the fields to extract and their headings.
-    fields = {
-        'name': '### Charm name',
-        'demo_url': '### Demo',
-        'project_repo': '### Project Repository',
-        'charm_dir': '### Charm Directory',
-        'ci_linting': '### CI Linting',
-        'ci_release_url': '### CI Release',
-        'ci_integration_url': '### CI Integration Tests',
-        'documentation_link': '### Documentation Link',
-        'default_branch': '### Review Branch',
+def details_from_issue_body(body: str):
+    """Extract the listing request details from the body of the issue."""
+    form = issue_form.parse(body)
+    issue_data: dict[str, Any] = {
+        field.key: getattr(form, field.key) for field in issue_form.FIELDS
     }
-
-    # Extract values for each field.
-    issue_data: dict[str, str | None] = {}
-    for key, heading in fields.items():
-        pattern = rf'{re.escape(heading)}\s*\n([^\n]*)'
-        match = re.search(pattern, body)
-        if match:
-            value = match.group(1).strip()
-            issue_data[key] = value
-        else:
-            issue_data[key] = None
+    issue_data['demo_url'] = form.demo_url
+    issue_data['form_errors'] = form.errors
 
     # Default charm_dir to '.' if not provided or empty.
-    if not issue_data.get('charm_dir') or issue_data['charm_dir'] == '_No response_':
+    if not issue_data['charm_dir']:
         issue_data['charm_dir'] = '.'
 
     # These have expected filenames, so we use those rather than require the author provide them.
@@ -211,84 +230,113 @@ def get_details_from_issue(issue_number: int, repo: str | None = None):
     return cast('_IssueData', issue_data)
 
 
-def assign_review(
-    issue_number: int,
-    reviewers_file: pathlib.Path,
-    dry_run: bool = False,
-    repo: str | None = None,
-):
-    """Assign the issue to a team.
-
-    We assign the issue to a single person (generally the manager) from a
-    charming team. The expectation is that they will then delegate the actual
-    review to a member of their team. The manager has overall responsibility for
-    ensuring that the review is completed on time (with Charm Tech responsible
-    for keeping the manager accountable).
-
-    The manager can't assign the issue directly to a reviewer (without having
-    every possible reviewer added as a collaborator on the repository), so they
-    are expected to simply ping them in a comment. Once they have submitted
-    their review, the author can interact with them in the usual way.
+def pick_reviewer(reviewers_file: pathlib.Path, load: Mapping[str, int] | None = None) -> str:
+    """Pick a team, and then a reviewer from that team, from the reviewers file.
+
+    The review goes to the team with the fewest open reviews for its weight
+    (from the optional ``teams`` section of the reviewers file), skipping teams
+    that are at their capacity unless every team is. Within the team, it goes
+    to the reviewer with the fewest open reviews. Ties are broken randomly.
+
+    Args:
+        reviewers_file: The YAML file listing the reviewers and teams.
+        load: The number of open reviews assigned to each reviewer, keyed by
+            lowercase login without the leading '@'. If not provided, all
+            teams are treated as equally busy.
+
+    Returns the reviewer's GitHub username, including the leading '@'.
     """
+    import yaml
+
     with reviewers_file.open('r') as f:
         reviewers_data = yaml.safe_load(f)
     reviewers = reviewers_data['reviewers']
-    teams = [info['team'] for info in reviewers.values()]
-    team = random.choice(teams)  # noqa: S311
-    # If there happen to be multiple people in a team, then randomly pick among
-    # them.
-    team_reviewers = [name for name, info in reviewers.items() if info['team'] == team]
-    reviewer = random.choice(team_reviewers)  # noqa: S311
+    team_settings = reviewers_data.get('teams') or {}
+    load = load or {}
+
+    def reviewer_load(name: str) -> int:
+        return load.get(name.removeprefix('@').lower(), 0)
+
+    teams: dict[str, list[str]] = {}
+    for name, info in reviewers.items():
+        teams.setdefault(info['team'], []).append(name)
+    team_load = {team: sum(map(reviewer_load, names)) for team, names in teams.items()}
+    available = [
+        team
+        for team in teams
+        if team_load[team] < (team_settings.get(team) or {}).get('capacity', float('inf'))
+    ]
+
+    def score(team: str) -> float:
+        return team_load[team] / (team_settings.get(team) or {}).get('weight', 1)
 
-    if not dry_run:
-        cmd = ['gh', 'issue', 'edit', str(issue_number), '--add-assignee', reviewer[1:]]
-        if repo:
-            cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
-    return reviewer
+    best = min(map(score, available or teams))
+    # Consider the least loaded reviewers in each of the least loaded teams.
+    # Choosing between them, rather than between the teams, means that (as
+    # before load was considered) a team with more reviewers is picked more
+    # often when teams are equally busy.
+    candidates = []
+    for team in available or teams:
+        if score(team) == best:
+            least = min(map(reviewer_load, teams[team]))
+            candidates.extend(name for name in teams[team] if reviewer_load(name) == least)
+    return random.choice(candidates)  # noqa: S311
+
+
+_HASH_MARKER = '<!-- listing-review-hash: {} -->'
+_HASH_RE = re.compile(r'<!-- listing-review-hash: ([0-9a-f]+) -->')
+
+
+def comment_hash(comment: str) -> str:
+    """A hash of the comment content, ignoring differences in line endings."""
+    content = _HASH_RE.sub('', comment).replace('\r\n', '\n').strip()
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def _posted_hash(body: str) -> str:
+    """The hash of a posted comment, from its marker if it has one."""
+    match = _HASH_RE.search(body)
+    return match.group(1) if match else comment_hash(body)
 
 
 def update_gh_issue(
-    issue_number: int,
+    issue: 'github.Issue',
     summary: str,
     comment: str,
+    client: 'github.GitHub',
     reviewers_file: pathlib.Path | None = None,
     dry_run: bool = False,
     assign_to: str | None = None,
-    repo: str | None = None,
-):
-    """Update the specified GitHub issue with the latest generated comment."""
-    # Update the issue title.
-    if dry_run:
-        print(summary)
-        print()
-    else:
-        cmd = ['gh', 'issue', 'edit', str(issue_number), '--title', summary]
-        if repo:
-            cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
+    reviewer_index: 'OpenReviewIndex | None' = None,
+) -> bool:
+    """Update the specified GitHub issue with the latest generated comment.
+
+    The title, assignee, and comment changes are all applied in a single
+    request to GitHub. Any of them that are already up to date are skipped, so
+    that an unchanged issue costs no writes and sends no notifications. The
+    comment includes a hidden hash of its content, which is compared rather
+    than the text, so that GitHub normalising the text doesn't cause a write.
+
+    If a reviewer needs to be picked and ``reviewer_index`` is provided, the
+    review goes to whoever is least busy (see :func:`pick_reviewer`).
 
+    Returns whether the issue was (or, in a dry run, would have been) updated.
+    """
     # Assign the issue to the specified reviewer, or pick one automatically.
+    skipped = []
+    assignee = None
     if assign_to:
-        username = assign_to.removeprefix('@')
-        if not dry_run:
-            cmd = ['gh', 'issue', 'edit', str(issue_number), '--add-assignee', username]
-            if repo:
-                cmd.extend(['--repo', repo])
-            subprocess.run(cmd, check=True)
-        manager = f'@{username}'
+        assignee = assign_to.removeprefix('@')
+        manager = f'@{assignee}'
+        if assignee in issue.assignees:
+            assignee = None
+            skipped.append('assignee')
+    elif issue.assignees:
+        manager = f'@{issue.assignees[0]}'
     else:
         assert reviewers_file is not None  # Enforced by argument parser.
-        cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'assignees']
-        if repo:
-            cmd.extend(['--repo', repo])
-        gh = subprocess.run(cmd, capture_output=True, text=True)
-        assignees = json.loads(gh.stdout.strip()).get('assignees', [])
-        manager = (
-            assignees[0]['login']
-            if assignees
-            else assign_review(issue_number, reviewers_file, dry_run, repo)
-        )
+        manager = pick_reviewer(reviewers_file, _reviewer_load(reviewer_index, client))
+        assignee = manager.removeprefix('@')
     request_review = re.sub(
         r'\s',
         ' ',
@@ -300,70 +348,378 @@ review within the next three working days.
 """,
     )
     comment = f'{request_review}\n\n{comment}'
+    content_hash = comment_hash(comment)
+
+    title: str | None = summary
+    if issue.title == summary:
+        title = None
+        skipped.append('title')
+    body: str | None = f'{comment}\n\n{_HASH_MARKER.format(content_hash)}'
+    if issue.bot_comment is not None and _posted_hash(issue.bot_comment.body) == content_hash:
+        body = None
+        skipped.append('comment')
+    if skipped:
+        print(f'Issue #{issue.number}: skipped unchanged {", ".join(skipped)}.')
+    if title is None and assignee is None and body is None:
+        return False
 
-    cmd = ['gh', 'issue', 'view', str(issue_number), '--json', 'comments']
-    if repo:
-        cmd.extend(['--repo', repo])
-    existing_comments = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    existing_comments = json.loads(existing_comments.stdout.strip()).get('comments', [])
-    if not existing_comments:
-        # Create a new comment.
-        if dry_run:
-            print(comment)
-        else:
-            cmd = ['gh', 'issue', 'comment', str(issue_number), '--body', comment]
-            if repo:
-                cmd.extend(['--repo', repo])
-            subprocess.run(cmd, check=True)
-        return
-
-    # Update the first comment with the new content.
     if dry_run:
+        print(summary)
+        print()
         print(comment)
-    else:
-        cmd = [
-            'gh',
-            'issue',
-            'comment',
-            str(issue_number),
-            '--edit-last',  # comment of the current user
-            '--body',
-            comment,
-        ]
-        if repo:
-            cmd.extend(['--repo', repo])
-        subprocess.run(cmd, check=True)
-
-
-def apply_automated_checks(issue_data: _IssueData, comment: str):
-    """Adjust the comment to tick items based on automated checks."""
-    results = evaluate(
-        issue_data['name'],
-        issue_data['project_repo'],
-        issue_data['ci_linting'],
-        issue_data['contribution_link'],
-        issue_data['license_link'],
-        issue_data['security_link'],
-        issue_data['default_branch'],
-        charm_dir=issue_data.get('charm_dir', '.'),
-    )
+        return True
+
+    client.update_issue(issue, title=title, assignee=assignee, comment=body)
+    if reviewer_index is not None and assignee is not None:
+        reviewer_index.record(issue.number, assignee)
+    return True
+
+
+def _reviewer_load(
+    reviewer_index: 'OpenReviewIndex | None', client: 'github.GitHub'
+) -> dict[str, int] | None:
+    """How many open reviews each reviewer has, if known."""
+    if reviewer_index is None:
+        return None
+    from . import github
+
+    try:
+        reviewer_index.refresh(client)
+    except (github.GitHubError, subprocess.CalledProcessError, OSError, ValueError) as e:
+        # Assigning based on slightly stale information is better than not
+        # assigning at all.
+        print(f'Could not refresh the open review index: {e}', file=sys.stderr)
+    return reviewer_index.load()
+
+
+def apply_automated_checks(
+    issue_data: _IssueData,
+    comment: str,
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+    deadline: float | None = None,
+    limits: ResourceLimits | None = None,
+):
+    """Adjust the comment to tick items based on automated checks.
+
+    If ``deadline`` is provided, the checks that don't finish within that many
+    seconds are listed at the end of the comment, so that the reviewer knows
+    to do them by hand. ``limits`` are the resources that the charm's tooling
+    commands may use.
+
+    If the charm directory is not a charm in the repository, no items are
+    ticked, and the problem (with the charms that were probably meant) is
+    added to the ``form_errors`` of ``issue_data``.
+    """
+    from . import profiling
+
+    try:
+        with profiling.section('evaluate'):
+            results = sorted(
+                evaluate_iter(
+                    issue_data['name'],
+                    issue_data['project_repo'],
+                    issue_data['ci_linting'],
+                    issue_data['contribution_link'],
+                    issue_data['license_link'],
+                    issue_data['security_link'],
+                    issue_data['default_branch'],
+                    charm_dir=issue_data.get('charm_dir', '.'),
+                    mirror_dir=mirror_dir,
+                    cancel=cancel,
+                    deadline=deadline,
+                    limits=limits,
+                ),
+                key=lambda result: result.index,
+            )
+    except CharmDirError as e:
+        issue_data['form_errors']['charm_dir'] = _charm_dir_problem(e)
+        return comment
+    timed_out = []
     for result in results:
+        if result.timed_out:
+            timed_out.append(result.name)
+            continue
         # Convert Sphinx refs in the result to match the converted comment.
-        result = convert_sphinx_refs(result)
-        if result.replace('* [x]', '* [ ]') in comment:
-            comment = comment.replace(result.replace('* [x]', '* [ ]'), result)
+        item = convert_sphinx_refs(result.item)
+        if item.replace('* [x]', '* [ ]') in comment:
+            comment = comment.replace(item.replace('* [x]', '* [ ]'), item)
+    if timed_out:
+        names = ', '.join(f'`{name}`' for name in timed_out)
+        comment += (
+            '\n\n### Automated checks\n\n'
+            f'These checks did not finish in time, so need to be done by hand: {names}.'
+        )
     return comment
 
 
+def _charm_dir_problem(error: CharmDirError) -> str:
+    """Explain to the author that the charm directory in the request is wrong."""
+    problem = (
+        f'"Charm Directory" should be the directory in the repository that contains the '
+        f"charm's charmcraft.yaml, but `{error.charm_dir}` does not."
+    )
+    hint = error.hint(lambda path: f'`{path}`')
+    return f'{problem} {hint}' if hint else problem
+
+
+def review_issue(
+    client: 'github.GitHub',
+    issue_number: int,
+    *,
+    reviewers_file: pathlib.Path | None = None,
+    assign_to: str | None = None,
+    dry_run: bool = False,
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+    reviewer_index: 'OpenReviewIndex | None' = None,
+    deadline: float | None = None,
+    limits: ResourceLimits | None = None,
+):
+    """Review a listing request issue, and update it with the checklist.
+
+    If ``cancel`` is set before the issue is updated, the review is abandoned
+    and :class:`~charmhub_listing_review.evaluate.Cancelled` is raised, so that
+    a review of outdated input never overwrites a newer one.
+
+    If ``deadline`` is provided, the automated checks take at most that many
+    seconds, and any that don't finish are left for the reviewer. ``limits``
+    are the resources that the charm's tooling commands may use.
+    """
+    # Look up an explicitly requested reviewer along with the issue, so that
+    # assigning them doesn't need another request.
+    users = [assign_to.removeprefix('@')] if assign_to else []
+    issue = client.get_issue(issue_number, users=users)
+    summary, comment = _prepare_review(issue, mirror_dir, cancel, deadline, limits)
+    update_gh_issue(
+        issue,
+        summary,
+        comment,
+        client,
+        reviewers_file=reviewers_file,
+        dry_run=dry_run,
+        assign_to=assign_to,
+        reviewer_index=reviewer_index,
+    )
+
+
+def _prepare_review(
+    issue: 'github.Issue',
+    mirror_dir: pathlib.Path | None = None,
+    cancel: threading.Event | None = None,
+    deadline: float | None = None,
+    limits: ResourceLimits | None = None,
+) -> tuple[str, str]:
+    """Run the automated checks for the issue, and return its title and comment."""
+    from . import profiling
+
+    issue_data = details_from_issue_body(issue.body)
+    summary = issue_summary(issue_data['name'])
+    with profiling.section('issue_comment'):
+        comment = issue_comment(
+            issue_data['name'],
+            issue_data['demo_url'],
+            issue_data['ci_release_url'],
+            issue_data['ci_integration_url'],
+            issue_data['documentation_link'],
+        )
+    with profiling.section('apply_automated_checks'):
+        comment = apply_automated_checks(issue_data, comment, mirror_dir, cancel, deadline, limits)
+    if issue_data['form_errors']:
+        problems = '\n'.join(f'* {error}' for error in issue_data['form_errors'].values())
+        comment += (
+            '\n\n### Listing request\n\n'
+            f'Author: please edit the request to fix these problems:\n\n{problems}'
+        )
+    if cancel is not None and cancel.is_set():
+        raise Cancelled()
+    return summary, comment
+
+
+def shard_index(charm_name: str, repository: str, count: int) -> int:
+    """The shard, from 0 to ``count - 1``, that the charm belongs to.
+
+    The shard depends only on the charm name and repository, so it's the same
+    on every runner and every run, regardless of what else is being reviewed.
+    """
+    repository = repository.strip().lower().removesuffix('/').removesuffix('.git')
+    key = f'{charm_name.strip().lower()}\n{repository}'.encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], 'big') % count
+
+
+def _issue_shard(issue: 'github.Issue', count: int) -> int:
+    form = issue_form.parse(issue.body)
+    if not form.name or not form.project_repo:
+        # Requests that can't be parsed still need to be handled somewhere.
+        return shard_index('', f'#{issue.number}', count)
+    return shard_index(form.name, form.project_repo, count)
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse an ``INDEX/COUNT`` shard specification, where INDEX is 0-based.
+
+    Raises:
+        ValueError: if the specification is not valid.
+    """
+    index, sep, count = value.partition('/')
+    if not sep or not index.isdigit() or not count.isdigit():
+        raise ValueError(f'Shard must be INDEX/COUNT, got {value!r}')
+    if not 0 <= int(index) < int(count):
+        raise ValueError(f'Shard index must be from 0 to {int(count) - 1}, got {value!r}')
+    return int(index), int(count)
+
+
+def sweep(
+    client: 'github.GitHub',
+    *,
+    reviewers_file: pathlib.Path | None = None,
+    assign_to: str | None = None,
+    dry_run: bool = False,
+    mirror_dir: pathlib.Path | None = None,
+    concurrency: int = 4,
+    shard: tuple[int, int] = (0, 1),
+    reviewer_index: 'OpenReviewIndex | None' = None,
+    deadline: float | None = None,
+    limits: ResourceLimits | None = None,
+) -> tuple[list[int], list[int], list[int]]:
+    """Re-review every open listing request, updating those that have changed.
+
+    Authors often fix problems without triggering a new review, so this keeps
+    the checklists up to date. Up to ``concurrency`` issues are reviewed at
+    the same time.
+
+    ``shard`` is an ``(index, count)`` pair: only the requests in that shard
+    (see :func:`shard_index`) are reviewed, so that runners that are each
+    given a different index process disjoint sets of requests.
+
+    ``deadline`` limits the time that the automated checks for each request
+    may take, in seconds, and ``limits`` the resources that the charm's
+    tooling commands may use.
+
+    Returns the numbers of the issues that were updated, that were unchanged,
+    and that could not be reviewed.
+    """
+    index, count = shard
+    issues = client.list_open_issues(LISTING_REQUEST_LABEL)
+    if count > 1:
+        issues = [issue for issue in issues if _issue_shard(issue, count) == index]
+
+    def review(issue: 'github.Issue') -> bool:
+        summary, comment = _prepare_review(issue, mirror_dir, deadline=deadline, limits=limits)
+        return update_gh_issue(
+            issue,
+            summary,
+            comment,
+            client,
+            reviewers_file=reviewers_file,
+            dry_run=dry_run,
+            assign_to=assign_to,
+            reviewer_index=reviewer_index,
+        )
+
+    import concurrent.futures
+
+    updated: list[int] = []
+    unchanged: list[int] = []
+    failed: list[int] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(review, issue): issue.number for issue in issues}
+        for future in concurrent.futures.as_completed(futures):
+            number = futures[future]
+            try:
+                (updated if future.result() else unchanged).append(number)
+            except Exception as e:
+                print(f'Could not review issue #{number}: {e}', file=sys.stderr)
+                failed.append(number)
+    return sorted(updated), sorted(unchanged), sorted(failed)
+
+
+def sweep_report(
+    updated: list[int],
+    unchanged: list[int],
+    failed: list[int],
+    shard: tuple[int, int] = (0, 1),
+    rate_limit: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """A JSON-serialisable report of a (possibly sharded) sweep.
+
+    ``rate_limit`` is the state of the GitHub rate limit governor at the end
+    of the sweep.
+    """
+    shard_name = f'{shard[0]}/{shard[1]}'
+    return {
+        'shards': [shard_name],
+        'updated': updated,
+        'unchanged': unchanged,
+        'failed': failed,
+        'rate_limit': {shard_name: rate_limit} if rate_limit is not None else {},
+    }
+
+
+def merge_reports(reports: list[dict[str, Any]]) -> dict[str, Any]:
+    """Combine the reports from each shard of a sweep into a single report.
+
+    Raises:
+        ValueError: if the reports are from different numbers of shards, or
+            if any shard is missing or repeated.
+    """
+    shards = sorted(
+        (parse_shard(shard) for report in reports for shard in report['shards']),
+    )
+    counts = {count for _, count in shards}
+    if len(counts) > 1:
+        raise ValueError(f'Reports are from different shard counts: {sorted(counts)}')
+    expected = [(index, count) for count in counts for index in range(count)]
+    if shards != expected:
+        found = ', '.join(f'{index}/{count}' for index, count in shards)
+        raise ValueError(f'Reports do not cover each shard exactly once: {found}')
+    merged: dict[str, Any] = {'shards': [f'{index}/{count}' for index, count in shards]}
+    for key in ('updated', 'unchanged', 'failed'):
+        merged[key] = sorted(number for report in reports for number in report[key])
+    merged['rate_limit'] = {
+        shard: state for report in reports for shard, state in report.get('rate_limit', {}).items()
+    }
+    return merged
+
+
+def _print_sweep_summary(report: dict[str, Any]):
+    print(
+        f'Updated {len(report["updated"])} issue(s), {len(report["unchanged"])} unchanged, '
+        f'{len(report["failed"])} failed.',
+        file=sys.stderr,
+    )
+    for shard, state in report.get('rate_limit', {}).items():
+        print(
+            f'GitHub rate limit ({shard}): {state["remaining"]} of {state["limit"]} remaining, '
+            f'{state["secondary_limits"]} secondary limit(s), waited {state["waited"]}s.',
+            file=sys.stderr,
+        )
+    for key in ('updated', 'failed'):
+        if report[key]:
+            numbers = ', '.join(f'#{n}' for n in report[key])
+            print(f'{key.capitalize()}: {numbers}', file=sys.stderr)
+
+
 def main():
     """Extract information from the issue and post/update a review comment."""
     parser = argparse.ArgumentParser(
         description='Update a GitHub issue for a charm listing review.'
     )
-    parser.add_argument(
-        '--issue-number', type=int, help='The issue number to update', required=True
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument('--issue-number', type=int, help='The issue number to update')
+    target_group.add_argument(
+        '--sweep',
+        action='store_true',
+        help='Re-review all open listing requests, and update those whose results changed',
     )
-    reviewer_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument(
+        '--merge-reports',
+        type=pathlib.Path,
+        nargs='+',
+        metavar='REPORT',
+        help='Combine the --report files from each shard of a sweep into one report',
+    )
+    reviewer_group = parser.add_mutually_exclusive_group()
     reviewer_group.add_argument(
         '--reviewers-file',
         type=pathlib.Path,
@@ -382,29 +738,143 @@ def main():
         type=str,
         help='GitHub repository in OWNER/REPO format (e.g. canonical/charmhub-listing-review)',
     )
+    parser.add_argument(
+        '--github-transport',
+        choices=['gh', 'http'],
+        default='gh',
+        help=(
+            'How to talk to GitHub: through the gh CLI (default), or directly over HTTPS '
+            'using the token in GH_TOKEN'
+        ),
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='With --sweep, how many issues to review at the same time (default: 4)',
+    )
+    parser.add_argument(
+        '--shard',
+        type=str,
+        help=(
+            'With --sweep, only review the requests in this shard, given as INDEX/COUNT '
+            '(for example, 0/4 to 3/4 across four runners)'
+        ),
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        metavar='SECONDS',
+        help=(
+            'Stop the automated checks for a request after this many seconds, and leave any '
+            'that did not finish for the reviewer'
+        ),
+    )
+    parser.add_argument(
+        '--report',
+        type=pathlib.Path,
+        help='With --sweep or --merge-reports, write a JSON report of the results to this file',
+    )
+    parser.add_argument(
+        '--profile',
+        type=pathlib.Path,
+        metavar='DIR',
+        help=(
+            'Profile the run, and write CPU, flame graph, and memory allocation reports to this '
+            'directory'
+        ),
+    )
     args = parser.parse_args()
+    from . import profiling
+
+    with profiling.profiled(args.profile):
+        _main(parser, args)
+
+
+def _main(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    if args.shard and not args.sweep:
+        parser.error('--shard can only be used with --sweep')
+    if args.report and not (args.sweep or args.merge_reports):
+        parser.error('--report can only be used with --sweep or --merge-reports')
+    if args.merge_reports:
+        try:
+            report = merge_reports([json.loads(path.read_text()) for path in args.merge_reports])
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f'Could not merge the reports: {e}')
+        if args.report:
+            args.report.write_text(json.dumps(report, indent=2) + '\n')
+        else:
+            print(json.dumps(report, indent=2))
+        _print_sweep_summary(report)
+        sys.exit(1 if report['failed'] else 0)
+    if not args.reviewers_file and not args.assign_to:
+        parser.error('one of the arguments --reviewers-file --assign-to is required')
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error('--deadline must be positive')
+    try:
+        limits = tooling_limits()
+    except ValueError as e:
+        parser.error(str(e))
+    shard = (0, 1)
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+
+    from . import github
 
-    issue_data = get_details_from_issue(args.issue_number, repo=args.repo)
-
-    summary = issue_summary(issue_data['name'])
-    comment = issue_comment(
-        issue_data['name'],
-        issue_data['demo_url'],
-        issue_data['ci_release_url'],
-        issue_data['ci_integration_url'],
-        issue_data['documentation_link'],
-    )
-    comment = apply_automated_checks(issue_data, comment)
+    try:
+        client = github.connect(args.repo, args.github_transport)
+    except ValueError as e:
+        parser.error(str(e))
+    reviewer_index = None
+    if not args.assign_to:
+        from .review_index import OpenReviewIndex, default_path
+
+        reviewer_index = OpenReviewIndex(
+            LISTING_REQUEST_LABEL, default_path(client.owner, client.name)
+        )
 
-    update_gh_issue(
-        args.issue_number,
-        summary,
-        comment,
-        reviewers_file=args.reviewers_file,
-        dry_run=args.dry_run,
-        assign_to=args.assign_to,
-        repo=args.repo,
-    )
+    if args.sweep:
+        updated, unchanged, failed = sweep(
+            client,
+            reviewers_file=args.reviewers_file,
+            assign_to=args.assign_to,
+            dry_run=args.dry_run,
+            concurrency=args.concurrency,
+            shard=shard,
+            reviewer_index=reviewer_index,
+            deadline=args.deadline,
+            limits=limits,
+        )
+        report = sweep_report(updated, unchanged, failed, shard, client.governor.state())
+        if args.report:
+            args.report.write_text(json.dumps(report, indent=2) + '\n')
+        _print_sweep_summary(report)
+        sys.exit(1 if failed else 0)
+
+    # When the workflow run is superseded by a newer event for the same issue,
+    # Actions cancels it: stop any running commands and clean up the clone.
+    cancel = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: cancel.set())
+    try:
+        review_issue(
+            client,
+            args.issue_number,
+            reviewers_file=args.reviewers_file,
+            assign_to=args.assign_to,
+            dry_run=args.dry_run,
+            cancel=cancel,
+            reviewer_index=reviewer_index,
+            deadline=args.deadline,
+            limits=limits,
+        )
+    except Cancelled:
+        sys.exit('Review cancelled.')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,232 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A background worker that runs self-review, so that each run starts warm.
+
+When self-review is run from an editor or a pre-commit hook, most of the time
+can go on starting Python, importing modules, and checking links that were
+checked a moment ago. ``self-review-worker`` stays running, listening on a
+Unix socket, and keeps the modules, the link results, and the parsed
+charmcraft.yaml files in memory between runs. It exits once it has been idle
+for a while.
+
+The ``self-review`` command is a thin client: if a worker is listening, the
+command line is sent to it, and its output is passed back as it is written.
+Otherwise, or with ``--no-worker``, the review runs in the same process as
+before. Runs that need the local process (``--watch`` and ``--profile``) are
+never sent to the worker.
+
+The worker runs one review at a time, in the client's working directory, but
+with the worker's own environment.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import pathlib
+import socket
+import sys
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# How long the worker waits for a review before exiting, in seconds.
+IDLE_TIMEOUT = 15 * 60
+
+# Options that only make sense in the process that the user started.
+_IN_PROCESS_OPTIONS = {'--no-worker', '--watch', '--profile'}
+
+
+def socket_path() -> pathlib.Path:
+    """Where the worker listens for reviews.
+
+    This is in the user's runtime directory if there is one, otherwise in the
+    cache directory.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return pathlib.Path(runtime_dir) / 'charmhub-listing-review.sock'
+    from .links import cache_dir
+
+    return cache_dir() / 'self-review.sock'
+
+
+def run(argv: list[str], path: pathlib.Path | None = None) -> int | None:
+    """Run self-review with ``argv`` in the worker, and return the exit code.
+
+    The worker's output is written to this process's stdout and stderr.
+    Returns ``None``, having written nothing, if there is no worker to run it.
+    """
+    path = path or socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.connect(str(path))
+            sock.sendall(json.dumps({'argv': argv, 'cwd': os.getcwd()}).encode() + b'\n')
+        except OSError:
+            return None
+        received = False
+        with sock.makefile('rb') as messages:
+            for line in messages:
+                message = json.loads(line)
+                if 'exit' in message:
+                    return message['exit']
+                received = True
+                for name, text in message.items():
+                    stream = sys.stdout if name == 'stdout' else sys.stderr
+                    stream.write(text)
+                    stream.flush()
+    if not received:
+        # The worker exited before it started the review (it may have just
+        # timed out), so the review can still run here.
+        return None
+    print('\n❌ The self-review worker stopped unexpectedly.', file=sys.stderr)
+    return 1
+
+
+class _Stream(io.TextIOBase):
+    """Send everything written to the stream to the client, as one of its streams."""
+
+    def __init__(self, connection: io.BufferedIOBase, name: str):
+        self._connection = connection
+        self._name = name
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self._connection, {self._name: text})
+        return len(text)
+
+
+def _send(connection: io.BufferedIOBase, message: dict[str, Any]):
+    connection.write(json.dumps(message).encode() + b'\n')
+    connection.flush()
+
+
+def _review(connection: socket.socket):
+    """Run the review that the client asked for, sending back the output and exit code."""
+    from . import self_review
+
+    with connection.makefile('rwb') as stream:
+        request = json.loads(stream.readline())
+        argv = [str(arg) for arg in request['argv']]
+        cwd = os.getcwd()
+        code = 0
+        try:
+            os.chdir(request['cwd'])
+            with (
+                contextlib.redirect_stdout(_Stream(stream, 'stdout')),
+                contextlib.redirect_stderr(_Stream(stream, 'stderr')),
+            ):
+                self_review.main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        finally:
+            os.chdir(cwd)
+        _send(stream, {'exit': code})
+
+
+def serve(path: pathlib.Path, idle_timeout: float = IDLE_TIMEOUT):
+    """Run reviews for clients that connect to ``path``, until idle for ``idle_timeout`` seconds.
+
+    Raises:
+        RuntimeError: if another worker is already listening on ``path``.
+    """
+    # Import everything a review needs now, rather than during the first one.
+    from . import self_review  # noqa: F401
+
+    if _listening(path):
+        raise RuntimeError(f'A self-review worker is already listening on {path}')
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with server:
+        # Only this user can connect, since reviews run as the worker's user.
+        umask = os.umask(0o177)
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(umask)
+        server.listen()
+        server.settimeout(idle_timeout)
+        logger.info('Listening on %s', path)
+        try:
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except TimeoutError:
+                    logger.info('Idle for %ss, exiting', idle_timeout)
+                    return
+                connection.settimeout(None)
+                with connection:
+                    try:
+                        _review(connection)
+                    except (OSError, ValueError, KeyError, TypeError) as e:
+                        # The client went away, or didn't send a valid request.
+                        logger.warning('Review failed: %s', e)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _listening(path: pathlib.Path) -> bool:
+    """Whether a worker is listening on ``path``."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def self_review_main():
+    """Entry point for the self-review tool, which uses the worker if one is running."""
+    argv = sys.argv[1:]
+    if not any(arg.split('=', 1)[0] in _IN_PROCESS_OPTIONS for arg in argv):
+        code = run(argv)
+        if code is not None:
+            sys.exit(code)
+    from . import self_review
+
+    self_review.main(argv)
+
+
+def main():
+    """Main entry point for the self-review worker."""
+    parser = argparse.ArgumentParser(
+        description=(
+            'Run self-review in the background, so that each self-review command starts warm.'
+        ),
+    )
+    parser.add_argument(
+        '--idle-timeout',
+        type=float,
+        default=IDLE_TIMEOUT,
+        help=f'Exit after this many seconds without a review (default: {IDLE_TIMEOUT})',
+    )
+    args = parser.parse_args()
+    if args.idle_timeout <= 0:
+        parser.error('--idle-timeout must be positive')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    try:
+        serve(socket_path(), args.idle_timeout)
+    except RuntimeError as e:
+        parser.exit(1, f'{e}\n')
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,81 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test finding the charms in a repository."""
+
+import pytest
+
+from charmhub_listing_review import discovery
+from charmhub_listing_review.discovery import Charm
+
+
+def _charm(repo_dir, path, content='name: my-charm\n'):
+    directory = repo_dir / path
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / 'charmcraft.yaml').write_text(content)
+
+
+def test_find_charms(tmp_path):
+    _charm(
+        tmp_path,
+        'charms/api',
+        "# A comment.\nname: 'api-k8s'  # The name.\ntype: charm\nbase: ubuntu@24.04\n"
+        'parts:\n  charm:\n    name: not-this\n',
+    )
+    _charm(tmp_path, 'charms/worker', 'name: worker\nbases:\n  - name: ubuntu\n')
+    _charm(tmp_path, 'tests/integration/testers/tester', 'name: tester\n')
+    (tmp_path / 'README.md').write_text('Charms!')
+    assert discovery.find_charms(tmp_path) == [
+        Charm('charms/api', 'api-k8s', 'charm', 'ubuntu@24.04'),
+        Charm('charms/worker', 'worker', '', ''),
+        Charm('tests/integration/testers/tester', 'tester', '', ''),
+    ]
+
+
+def test_find_charm_at_root(tmp_path):
+    _charm(tmp_path, '.')
+    assert discovery.find_charms(tmp_path) == [Charm('.', 'my-charm', '', '')]
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        '.git/charms/my-charm',
+        '.tox/lint/my-charm',
+        'node_modules/pkg',
+        'venv/lib/python3.12/site-packages/pkg',
+        'build/my-charm',
+        'a/b/c/d/e/f/g',
+    ],
+)
+def test_find_charms_skips(tmp_path, path):
+    _charm(tmp_path, path)
+    assert discovery.find_charms(tmp_path) == []
+
+
+def test_find_charms_does_not_follow_symlinks(tmp_path):
+    _charm(tmp_path, 'outside')
+    (tmp_path / 'repo').mkdir()
+    (tmp_path / 'repo' / 'link').symlink_to(tmp_path / 'outside')
+    assert discovery.find_charms(tmp_path / 'repo') == []
+
+
+def test_suggest():
+    charms = [
+        Charm('charms/api', 'api', '', ''),
+        Charm('charms/my-charm', 'my-charm', '', ''),
+        Charm('charms/worker', 'my-worker', '', ''),
+    ]
+    assert discovery.suggest(charms, 'charm/worker', 'my-charm') == [charms[1], charms[2]]
+    assert discovery.suggest(charms, 'elsewhere', 'other') == []
@@ -0,0 +1,515 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the GitHub access layer."""
+
+import http.client
+import http.server
+import json
+import subprocess  # noqa: S404
+import threading
+from typing import cast
+from unittest import mock
+
+import pytest
+
+from charmhub_listing_review import github, ratelimit
+
+
+@pytest.fixture(autouse=True)
+def governor(monkeypatch):
+    """A default governor that never makes the tests wait."""
+    now = [1_000_000.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    governor = ratelimit.RateLimitGovernor(
+        rate=1000, burst=1000, clock=lambda: now[0], sleep=sleep
+    )
+    monkeypatch.setattr(ratelimit, '_default_governor', governor)
+    return governor
+
+
+class FakeTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def graphql(self, query, variables):
+        self.calls.append((query, dict(variables)))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _raw_issue(number=7, comments=(), assignees=(), body='### Charm name\nmy-charm\n', count=None):
+    return {
+        'number': number,
+        'id': f'I_{number - 6}',
+        'title': 'A title',
+        'body': body,
+        'assignees': {'nodes': [{'login': login} for login in assignees]},
+        'comments': {
+            'totalCount': len(comments) if count is None else count,
+            'pageInfo': {
+                'hasPreviousPage': count is not None and count > len(comments),
+                'startCursor': 'c0',
+            },
+            'nodes': list(comments),
+        },
+    }
+
+
+def _issue_data(comments=(), assignees=(), body='### Charm name\nmy-charm\n', count=None, **extra):
+    return {'repository': {'issue': _raw_issue(7, comments, assignees, body, count)}, **extra}
+
+
+def _comments_data(*comments, before=None):
+    page_info = {'hasPreviousPage': before is not None, 'startCursor': before}
+    return {
+        'repository': {'issue': {'comments': {'pageInfo': page_info, 'nodes': list(comments)}}}
+    }
+
+
+def _comment(id, viewer, body='body'):
+    return {'id': f'IC_{id}', 'databaseId': id, 'viewerDidAuthor': viewer, 'body': body}
+
+
+def _checklist(text):
+    return f'{text}\n\n<!-- listing-review-hash: 0123abcd -->'
+
+
+def test_get_issue_single_query():
+    transport = FakeTransport(
+        _issue_data(
+            [
+                _comment(1, True, _checklist('old')),
+                _comment(2, False),
+                _comment(3, True, _checklist('new')),
+                _comment(4, True, 'Written by hand'),
+            ],
+            assignees=['alice'],
+            user0={'id': 'U_bob'},
+        )
+    )
+    issue = github.GitHub('org/repo', transport).get_issue(7, users=['bob'])
+    assert len(transport.calls) == 1
+    query, variables = transport.calls[0]
+    assert variables == {'owner': 'org', 'name': 'repo', 'number': 7, 'user0': 'bob'}
+    assert 'user0: user(login: $user0)' in query
+    assert 'comments(last: 10)' in query
+    assert issue.id == 'I_1'
+    assert issue.body == '### Charm name\nmy-charm\n'
+    assert issue.assignees == ['alice']
+    # The most recent comment by the authenticated user with the marker is the
+    # bot comment: a reviewer running this with their own token may have
+    # commented since.
+    assert issue.bot_comment == github.IssueComment('IC_3', 3, _checklist('new'))
+    assert issue.user_ids == {'bob': 'U_bob'}
+
+
+def test_get_issue_searches_older_comments():
+    transport = FakeTransport(
+        _issue_data([_comment(249, False), _comment(250, True, 'Thanks!')], count=250),
+        _comments_data(_comment(148, False), _comment(149, False), before='c1'),
+        _comments_data(_comment(1, True, _checklist('mine')), _comment(2, False)),
+    )
+    issue = github.GitHub('org/repo', transport).get_issue(7)
+    assert len(transport.calls) == 3
+    assert 'comments(last: 100, before: $before)' in transport.calls[1][0]
+    assert [variables['before'] for _, variables in transport.calls[1:]] == ['c0', 'c1']
+    assert issue.bot_comment == github.IssueComment('IC_1', 1, _checklist('mine'))
+
+
+def test_get_issue_finds_legacy_bot_comment():
+    body = '@alice - please assign this review to someone in your team, and mention their name'
+    transport = FakeTransport(_issue_data([_comment(1, True, body), _comment(2, True, 'Hi')]))
+    issue = github.GitHub('org/repo', transport).get_issue(7)
+    assert issue.bot_comment == github.IssueComment('IC_1', 1, body)
+
+
+def test_get_issue_without_bot_comment():
+    transport = FakeTransport(_issue_data([_comment(2, False)]))
+    issue = github.GitHub('org/repo', transport).get_issue(7)
+    # All of the comments were in the first response, so there's no search.
+    assert len(transport.calls) == 1
+    assert issue.bot_comment is None
+
+
+def test_get_issue_ignores_forged_marker():
+    # The issue author can edit the body, so a marker pointing at someone
+    # else's comment must not make the bot overwrite that comment.
+    body = '### Charm name\nmy-charm\n\n<!-- listing-review-comment: IC_2 -->'
+    transport = FakeTransport(
+        _issue_data([_comment(2, False, _checklist('Not yours'))], body=body),
+        {'comment': {'commentEdge': {'node': {'id': 'IC_3', 'databaseId': 3}}}},
+    )
+    client = github.GitHub('org/repo', transport)
+    issue = client.get_issue(7)
+    assert issue.bot_comment is None
+    client.update_issue(issue, comment='Hi')
+    query, variables = transport.calls[1]
+    assert 'addComment(' in query
+    assert 'updateIssueComment(' not in query
+    assert 'IC_2' not in variables.values()
+    assert issue.bot_comment == github.IssueComment('IC_3', 3, 'Hi')
+
+
+def test_list_open_issues_pages():
+    transport = FakeTransport(
+        {
+            'repository': {
+                'issues': {
+                    'pageInfo': {'hasNextPage': True, 'endCursor': 'c1'},
+                    'nodes': [
+                        _raw_issue(7, [_comment(1, True, _checklist('mine'))]),
+                        _raw_issue(8, [_comment(2, True, _checklist('also mine'))]),
+                    ],
+                }
+            }
+        },
+        {
+            'repository': {
+                'issues': {
+                    'pageInfo': {'hasNextPage': False, 'endCursor': 'c2'},
+                    'nodes': [_raw_issue(9, assignees=['alice'])],
+                }
+            }
+        },
+    )
+    issues = github.GitHub('org/repo', transport).list_open_issues('listing-request')
+    assert [issue.number for issue in issues] == [7, 8, 9]
+    assert issues[0].bot_comment == github.IssueComment('IC_1', 1, _checklist('mine'))
+    assert issues[1].bot_comment == github.IssueComment('IC_2', 2, _checklist('also mine'))
+    assert issues[2].bot_comment is None
+    assert issues[2].assignees == ['alice']
+    # The bot comments come with the issues, so there is one query per page.
+    assert [variables for _, variables in transport.calls] == [
+        {'owner': 'org', 'name': 'repo', 'label': 'listing-request'},
+        {'owner': 'org', 'name': 'repo', 'label': 'listing-request', 'after': 'c1'},
+    ]
+    assert 'labels: [$label], states: OPEN' in transport.calls[0][0]
+
+
+def test_list_assignments():
+    page = {
+        'pageInfo': {'hasNextPage': False, 'endCursor': None},
+        'nodes': [
+            {
+                'number': 3,
+                'state': 'CLOSED',
+                'updatedAt': '2025-06-01T12:00:00Z',
+                'assignees': {'nodes': [{'login': 'alice'}]},
+            }
+        ],
+    }
+    transport = FakeTransport({'repository': {'issues': page}}, {'repository': {'issues': page}})
+    client = github.GitHub('org/repo', transport)
+    assert client.list_assignments('listing-request') == [
+        github.IssueAssignment(3, False, ['alice'], '2025-06-01T12:00:00Z')
+    ]
+    assert 'states: OPEN' in transport.calls[0][0]
+    client.list_assignments('listing-request', since='2025-06-01T00:00:00Z')
+    query, variables = transport.calls[1]
+    assert 'since: $since' in query
+    assert 'states: OPEN' not in query
+    assert variables['since'] == '2025-06-01T00:00:00Z'
+
+
+def test_repository_placeholders(monkeypatch):
+    monkeypatch.delenv('GITHUB_REPOSITORY', raising=False)
+    client = github.GitHub(transport=FakeTransport())
+    assert (client.owner, client.name) == ('{owner}', '{repo}')
+    monkeypatch.setenv('GITHUB_REPOSITORY', 'canonical/charmhub-listing-review')
+    client = github.GitHub(transport=FakeTransport())
+    assert (client.owner, client.name) == ('canonical', 'charmhub-listing-review')
+
+
+def _issue(bot_comment=None, user_ids=None):
+    return github.Issue(
+        number=7,
+        id='I_1',
+        title='A title',
+        body='',
+        assignees=[],
+        bot_comment=bot_comment,
+        user_ids=user_ids or {},
+    )
+
+
+def test_update_issue_single_mutation():
+    transport = FakeTransport({
+        'comment': {'commentEdge': {'node': {'id': 'IC_9', 'databaseId': 9}}}
+    })
+    client = github.GitHub('org/repo', transport)
+    issue = _issue(user_ids={'bob': 'U_bob'})
+    client.update_issue(issue, title='New title', assignee='bob', comment='Hi')
+    assert len(transport.calls) == 1
+    query, variables = transport.calls[0]
+    assert query.startswith('mutation(')
+    assert 'updateIssue(' in query
+    assert 'addAssigneesToAssignable(' in query
+    assert 'addComment(' in query
+    assert variables == {'issue': 'I_1', 'title': 'New title', 'assignee': 'U_bob', 'body': 'Hi'}
+    assert issue.bot_comment == github.IssueComment('IC_9', 9, 'Hi')
+
+
+def _edited_comment():
+    return {'comment': {'issueComment': {'id': 'IC_3', 'databaseId': 3}}}
+
+
+def test_update_issue_edits_bot_comment():
+    transport = FakeTransport(_edited_comment())
+    client = github.GitHub('org/repo', transport)
+    client.update_issue(_issue(bot_comment=github.IssueComment('IC_3', 3, 'old')), comment='Hi')
+    assert len(transport.calls) == 1
+    query, variables = transport.calls[0]
+    assert 'updateIssueComment(' in query
+    assert 'addComment(' not in query
+    assert variables == {'issue': 'I_1', 'body': 'Hi', 'comment': 'IC_3'}
+
+
+def test_update_issue_looks_up_unknown_assignee():
+    transport = FakeTransport({'user': {'id': 'U_carol'}}, {})
+    client = github.GitHub('org/repo', transport)
+    client.update_issue(_issue(), assignee='carol')
+    assert len(transport.calls) == 2
+    assert transport.calls[0][1] == {'login': 'carol'}
+    assert transport.calls[1][1]['assignee'] == 'U_carol'
+
+
+def test_update_issue_nothing_to_do():
+    transport = FakeTransport()
+    github.GitHub('org/repo', transport).update_issue(_issue())
+    assert transport.calls == []
+
+
+def test_update_issue_unknown_user():
+    transport = FakeTransport({'user': None})
+    with pytest.raises(ValueError, match='Unknown GitHub user'):
+        github.GitHub('org/repo', transport).update_issue(_issue(), assignee='nobody')
+
+
+@mock.patch('subprocess.run')
+def test_gh_cli_fields(mock_run):
+    mock_run.return_value = mock.Mock(stdout=json.dumps({'data': {'ok': True}}))
+    data = github.GhCli().graphql(
+        'query', {'owner': '{owner}', 'number': 3, 'body': '@someone said {owner}'}
+    )
+    assert data == {'ok': True}
+    cmd = mock_run.call_args[0][0]
+    assert cmd[:5] == ['gh', 'api', 'graphql', '-f', 'query=query']
+    assert cmd[5:] == [
+        '-F',
+        'owner={owner}',
+        '-F',
+        'number=3',
+        # Strings are passed raw, so a leading '@' is not read as a file.
+        '-f',
+        'body=@someone said {owner}',
+    ]
+
+
+def test_rate_limit_state_is_recorded(governor):
+    transport = FakeTransport(
+        _issue_data(
+            rateLimit={'limit': 5000, 'remaining': 4999, 'resetAt': '2025-06-01T12:00:00Z'}
+        )
+    )
+    github.GitHub('org/repo', transport).get_issue(7)
+    assert 'rateLimit { limit remaining resetAt }' in transport.calls[0][0]
+    assert (governor.limit, governor.remaining) == (5000, 4999)
+
+
+def test_rate_limited_requests_are_retried(governor):
+    transport = FakeTransport(
+        github.RateLimitError('slow down', 403, retry_after=5), github.RateLimitError('again'), {}
+    )
+    with mock.patch.object(governor, 'backoff') as mock_backoff:
+        github.GitHub('org/repo', transport).update_issue(_issue(), title='New')
+    assert len(transport.calls) == 3
+    assert mock_backoff.call_args_list == [mock.call(5), mock.call(None)]
+
+
+def test_rate_limit_retries_are_limited(governor):
+    transport = FakeTransport(*(github.RateLimitError('slow down') for _ in range(3)))
+    client = github.GitHub('org/repo', transport, max_retries=2)
+    with pytest.raises(github.RateLimitError):
+        client.update_issue(_issue(), title='New')
+    assert len(transport.calls) == 3
+    assert governor.secondary_limits == 2
+
+
+@mock.patch('subprocess.run')
+def test_gh_cli_rate_limit(mock_run):
+    mock_run.side_effect = subprocess.CalledProcessError(
+        1, 'gh', output='', stderr='You have exceeded a secondary rate limit.'
+    )
+    with pytest.raises(github.RateLimitError):
+        github.GhCli().graphql('query', {})
+    mock_run.side_effect = subprocess.CalledProcessError(1, 'gh', output='', stderr='Not found')
+    with pytest.raises(subprocess.CalledProcessError):
+        github.GhCli().graphql('query', {})
+
+
+class _ApiHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self):
+        server = cast('_ApiServer', self.server)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length)) if length else {}
+        server.requests.append({
+            'method': self.command,
+            'path': self.path,
+            'auth': self.headers.get('Authorization'),
+            'port': self.client_address[1],
+            'body': body,
+        })
+        if self.path == '/graphql':
+            if 'broken' in body['query']:
+                self._send(200, {'data': None, 'errors': [{'message': 'Bad query'}]})
+            elif body['query'].startswith('mutation'):
+                self._send(200, {'data': _edited_comment()})
+            else:
+                self._send(200, {'data': _issue_data([_comment(5, True, _checklist('x'))])})
+        elif self.path == '/repos/org/repo/issues/9':
+            self.send_response(403)
+            self.send_header('Retry-After', '12')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/repos/org/repo/issues/7':
+            self._send(200, {'number': 7, 'title': 'A title'})
+        else:
+            self._send(404, {'message': 'Not Found'})
+
+    do_GET = _handle  # noqa: N815
+    do_POST = _handle  # noqa: N815
+    do_PATCH = _handle  # noqa: N815
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ApiServer(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _ApiHandler)
+        self.requests: list[dict] = []
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+@pytest.fixture
+def api_server():
+    srv = _ApiServer()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+class TestHttpTransport:
+    def test_requires_token(self, monkeypatch):
+        monkeypatch.delenv('GH_TOKEN', raising=False)
+        monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+        with pytest.raises(ValueError, match='GH_TOKEN'):
+            github.HttpTransport(api_url='http://127.0.0.1:1')
+
+    def test_issue_view_edit_and_comment(self, api_server, monkeypatch):
+        monkeypatch.setenv('GH_TOKEN', 'secret')
+        transport = github.HttpTransport(api_url=api_server.url)
+        client = github.GitHub('org/repo', transport)
+        issue = client.get_issue(7)
+        assert issue.bot_comment == github.IssueComment('IC_5', 5, _checklist('x'))
+        client.update_issue(issue, title='New title', comment='Hi')
+        assert [r['path'] for r in api_server.requests] == ['/graphql'] * 2
+        assert all(r['auth'] == 'Bearer secret' for r in api_server.requests)
+        assert api_server.requests[1]['body']['variables'] == {
+            'issue': 'I_1',
+            'title': 'New title',
+            'body': 'Hi',
+            'comment': 'IC_5',
+        }
+        # All of the requests were sent over the same connection.
+        assert len({r['port'] for r in api_server.requests}) == 1
+        transport.close()
+
+    def test_rest_request(self, api_server):
+        transport = github.HttpTransport('secret', api_server.url)
+        assert transport.request('GET', '/repos/org/repo/issues/7') == {
+            'number': 7,
+            'title': 'A title',
+        }
+        with pytest.raises(github.GitHubError, match='404 Not Found') as exc_info:
+            transport.request('PATCH', '/repos/org/repo/issues/8', {'title': 'x'})
+        assert exc_info.value.status == 404
+        assert api_server.requests[1]['body'] == {'title': 'x'}
+
+    def test_rate_limited_response(self, api_server):
+        transport = github.HttpTransport('secret', api_server.url)
+        with pytest.raises(github.RateLimitError) as exc_info:
+            transport.request('GET', '/repos/org/repo/issues/9')
+        assert exc_info.value.retry_after == 12
+
+    def test_graphql_errors(self, api_server):
+        transport = github.HttpTransport('secret', api_server.url)
+        with pytest.raises(github.GitHubError, match='Bad query'):
+            transport.graphql('query { broken }', {})
+
+    @pytest.mark.parametrize(
+        'method,error',
+        [
+            ('request', BrokenPipeError()),
+            ('getresponse', http.client.RemoteDisconnected('closed')),
+        ],
+    )
+    def test_reconnects_when_idle_connection_closed(self, api_server, method, error):
+        transport = github.HttpTransport('secret', api_server.url)
+        transport.request('GET', '/repos/org/repo/issues/7')
+        # Simulate the server having dropped the idle connection.
+        idle = transport._idle[0]
+        setattr(idle, method, mock.Mock(side_effect=error))
+        assert transport.request('GET', '/repos/org/repo/issues/7')['number'] == 7
+        # The request was sent again on a new connection.
+        assert api_server.requests[-1]['port'] != api_server.requests[0]['port']
+        assert transport._idle[0] is not idle
+
+    def test_does_not_retry_once_request_was_sent(self, api_server):
+        transport = github.HttpTransport('secret', api_server.url)
+        transport.graphql('query { issue }', {})
+        # Reading the response timed out: the mutation may have been applied.
+        transport._idle[0].getresponse = mock.Mock(side_effect=TimeoutError())
+        with pytest.raises(TimeoutError):
+            transport.graphql('mutation { addComment }', {})
+        # The server may or may not have read the mutation yet, but it was
+        # never sent again on a new connection.
+        assert len({r['port'] for r in api_server.requests}) == 1
+        assert transport._idle == []
+
+    def test_enterprise_graphql_path(self):
+        transport = github.HttpTransport('secret', 'https://ghe.example.com/api/v3')
+        assert transport._graphql_path == '/api/graphql'
@@ -0,0 +1,166 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test parsing listing request issue forms."""
+
+import pathlib
+from unittest import mock
+
+import pytest
+import yaml
+
+from charmhub_listing_review import issue_form
+
+TEMPLATE = pathlib.Path(__file__).parents[2] / '.github' / 'ISSUE_TEMPLATE' / 'listing-request.yml'
+
+BODY = """\
+### Charm name
+
+my-charm
+
+### Demo
+
+Deploy the charm and then:
+
+```
+juju run my-charm/0 demo
+### Not a heading
+```
+
+See also https://demo.example.com/video.
+
+### Project Repository
+
+https://github.com/canonical/my-charm
+
+### Charm Directory
+
+_No response_
+
+### CI Linting
+
+https://ci.example.com/lint
+
+### CI Release
+
+https://ci.example.com/release
+
+### CI Integration Tests
+
+https://ci.example.com/integration
+
+### Documentation Link
+
+https://docs.example.com
+
+### Default Branch
+
+_No response_
+"""
+
+
+def test_fields_match_template():
+    template = yaml.safe_load(TEMPLATE.read_text())
+    expected = [
+        (
+            item['attributes']['label'],
+            item['validations']['required'],
+            item['type'] == 'textarea',
+        )
+        for item in template['body']
+    ]
+    assert [(f.label, f.required, f.multiline) for f in issue_form.FIELDS] == expected
+
+
+def test_parse():
+    form = issue_form.parse(BODY)
+    assert form.valid
+    assert form.name == 'my-charm'
+    assert form.demo is not None
+    assert form.demo.startswith('Deploy the charm and then:\n\n```\n')
+    assert '### Not a heading' in form.demo
+    assert form.demo_url == 'https://demo.example.com/video'
+    assert form.project_repo == 'https://github.com/canonical/my-charm'
+    assert form.charm_dir is None
+    assert form.default_branch is None
+    assert form.documentation_link == 'https://docs.example.com'
+
+
+def test_parse_review_branch_heading():
+    body = BODY.replace('### Default Branch\n\n_No response_', '### Review Branch\n26.04')
+    assert issue_form.parse(body).default_branch == '26.04'
+
+
+def test_parse_ignores_hidden_comments():
+    body = BODY.replace('### Default Branch\n\n_No response_', '### Default Branch\n\n26.04')
+    body += '\n\n<!-- listing-review-comment: IC_1 -->\n'
+    form = issue_form.parse(body)
+    assert form.default_branch == '26.04'
+    assert form.valid
+
+
+def test_demo_url_without_link():
+    form = issue_form.parse(
+        BODY.replace('See also https://demo.example.com/video.', 'Or ask for a call.')
+    )
+    assert form.demo_url == 'Deploy the charm and then:'
+
+
+@pytest.mark.parametrize(
+    'old,new,key',
+    [
+        ('my-charm\n', '_No response_\n', 'name'),
+        ('https://github.com/canonical/my-charm', 'my-charm', 'project_repo'),
+        ('https://ci.example.com/lint', 'https://ci.example.com/lint\nand more', 'ci_linting'),
+        ('### Charm Directory\n\n_No response_', '### Charm Directory\n../elsewhere', 'charm_dir'),
+    ],
+)
+def test_parse_errors(old, new, key):
+    form = issue_form.parse(BODY.replace(old, new, 1))
+    assert not form.valid
+    assert list(form.errors) == [key]
+
+
+def test_missing_fields():
+    form = issue_form.parse('### Charm name\nmy-charm\n')
+    assert form.name == 'my-charm'
+    assert set(form.errors) == {
+        'demo',
+        'project_repo',
+        'ci_linting',
+        'ci_release_url',
+        'ci_integration_url',
+        'documentation_link',
+    }
+
+
+def test_single_line_field_uses_first_line():
+    form = issue_form.parse(BODY.replace('\nmy-charm\n', '\nmy-charm\nextra\n', 1))
+    assert form.name == 'my-charm'
+    assert 'name' in form.errors
+
+
+def test_parse_reads_the_body_once():
+    # Every field is found in a single pass over the body, rather than
+    # searching the body for each one, so long bodies (such as pasted logs)
+    # don't make parsing slow.
+    log = '\n'.join(f'### log line {i}' if i % 7 == 0 else f'line {i}' for i in range(40_000))
+    body = BODY.replace('Deploy the charm and then:', log)
+    with mock.patch.object(
+        issue_form, 'split_sections', wraps=issue_form.split_sections
+    ) as mock_split_sections:
+        form = issue_form.parse(body)
+    mock_split_sections.assert_called_once_with(body)
+    assert form.name == 'my-charm'
+    assert form.project_repo == 'https://github.com/canonical/my-charm'
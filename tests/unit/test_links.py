@@ -0,0 +1,254 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the shared link checker."""
+
+import http.server
+import socket
+import threading
+import time
+import urllib.request
+from typing import cast
+from unittest import mock
+
+import pytest
+
+from charmhub_listing_review import links
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def _respond(self):
+        server = cast('_Server', self.server)
+        with server.lock:
+            server.requests.append((self.command, self.path, self.headers.get('Range')))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            body = b''
+            with server.lock:
+                flaky = self.path.startswith('/flaky') and server.failures > 0
+                server.failures -= flaky
+            if flaky:
+                status = 503
+            elif self.path.startswith('/no-head') and self.command == 'HEAD':
+                status = 405
+            elif self.path.startswith('/missing'):
+                status = 404
+            else:
+                status = 206 if self.headers.get('Range') else 200
+                if self.command == 'GET':
+                    body = b'Contribute!'
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_HEAD = _respond  # noqa: N815
+    do_GET = _respond  # noqa: N815
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.lock = threading.Lock()
+        self.requests: list[tuple[str, str, str | None]] = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.0
+        # How many requests to /flaky fail before it works.
+        self.failures = 0
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+@pytest.fixture
+def server():
+    srv = _Server()
+    thread = threading.Thread(target=srv.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_check_deduplicates_urls(server):
+    checker = links.LinkChecker()
+    url = f'{server.url}/page'
+    assert checker.check([url, url, '', url]) == {url: True}
+    assert checker.ok(url)
+    assert len(server.requests) == 1
+
+
+def test_check_falls_back_to_ranged_get(server):
+    checker = links.LinkChecker()
+    url = f'{server.url}/no-head'
+    assert checker.ok(url)
+    assert server.requests == [('HEAD', '/no-head', None), ('GET', '/no-head', 'bytes=0-0')]
+
+
+def test_check_reports_missing(server):
+    checker = links.LinkChecker()
+    assert not checker.ok(f'{server.url}/missing')
+    assert not checker.ok('not a url')
+
+
+def test_check_limits_requests_per_host(server):
+    server.delay = 0.05
+    checker = links.LinkChecker(max_per_host=2)
+    urls = [f'{server.url}/page/{i}' for i in range(6)]
+    assert all(checker.check(urls).values())
+    assert len(server.requests) == 6
+    assert server.max_active <= 2
+
+
+def test_cache_persists_between_runs(server, tmp_path):
+    path = tmp_path / 'links.json'
+    url = f'{server.url}/page'
+    assert links.LinkChecker(links.LinkCache(path)).ok(url)
+    assert path.exists()
+    assert links.LinkChecker(links.LinkCache(path)).ok(url)
+    assert len(server.requests) == 1
+
+
+def test_cache_expires_negative_results(server, tmp_path):
+    path = tmp_path / 'links.json'
+    url = f'{server.url}/missing'
+    assert not links.LinkChecker(links.LinkCache(path, negative_ttl=0)).ok(url)
+    time.sleep(0.01)
+    assert not links.LinkChecker(links.LinkCache(path, negative_ttl=0)).ok(url)
+    assert len(server.requests) == 2
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    path = tmp_path / 'links.json'
+    path.write_text('not json')
+    assert links.LinkCache(path).get('https://example.com') is None
+
+
+def test_cache_dir_override(monkeypatch, tmp_path):
+    monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_CACHE_DIR', str(tmp_path))
+    assert links.cache_dir() == tmp_path
+
+
+def test_transient_failures_are_retried(server):
+    server.failures = 2
+    delays = []
+    checker = links.LinkChecker(sleep=delays.append)
+    assert checker.ok(f'{server.url}/flaky')
+    assert len(server.requests) == 3
+    assert len(delays) == 2
+    assert 0 <= delays[0] <= 0.5
+    assert 0 <= delays[1] <= 1
+
+
+def test_persistent_transient_failures_are_not_cached(server):
+    server.failures = 10
+    checker = links.LinkChecker(retries=1, sleep=lambda _: None)
+    url = f'{server.url}/flaky'
+    assert not checker.ok(url)
+    assert len(server.requests) == 2
+    assert checker.cache.get(url) is None
+
+
+def test_fetch(server):
+    server.failures = 1
+    checker = links.LinkChecker(sleep=lambda _: None)
+    assert checker.fetch(f'{server.url}/flaky') == 'Contribute!'
+    assert checker.fetch(f'{server.url}/missing') is None
+    assert checker.fetch('not a url') is None
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_circuit_breaker_fails_fast_on_down_host(closed_port):
+    now = [0.0]
+    checker = links.LinkChecker(retries=0, clock=lambda: now[0], sleep=lambda _: None)
+    urls = [f'http://127.0.0.1:{closed_port}/{i}' for i in range(5)]
+    with mock.patch('urllib.request.urlopen', wraps=urllib.request.urlopen) as mock_urlopen:  # noqa: S310
+        assert not any(checker.ok(url) for url in urls)
+        # After three failures in a row, the host is assumed to be down.
+        assert mock_urlopen.call_count == 3
+        now[0] += 31
+        assert not checker.ok(f'http://127.0.0.1:{closed_port}/again')
+        # One trial request is made once the cooldown is over.
+        assert mock_urlopen.call_count == 4
+
+
+@pytest.fixture
+def garbage_port():
+    """A port that answers every request with a line that isn't HTTP."""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen()
+
+    def serve():
+        while True:
+            try:
+                conn, _ = sock.accept()
+            except OSError:
+                return
+            with conn:
+                conn.recv(4096)
+                conn.sendall(b'garbage\r\n')
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def test_malformed_response_is_transient(garbage_port):
+    checker = links.LinkChecker(retries=1, sleep=lambda _: None)
+    url = f'http://127.0.0.1:{garbage_port}/'
+    assert not checker.ok(url)
+    assert checker.cache.get(url) is None
+    assert checker._health(url).failures == 2
+
+
+def test_circuit_breaker_trial_is_always_finished(closed_port):
+    now = [0.0]
+    checker = links.LinkChecker(retries=0, clock=lambda: now[0], sleep=lambda _: None)
+    url = f'http://127.0.0.1:{closed_port}/'
+    for i in range(3):
+        checker.ok(f'{url}{i}')
+    now[0] += 31
+    with mock.patch('urllib.request.urlopen', side_effect=RuntimeError('unexpected')):
+        with pytest.raises(RuntimeError):
+            checker.ok(f'{url}trial')
+    assert not checker._health(url).trial_in_flight
+
+
+def test_host_timeout_adapts_to_latency():
+    health = links._HostHealth()
+    assert health.timeout(5) == 5
+    health.succeeded(0.1)
+    assert health.timeout(5) == 1
+    for _ in range(20):
+        health.succeeded(0.8)
+    assert 3 < health.timeout(5) <= 3.2
+    health.succeeded(10)
+    assert health.timeout(5) == 5
@@ -0,0 +1,70 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test profiling a run."""
+
+import pstats
+import threading
+import time
+
+from charmhub_listing_review import profiling
+
+
+def _busy(seconds: float) -> list[bytes]:
+    chunks = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        chunks.append(b'x' * 1024)
+    return chunks
+
+
+def test_profiler_writes_reports(tmp_path):
+    directory = tmp_path / 'profile'
+    kept = []
+    with profiling.Profiler(directory, interval=0.001):
+        with profiling.section('evaluate'):
+            thread = threading.Thread(target=lambda: kept.append(_busy(0.05)))
+            thread.start()
+            thread.join()
+        with profiling.section('console_formatting'):
+            kept.append(_busy(0.01))
+
+    stats = pstats.Stats(str(directory / 'profile.pstats'))
+    assert '_busy' in stats.get_stats_profile().func_profiles
+
+    collapsed = (directory / 'profile.collapsed').read_text().splitlines()
+    assert collapsed
+    assert any('_busy' in line for line in collapsed)
+    for line in collapsed:
+        _, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+
+    report = (directory / 'report.txt').read_text()
+    assert 'Top 25 allocations in evaluate:' in report
+    assert 'Top 25 allocations in console_formatting:' in report
+    assert 'test_profiling.py' in report
+    assert profiling._current is None
+
+
+def test_section_without_profiler():
+    with profiling.section('evaluate'):
+        pass
+    assert profiling._current is None
+
+
+def test_profiled_without_directory():
+    with profiling.profiled(None):
+        with profiling.section('evaluate'):
+            pass
+    assert profiling._current is None
@@ -0,0 +1,110 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the GitHub rate limit governor."""
+
+import pytest
+
+from charmhub_listing_review import ratelimit
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _governor(clock, **kwargs):
+    return ratelimit.RateLimitGovernor(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_bursts_then_paces(clock):
+    governor = _governor(clock, rate=2, burst=3)
+    for _ in range(5):
+        governor.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+    assert governor.state()['requests'] == 5
+    assert governor.state()['waited'] == pytest.approx(1.0)
+
+
+def test_slows_down_to_make_quota_last(clock):
+    governor = _governor(clock, rate=10, burst=1, reserve=50)
+    governor.update(5000, 60, clock.now + 100)
+    assert governor.state()['rate'] == pytest.approx(0.1)
+    governor.acquire()
+    governor.acquire()
+    assert clock.sleeps == [10.0]
+
+
+def test_waits_for_reset_when_quota_exhausted(clock):
+    governor = _governor(clock, rate=10, burst=1, reserve=50)
+    governor.update(5000, 10, clock.now + 300)
+    governor.acquire()
+    assert clock.sleeps == [300.0]
+
+
+def test_backoff(clock):
+    governor = _governor(clock, rate=10, burst=5)
+    governor.backoff(30)
+    governor.acquire()
+    assert clock.sleeps[0] == pytest.approx(30.0)
+    # Without a Retry-After, the pause doubles each time.
+    governor.backoff()
+    assert governor.state()['paused_for'] == pytest.approx(120.0)
+    governor.backoff()
+    assert governor.state()['paused_for'] == pytest.approx(240.0)
+    assert governor.state()['secondary_limits'] == 3
+    # A successful update resets the backoff.
+    governor.update(5000, 4000, clock.now + 3600)
+    clock.now += 1000
+    governor.backoff()
+    assert governor.state()['paused_for'] == pytest.approx(60.0)
+
+
+def test_paces_after_backoff(clock):
+    governor = _governor(clock, rate=2, burst=10)
+    governor.backoff(60)
+    for _ in range(10):
+        governor.acquire()
+    assert clock.sleeps == [60.0] + [0.5] * 10
+
+
+def test_update_from_graphql(clock):
+    governor = _governor(clock)
+    governor.update_from_graphql(None)
+    assert governor.remaining is None
+    governor.update_from_graphql({
+        'limit': 5000,
+        'remaining': 4321,
+        'resetAt': '2025-06-01T12:00:00Z',
+    })
+    state = governor.state()
+    assert (state['limit'], state['remaining']) == (5000, 4321)
+    assert state['reset_at'] == '2025-06-01T12:00:00+00:00'
+
+
+def test_default_governor_is_shared():
+    assert ratelimit.default_governor() is ratelimit.default_governor()
@@ -0,0 +1,103 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the index of open reviews."""
+
+from unittest import mock
+
+from charmhub_listing_review import github
+from charmhub_listing_review.review_index import OpenReviewIndex, default_path
+
+
+def _assignment(number, assignees=(), is_open=True, updated_at='2025-06-01T12:00:00Z'):
+    return github.IssueAssignment(number, is_open, list(assignees), updated_at)
+
+
+def _client(*responses):
+    client = mock.Mock(spec=github.GitHub)
+    client.list_assignments.side_effect = list(responses)
+    return client
+
+
+def test_refresh_is_incremental(tmp_path):
+    client = _client(
+        [
+            _assignment(1, ['Alice'], updated_at='2025-06-01T10:00:00Z'),
+            _assignment(2, ['bob']),
+            _assignment(3, ['alice'], updated_at='2025-06-01T11:00:00Z'),
+        ],
+        [
+            _assignment(1, is_open=False, updated_at='2025-06-02T09:00:00Z'),
+            _assignment(4, ['bob']),
+        ],
+    )
+    index = OpenReviewIndex('listing-request', min_refresh_interval=0)
+    index.refresh(client)
+    assert index.load() == {'alice': 2, 'bob': 1}
+    index.refresh(client)
+    assert index.load() == {'alice': 1, 'bob': 2}
+    assert client.list_assignments.call_args_list == [
+        mock.call('listing-request', None),
+        mock.call('listing-request', '2025-06-01T12:00:00Z'),
+    ]
+
+
+def test_refresh_is_rate_limited():
+    client = _client([_assignment(1, ['alice'])])
+    index = OpenReviewIndex('listing-request')
+    index.refresh(client)
+    index.refresh(client)
+    client.list_assignments.assert_called_once()
+
+
+def test_record():
+    index = OpenReviewIndex('listing-request')
+    index.record(5, 'carol')
+    index.record(5, 'carol')
+    assert index.load() == {'carol': 1}
+
+
+def test_persisted(tmp_path):
+    path = tmp_path / 'reviews.json'
+    OpenReviewIndex('listing-request', path).refresh(_client([_assignment(1, ['alice'])]))
+    client = _client([_assignment(2, ['bob'])])
+    index = OpenReviewIndex('listing-request', path)
+    assert index.load() == {'alice': 1}
+    index.refresh(client)
+    # The loaded index only needs the changes.
+    client.list_assignments.assert_called_once_with('listing-request', '2025-06-01T12:00:00Z')
+    assert index.load() == {'alice': 1, 'bob': 1}
+
+
+def test_old_index_is_rebuilt(tmp_path):
+    path = tmp_path / 'reviews.json'
+    OpenReviewIndex('listing-request', path).refresh(_client([_assignment(1, ['alice'])]))
+    client = _client([_assignment(2, ['bob'])])
+    index = OpenReviewIndex('listing-request', path, max_age=-1)
+    index.refresh(client)
+    client.list_assignments.assert_called_once_with('listing-request', None)
+    assert index.load() == {'bob': 1}
+
+
+def test_corrupt_index_is_ignored(tmp_path):
+    path = tmp_path / 'reviews.json'
+    path.write_text('{"issues": []}')
+    assert OpenReviewIndex('listing-request', path).load() == {}
+
+
+def test_default_path(monkeypatch, tmp_path):
+    monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_CACHE_DIR', str(tmp_path))
+    assert default_path('org', 'repo') == tmp_path / 'reviews-org-repo.json'
+    # The repository is only known to gh.
+    assert default_path('{owner}', '{repo}') is None
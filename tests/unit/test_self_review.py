@@ -0,0 +1,103 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the self-review tool."""
+
+import io
+from unittest import mock
+
+import pytest
+
+from charmhub_listing_review import evaluate, self_review
+
+
+def _indexes(*names):
+    return {index for index, check in enumerate(evaluate.CHECKS) if check.name in names}
+
+
+def _changed(before, after):
+    return {index for index, state in after.items() if state != before[index]}
+
+
+def test_file_states_track_the_files_each_check_reads(tmp_path):
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    license_path = tmp_path / 'LICENSE'
+    license_index = _indexes('license_statement').pop()
+    before = self_review._file_states(tmp_path, {license_index: license_path})
+
+    (tmp_path / 'icon.svg').write_text('<svg/>')
+    after = self_review._file_states(tmp_path, {license_index: license_path})
+    assert _changed(before, after) == _indexes('charm_has_icon')
+
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-other-charm\n')
+    license_path.write_text('Apache-2.0')
+    changed = _changed(after, self_review._file_states(tmp_path, {license_index: license_path}))
+    assert changed == _indexes(
+        'metadata_links',
+        'action_names',
+        'option_names',
+        'relations_includes_optional',
+        'charm_has_icon',
+        'charm_lib_docs',
+        'license_statement',
+    )
+
+
+def test_watch_reruns_checks_for_changed_files(tmp_path, capsys):
+    (tmp_path / 'charmcraft.yaml').write_text('name: my-charm\n')
+    runs = []
+
+    def evaluate_iter(*args, checks=None, **kwargs):
+        runs.append(checks)
+        return iter(())
+
+    def sleep(seconds):
+        if len(runs) == 1:
+            (tmp_path / 'pyproject.toml').write_text('[project]\n')
+        else:
+            raise KeyboardInterrupt()
+
+    with (
+        mock.patch.object(self_review, 'evaluate_iter', side_effect=evaluate_iter),
+        mock.patch('time.sleep', side_effect=sleep),
+    ):
+        self_review.watch_self_review(
+            'my-charm', 'https://github.com/org/my-charm-operator', tmp_path, branch='main'
+        )
+
+    assert runs == [None, _indexes('python_requires_version', 'repo_has_lock_file')]
+    assert 'Watching' in capsys.readouterr().out
+
+
+def test_progress_shows_tooling_usage():
+    stream = io.StringIO()
+    progress = self_review.ProgressReporter(stream)
+    usage = evaluate.ResourceUsage(cpu_time=42.4, max_rss=512 * 1024**2)
+    progress.result(
+        evaluate.CheckResult('charmcraft_tooling', '* [x] Tooling.', 0, 1, 61, usage=usage)
+    )
+    assert stream.getvalue().endswith(' (61s, 42s CPU, 512 MiB peak memory)\n')
+
+
+def test_main_rejects_invalid_tooling_limits(monkeypatch, capsys):
+    monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_TOOLING_LIMITS', 'memory=lots')
+    argv = ['--charm-name', 'my-charm', '--repository', 'https://github.com/org/my-charm']
+    with (
+        mock.patch.object(self_review, 'print_self_review_results') as mock_review,
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        self_review.main(argv)
+    assert exc_info.value.code == 2
+    assert "Invalid value for tooling limit 'memory'" in capsys.readouterr().err
+    mock_review.assert_not_called()
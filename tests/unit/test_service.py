@@ -0,0 +1,231 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the long-running review service."""
+
+import hashlib
+import hmac
+import json
+import threading
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import pytest
+
+from charmhub_listing_review import github, ratelimit, service
+from charmhub_listing_review.evaluate import Cancelled, ResourceLimits
+
+
+def _event(number=7, action='opened', labels=('listing-request',), state='open'):
+    return {
+        'action': action,
+        'issue': {
+            'number': number,
+            'state': state,
+            'labels': [{'name': label} for label in labels],
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    'event,expected',
+    [
+        (_event(), 7),
+        (_event(action='labeled'), 7),
+        (_event(action='reopened'), 7),
+        (_event(action='closed'), None),
+        (_event(state='closed'), None),
+        (_event(labels=('bug',)), None),
+        ({'action': 'opened'}, None),
+        ([], None),
+    ],
+)
+def test_issue_number_from_event(event, expected):
+    assert service.issue_number_from_event(event) == expected
+
+
+def _service(**kwargs):
+    client = mock.Mock(spec=github.GitHub)
+    client.governor = ratelimit.RateLimitGovernor()
+    return service.ReviewService(client, **kwargs)
+
+
+def test_queue_full_rejects_events():
+    svc = _service(queue_size=1)
+    assert svc.submit(_event(1))
+    assert not svc.submit(_event(2))
+    # Events that don't need a review are never rejected.
+    assert svc.submit(_event(3, labels=()))
+
+
+@mock.patch.object(service, 'review_issue')
+def test_workers_review_queued_issues(mock_review_issue, tmp_path):
+    limits = ResourceLimits(memory=None)
+    svc = _service(workers=2, assign_to='alice', mirror_dir=tmp_path, dry_run=True, limits=limits)
+    for number in (1, 2, 3):
+        svc.submit(_event(number))
+    svc.start()
+    svc.join()
+    svc.stop()
+    assert sorted(call.args[1] for call in mock_review_issue.call_args_list) == [1, 2, 3]
+    assert all(call.args[0] is svc.client for call in mock_review_issue.call_args_list)
+    kwargs = mock_review_issue.call_args.kwargs
+    assert isinstance(kwargs.pop('cancel'), threading.Event)
+    assert kwargs == {
+        'reviewers_file': None,
+        'assign_to': 'alice',
+        'dry_run': True,
+        'mirror_dir': tmp_path,
+        'reviewer_index': None,
+        'limits': limits,
+    }
+
+
+@mock.patch.object(service, 'review_issue', side_effect=[RuntimeError('boom'), None])
+def test_worker_survives_failed_review(mock_review_issue):
+    svc = _service(workers=1)
+    svc.submit(_event(1))
+    svc.submit(_event(2))
+    svc.start()
+    svc.join()
+    svc.stop()
+    assert mock_review_issue.call_count == 2
+
+
+@mock.patch.object(service, 'review_issue')
+def test_events_for_queued_issue_are_coalesced(mock_review_issue):
+    svc = _service(workers=2)
+    for _ in range(3):
+        assert svc.submit(_event(1))
+    svc.submit(_event(2))
+    assert svc._queue.qsize() == 2
+    svc.start()
+    svc.join()
+    svc.stop()
+    assert sorted(call.args[1] for call in mock_review_issue.call_args_list) == [1, 2]
+
+
+def test_new_event_cancels_review_in_progress():
+    started = threading.Event()
+    cancels = []
+
+    def review_issue(client, issue_number, *, cancel, **kwargs):
+        cancels.append(cancel)
+        if len(cancels) == 1:
+            started.set()
+            assert cancel.wait(5)
+            raise Cancelled()
+
+    svc = _service(workers=2)
+    with mock.patch.object(service, 'review_issue', review_issue):
+        svc.submit(_event(1))
+        svc.start()
+        assert started.wait(5)
+        svc.submit(_event(1))
+        svc.join()
+        svc.stop()
+    assert len(cancels) == 2
+    assert cancels[0].is_set()
+    assert not cancels[1].is_set()
+    assert svc._running == {}
+    assert svc._issue_locks == {}
+
+
+def test_poll_spool(tmp_path):
+    svc = _service(queue_size=2)
+    (tmp_path / '0.json').write_text('{')
+    for number in (1, 2, 3):
+        (tmp_path / f'{number}.json').write_text(json.dumps(_event(number)))
+    assert service.poll_spool(svc, tmp_path) == 2
+    # The queue is full, so the third event waits for the next poll.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['0.invalid', '3.json']
+
+
+@pytest.fixture
+def event_server():
+    svc = _service(queue_size=1)
+    server = service.make_http_server(svc, ('127.0.0.1', 0), secret='s3cret')  # noqa: S106
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield svc, f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, payload, secret=None):
+    data = json.dumps(payload).encode()
+    headers = {'Content-Type': 'application/json'}
+    if secret:
+        digest = hmac.new(secret.encode(), data, hashlib.sha256).hexdigest()
+        headers['X-Hub-Signature-256'] = f'sha256={digest}'
+    request = urllib.request.Request(url, data=data, headers=headers, method='POST')  # noqa: S310
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:  # noqa: S310
+            return response.status, response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers
+
+
+def test_http_endpoint(event_server):
+    svc, url = event_server
+    assert _post(url, _event(1), 's3cret')[0] == 202
+    assert svc._queue.qsize() == 1
+    # The queue is full, so the sender is told to try again later.
+    status, headers = _post(url, _event(2), 's3cret')
+    assert status == 503
+    assert headers['Retry-After']
+
+
+def test_http_endpoint_checks_signature(event_server):
+    svc, url = event_server
+    assert _post(url, _event(1))[0] == 401
+    assert _post(url, _event(1), 'wrong')[0] == 401
+    assert svc._queue.qsize() == 0
+
+
+def test_http_status(event_server):
+    _, url = event_server
+    _post(url, _event(1), 's3cret')
+    with urllib.request.urlopen(f'{url}/status', timeout=5) as response:  # noqa: S310
+        status = json.load(response)
+    assert status['queued'] == [1]
+    assert status['running'] == []
+    assert status['rate_limit']['secondary_limits'] == 0
+
+
+def test_main_requires_webhook_secret(monkeypatch, capsys):
+    monkeypatch.delenv('GITHUB_WEBHOOK_SECRET', raising=False)
+    argv = ['review-service', '--assign-to', 'alice', '--listen', '127.0.0.1:0']
+    monkeypatch.setattr('sys.argv', argv)
+    with mock.patch.object(github, 'connect') as mock_connect, pytest.raises(SystemExit):
+        service.main()
+    assert 'GITHUB_WEBHOOK_SECRET is required' in capsys.readouterr().err
+    mock_connect.assert_not_called()
+
+    # With --insecure, the service gets as far as connecting to GitHub.
+    monkeypatch.setattr('sys.argv', [*argv, '--insecure'])
+    with mock.patch.object(github, 'connect', side_effect=ValueError('no token')):
+        with pytest.raises(SystemExit):
+            service.main()
+    assert 'no token' in capsys.readouterr().err
+
+
+def test_main_rejects_invalid_tooling_limits(monkeypatch, capsys):
+    monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_TOOLING_LIMITS', 'disk=1G')
+    monkeypatch.setattr('sys.argv', ['review-service', '--assign-to', 'alice', '--spool-dir', '.'])
+    with mock.patch.object(github, 'connect') as mock_connect, pytest.raises(SystemExit):
+        service.main()
+    assert "Unknown tooling limit 'disk'" in capsys.readouterr().err
+    mock_connect.assert_not_called()
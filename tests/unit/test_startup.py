@@ -0,0 +1,120 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test that the command line tools start quickly.
+
+self-review runs in pre-commit hooks, so modules that are slow to import are
+only imported when they are needed.
+"""
+
+import json
+import os
+import subprocess  # noqa: S404
+import sys
+
+import pytest
+
+ENTRY_POINTS = {
+    'self-review': 'charmhub_listing_review.worker:self_review_main',
+    'self-review-worker': 'charmhub_listing_review.worker:main',
+    'update-issue': 'charmhub_listing_review.update_issue:main',
+}
+
+# Modules that add noticeably to the start up time, and aren't needed to parse
+# the command line.
+HEAVY_MODULES = [
+    'cProfile',
+    'charmhub_listing_review.discovery',
+    'charmhub_listing_review.github',
+    'concurrent.futures',
+    'difflib',
+    'http.client',
+    'pstats',
+    'resource',
+    'tempfile',
+    'tomllib',
+    'tracemalloc',
+    'urllib.request',
+    'xml.etree.ElementTree',
+    'yaml',
+]
+
+MODULES = [
+    # Without a worker, self-review imports this too.
+    'charmhub_listing_review.self_review',
+    *sorted({entry_point.split(':')[0] for entry_point in ENTRY_POINTS.values()}),
+]
+
+# The cumulative time to import an entry point module, in milliseconds. The
+# default is generous, so that slow or busy CI machines pass: the heavy modules
+# are checked above, and this catches anything else slow being imported at
+# module level. Set the variable to a tighter budget on a known machine.
+IMPORT_BUDGET_MS = float(os.environ.get('CHARMHUB_LISTING_REVIEW_IMPORT_BUDGET_MS', 300))
+
+
+def _python(*args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    ).stderr
+
+
+@pytest.mark.parametrize('command,entry_point', ENTRY_POINTS.items())
+def test_help_does_not_import_heavy_modules(command, entry_point):
+    module, function = entry_point.split(':')
+    script = f"""
+import json, os, sys
+# Make sure that there is no self-review worker to connect to.
+os.environ['XDG_RUNTIME_DIR'] = {os.devnull!r}
+sys.argv = [{command!r}, '--help']
+from {module} import {function} as main
+try:
+    main()
+except SystemExit:
+    pass
+imported = sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules)
+print(json.dumps(imported), file=sys.stderr)
+"""
+    imported = json.loads(_python('-c', script).splitlines()[-1])
+    assert imported == []
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_does_not_import_heavy_modules(module):
+    script = f"""
+import json, sys
+import {module}
+imported = sorted(name for name in {HEAVY_MODULES!r} if name in sys.modules)
+print(json.dumps(imported), file=sys.stderr)
+"""
+    imported = json.loads(_python('-c', script).splitlines()[-1])
+    assert imported == []
+
+
+def _import_time_ms(module):
+    # Each line is "import time: self | cumulative | name", in microseconds.
+    for line in _python('-X', 'importtime', '-c', f'import {module}').splitlines():
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f'{module} was not imported')
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_import_time_budget(module):
+    # Take the best of a few runs (the first also makes sure that the bytecode
+    # is cached), to reduce noise from the machine being busy.
+    elapsed = min(_import_time_ms(module) for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS, (
+        f'Importing {module} took {elapsed:.1f}ms, more than the {IMPORT_BUDGET_MS:.0f}ms budget'
+    )
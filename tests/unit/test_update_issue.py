@@ -14,129 +14,170 @@
 
 """Test the issue comment generation."""
 
-import json
 import pathlib
 from unittest import mock
 
+import pytest
+
 import charmhub_listing_review.update_issue as update_issue
+from charmhub_listing_review import discovery, evaluate, github
+from charmhub_listing_review.review_index import OpenReviewIndex
+
+REVIEWERS = """
+reviewers:
+    "@alice": {team: one}
+    "@Bob": {team: one}
+    "@carol": {team: two}
+    "@dave": {team: three}
+"""
 
 
-@mock.patch('random.choice')
-@mock.patch('subprocess.run')
-@mock.patch('yaml.safe_load')
-@mock.patch('pathlib.Path.open')
-def test_assign_review_multiple_teams(
-    mock_open, mock_yaml_load, mock_subprocess_run, mock_random_choice
-):
-    reviewers_yaml = {
-        'reviewers': {
-            '@alice': {'team': 'team1'},
-            '@bob': {'team': 'team2'},
-            '@carol': {'team': 'team1'},
-        }
-    }
-    mock_yaml_load.return_value = reviewers_yaml
-    mock_open.return_value.__enter__.return_value = mock.Mock()
-    mock_subprocess_run.return_value = mock.Mock()
-    mock_random_choice.return_value = '@bob'
-    reviewer = update_issue.assign_review(42, pathlib.Path('reviewers.yaml'))
-    assert reviewer == '@bob'
-    mock_subprocess_run.assert_called_once_with(
-        [
-            'gh',
-            'issue',
-            'edit',
-            '42',
-            '--add-assignee',
-            'bob',
-        ],
-        check=True,
+@pytest.mark.parametrize(
+    'teams,load,expected',
+    [
+        # The least loaded team, then the least loaded reviewer in it.
+        ('', {'alice': 1, 'carol': 2, 'dave': 3}, '@Bob'),
+        # A team listed without settings uses the defaults.
+        ('teams: {one:}', {'alice': 1, 'carol': 2, 'dave': 3}, '@Bob'),
+        # Weights share reviews unevenly.
+        ('teams: {one: {weight: 3}}', {'alice': 2, 'carol': 1, 'dave': 1}, '@Bob'),
+        # Teams at capacity are skipped...
+        ('teams: {one: {capacity: 1}}', {'alice': 1, 'carol': 2, 'dave': 3}, '@carol'),
+        # ...unless every team is.
+        (
+            'teams: {one: {capacity: 1}, two: {capacity: 1}, three: {capacity: 1}}',
+            {'alice': 1, 'carol': 2, 'dave': 3},
+            '@Bob',
+        ),
+    ],
+)
+def test_pick_reviewer_uses_load(tmp_path, teams, load, expected):
+    reviewers_file = tmp_path / 'reviewers.yaml'
+    reviewers_file.write_text(REVIEWERS + teams)
+    assert update_issue.pick_reviewer(reviewers_file, load) == expected
+
+
+def test_pick_reviewer_breaks_ties_randomly(tmp_path):
+    reviewers_file = tmp_path / 'reviewers.yaml'
+    reviewers_file.write_text(REVIEWERS)
+    with mock.patch('random.choice', side_effect=lambda items: items[-1]) as mock_choice:
+        assert update_issue.pick_reviewer(reviewers_file, {'carol': 1}) == '@dave'
+    assert mock_choice.call_args.args[0] == ['@alice', '@Bob', '@dave']
+
+
+@mock.patch.object(update_issue, 'pick_reviewer', return_value='@carol')
+def test_update_gh_issue_records_assignment(mock_pick_reviewer):
+    client = mock.Mock(spec=github.GitHub)
+    client.list_assignments.return_value = [github.IssueAssignment(1, True, ['alice'], 'now')]
+    index = OpenReviewIndex('listing-request')
+    update_issue.update_gh_issue(
+        _issue(),
+        'title',
+        'comment',
+        client,
+        reviewers_file=pathlib.Path('reviewers.yaml'),
+        reviewer_index=index,
     )
-
-
-@mock.patch('subprocess.run')
-@mock.patch('yaml.safe_load')
-@mock.patch('pathlib.Path.open')
-def test_assign_review_single_team(mock_open, mock_yaml_load, mock_subprocess_run):
-    reviewers_yaml = {
-        'reviewers': {
-            '@alice': {'team': 'team1'},
-        }
-    }
-    mock_yaml_load.return_value = reviewers_yaml
-    mock_open.return_value.__enter__.return_value = mock.Mock()
-    mock_subprocess_run.return_value = mock.Mock()
-    reviewer = update_issue.assign_review(99, pathlib.Path('reviewers.yaml'))
-    assert reviewer == '@alice'
-    mock_subprocess_run.assert_called_once_with(
-        [
-            'gh',
-            'issue',
-            'edit',
-            '99',
-            '--add-assignee',
-            'alice',
-        ],
-        check=True,
+    assert mock_pick_reviewer.call_args.args[1] == {'alice': 1}
+    assert index.load() == {'alice': 1, 'carol': 1}
+
+
+def _issue(assignees=None, number=42, title='my-charm', bot_comment=None):
+    return github.Issue(
+        number=number,
+        id=f'I_{number}',
+        title=title,
+        body='',
+        assignees=assignees or [],
+        bot_comment=bot_comment,
     )
 
 
-@mock.patch('subprocess.run')
-def test_assign_to_overrides_automatic_assignment(mock_subprocess_run):
-    empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+def test_assign_to_overrides_automatic_assignment():
+    client = mock.Mock(spec=github.GitHub)
     update_issue.update_gh_issue(
-        issue_number=42,
+        _issue(),
         summary='Review `my-charm` for public listing on Charmhub',
         comment='test comment',
+        client=client,
         reviewers_file=pathlib.Path('reviewers.yaml'),
         assign_to='tonyandrewmeyer',
     )
     # Should assign to the specified user, not pick randomly.
-    mock_subprocess_run.assert_any_call(
-        ['gh', 'issue', 'edit', '42', '--add-assignee', 'tonyandrewmeyer'],
-        check=True,
-    )
+    client.update_issue.assert_called_once()
+    assert client.update_issue.call_args.kwargs['assignee'] == 'tonyandrewmeyer'
 
 
-@mock.patch('subprocess.run')
-def test_assign_to_strips_at_prefix(mock_subprocess_run):
-    empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+def test_assign_to_strips_at_prefix():
+    client = mock.Mock(spec=github.GitHub)
     update_issue.update_gh_issue(
-        issue_number=42,
+        _issue(),
         summary='Review `my-charm` for public listing on Charmhub',
         comment='test comment',
+        client=client,
         reviewers_file=pathlib.Path('reviewers.yaml'),
         assign_to='@tonyandrewmeyer',
     )
-    mock_subprocess_run.assert_any_call(
-        ['gh', 'issue', 'edit', '42', '--add-assignee', 'tonyandrewmeyer'],
-        check=True,
-    )
+    assert client.update_issue.call_args.kwargs['assignee'] == 'tonyandrewmeyer'
 
 
-@mock.patch('subprocess.run')
-def test_assign_to_dry_run_does_not_call_gh(mock_subprocess_run):
-    empty_comments = json.dumps({'comments': []})
-    mock_subprocess_run.return_value = mock.Mock(returncode=0, stdout=empty_comments)
+def test_assign_to_dry_run_does_not_call_gh(capsys):
+    client = mock.Mock(spec=github.GitHub)
     update_issue.update_gh_issue(
-        issue_number=42,
+        _issue(),
         summary='Review `my-charm` for public listing on Charmhub',
         comment='test comment',
+        client=client,
         reviewers_file=pathlib.Path('reviewers.yaml'),
         dry_run=True,
         assign_to='tonyandrewmeyer',
     )
-    # In dry-run with assign_to, no gh issue edit calls should be made.
-    for call in mock_subprocess_run.call_args_list:
-        args = call[0][0] if call[0] else call[1].get('args', [])
-        assert '--add-assignee' not in args
+    # In dry-run, nothing should be written to the issue.
+    client.update_issue.assert_not_called()
+    out = capsys.readouterr().out
+    assert out.startswith('Review `my-charm` for public listing on Charmhub\n')
+    assert '@tonyandrewmeyer - please assign' in out
+    assert out.rstrip().endswith('test comment')
+
+
+@mock.patch.object(update_issue, 'pick_reviewer')
+def test_update_gh_issue_single_request(mock_pick_reviewer):
+    mock_pick_reviewer.return_value = '@alice'
+    client = mock.Mock(spec=github.GitHub)
+    issue = _issue()
+    update_issue.update_gh_issue(
+        issue,
+        summary='Review `my-charm` for public listing on Charmhub',
+        comment='test comment',
+        client=client,
+        reviewers_file=pathlib.Path('reviewers.yaml'),
+    )
+    client.update_issue.assert_called_once()
+    args, kwargs = client.update_issue.call_args
+    assert args == (issue,)
+    assert kwargs['title'] == 'Review `my-charm` for public listing on Charmhub'
+    assert kwargs['assignee'] == 'alice'
+    assert kwargs['comment'].startswith('@alice - please assign')
+
+
+@mock.patch.object(update_issue, 'pick_reviewer')
+def test_update_gh_issue_keeps_existing_assignee(mock_pick_reviewer):
+    client = mock.Mock(spec=github.GitHub)
+    update_issue.update_gh_issue(
+        _issue(assignees=['bob']),
+        summary='Review `my-charm` for public listing on Charmhub',
+        comment='test comment',
+        client=client,
+        reviewers_file=pathlib.Path('reviewers.yaml'),
+    )
+    mock_pick_reviewer.assert_not_called()
+    kwargs = client.update_issue.call_args.kwargs
+    assert kwargs['assignee'] is None
+    assert kwargs['comment'].startswith('@bob - please assign')
 
 
 @mock.patch('charmhub_listing_review.update_issue.get_default_branch', return_value='main')
-@mock.patch('subprocess.run')
-def test_get_details_from_issue(mock_subprocess_run, mock_get_default_branch):
+def test_details_from_issue_body(mock_get_default_branch):
     issue_body = """
 ### Charm name
 my-charm
@@ -163,8 +204,7 @@ https://ci.example.com/integration
 ### Documentation Link
 https://docs.example.com
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
-    details = update_issue.get_details_from_issue(123)
+    details = update_issue.details_from_issue_body(issue_body)
     assert details['name'] == 'my-charm'
     assert details['demo_url'] == 'https://demo.example.com'
     assert details['project_repo'] == 'https://github.com/canonical/my-charm'
@@ -186,8 +226,7 @@ https://docs.example.com
 
 
 @mock.patch('charmhub_listing_review.update_issue.get_default_branch')
-@mock.patch('subprocess.run')
-def test_get_details_from_issue_with_explicit_branch(mock_subprocess_run, mock_get_default_branch):
+def test_details_from_issue_body_with_explicit_branch(mock_get_default_branch):
     issue_body = """
 ### Charm name
 my-charm
@@ -213,8 +252,7 @@ https://docs.example.com
 ### Review Branch
 26.04
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
-    details = update_issue.get_details_from_issue(123)
+    details = update_issue.details_from_issue_body(issue_body)
     assert details['default_branch'] == '26.04'
     assert (
         details['contribution_link']
@@ -227,8 +265,8 @@ https://docs.example.com
     mock_get_default_branch.assert_not_called()
 
 
-@mock.patch('subprocess.run')
-def test_get_details_from_issue_with_charm_dir(mock_subprocess_run):
+@mock.patch('charmhub_listing_review.update_issue.get_default_branch', return_value='main')
+def test_details_from_issue_body_with_charm_dir(mock_get_default_branch):
     issue_body = """
 ### Charm name
 my-charm
@@ -254,12 +292,292 @@ https://ci.example.com/integration
 ### Documentation Link
 https://docs.example.com
 """
-    mock_subprocess_run.return_value = mock.Mock(stdout=json.dumps({'body': issue_body}))
-    details = update_issue.get_details_from_issue(123)
+    details = update_issue.details_from_issue_body(issue_body)
     assert details['charm_dir'] == 'charms/my-charm'
 
 
+@mock.patch('charmhub_listing_review.update_issue.get_default_branch', return_value='main')
+def test_details_from_issue_body_multiline_demo(mock_get_default_branch):
+    issue_body = """
+### Charm name
+my-charm
+
+### Demo
+Watch https://demo.example.com
+or book a call.
+
+### Project Repository
+https://github.com/canonical/my-charm
+"""
+    details = update_issue.details_from_issue_body(issue_body)
+    assert details['demo'] == 'Watch https://demo.example.com\nor book a call.'
+    assert details['demo_url'] == 'https://demo.example.com'
+    assert details['charm_dir'] == '.'
+    assert set(details['form_errors']) == {
+        'ci_linting',
+        'ci_release_url',
+        'ci_integration_url',
+        'documentation_link',
+    }
+
+
 def test_issue_summary():
     name = 'my-charm'
     summary = update_issue.issue_summary(name)
     assert summary == 'Review `my-charm` for public listing on Charmhub'
+
+
+@mock.patch('urllib.request.urlopen')
+def test_best_practices_are_cached(mock_urlopen, monkeypatch):
+    monkeypatch.setattr(update_issue, '_best_practices_cache', None)
+    mock_urlopen.return_value.__enter__.return_value.read.return_value = (
+        b'# Heading\n\n- Practice one\n- Practice two\n'
+    )
+    assert update_issue._best_practices() == ['- Practice one', '- Practice two']
+    assert update_issue._best_practices() == ['- Practice one', '- Practice two']
+    mock_urlopen.assert_called_once()
+    assert mock_urlopen.call_args.kwargs['timeout'] == update_issue._BEST_PRACTICES_TIMEOUT
+
+
+@mock.patch('urllib.request.urlopen')
+def test_best_practices_download_failure(mock_urlopen, monkeypatch):
+    monkeypatch.setattr(update_issue, '_best_practices_cache', None)
+    mock_urlopen.return_value.__enter__.return_value.read.side_effect = TimeoutError()
+    assert update_issue._best_practices() == []
+    # The failure isn't remembered.
+    mock_urlopen.return_value.__enter__.return_value.read.side_effect = None
+    mock_urlopen.return_value.__enter__.return_value.read.return_value = b'- Practice one\n'
+    assert update_issue._best_practices() == ['- Practice one']
+
+
+def test_update_gh_issue_skips_unchanged(capsys):
+    client = mock.Mock(spec=github.GitHub)
+    summary = 'Review `my-charm` for public listing on Charmhub'
+    update_issue.update_gh_issue(
+        _issue(assignees=['bob']), summary, 'test comment', client, assign_to='bob'
+    )
+    posted = client.update_issue.call_args.kwargs['comment']
+    client.reset_mock()
+    issue = _issue(
+        assignees=['bob'], title=summary, bot_comment=github.IssueComment('IC_1', 1, posted)
+    )
+    capsys.readouterr()
+    assert not update_issue.update_gh_issue(
+        issue, summary, 'test comment', client, assign_to='bob'
+    )
+    client.update_issue.assert_not_called()
+    assert capsys.readouterr().out == 'Issue #42: skipped unchanged assignee, title, comment.\n'
+    assert update_issue.update_gh_issue(issue, summary, 'new comment', client, assign_to='bob')
+    kwargs = client.update_issue.call_args.kwargs
+    assert kwargs['assignee'] is None
+    assert kwargs['title'] is None
+    assert kwargs['comment'].startswith('@bob - please assign')
+    assert capsys.readouterr().out == 'Issue #42: skipped unchanged assignee, title.\n'
+
+
+def test_comment_hash_ignores_line_endings_and_marker():
+    client = mock.Mock(spec=github.GitHub)
+    update_issue.update_gh_issue(_issue(assignees=['bob']), 'title', 'a\nb', client)
+    posted = client.update_issue.call_args.kwargs['comment']
+    assert posted.rstrip().endswith(
+        f'<!-- listing-review-hash: {update_issue.comment_hash(posted)} -->'
+    )
+    # GitHub may return the comment with different line endings.
+    client.reset_mock()
+    edited = github.IssueComment('IC_1', 1, posted.replace('\n', '\r\n'))
+    assert not update_issue.update_gh_issue(
+        _issue(assignees=['bob'], title='title', bot_comment=edited), 'title', 'a\nb', client
+    )
+    client.update_issue.assert_not_called()
+
+
+def test_posted_comment_is_found_as_bot_comment():
+    client = mock.Mock(spec=github.GitHub)
+    update_issue.update_gh_issue(_issue(assignees=['bob']), 'title', 'comment', client)
+    posted = client.update_issue.call_args.kwargs['comment']
+    assert github._BOT_COMMENT_MARKER_RE.search(posted)
+    comment = {'id': 'IC_1', 'databaseId': 1, 'viewerDidAuthor': True, 'body': posted}
+    assert github._bot_comment([comment]) == github.IssueComment('IC_1', 1, posted)
+
+
+def _issue_data():
+    repo = 'https://github.com/canonical/my-charm'
+    return update_issue._IssueData(
+        name='my-charm',
+        demo='https://demo.example.com',
+        demo_url='https://demo.example.com',
+        project_repo=repo,
+        charm_dir='.',
+        ci_linting='https://ci.example.com/lint',
+        ci_release_url='https://ci.example.com/release',
+        ci_integration_url='https://ci.example.com/integration',
+        documentation_link='https://docs.example.com',
+        default_branch='main',
+        contribution_link=f'{repo}/blob/main/CONTRIBUTING.md',
+        license_link=f'{repo}/blob/main/LICENSE',
+        security_link=f'{repo}/blob/main/SECURITY.md',
+        form_errors={},
+    )
+
+
+@mock.patch.object(update_issue, 'evaluate_iter')
+def test_apply_automated_checks_lists_timed_out_checks(mock_evaluate_iter):
+    mock_evaluate_iter.return_value = [
+        evaluate.CheckResult('charm_has_icon', '* [x] The charm has an icon.', 1, 2, 0.1),
+        evaluate.CheckResult('charmcraft_tooling', '* [ ] Timed out.', 0, 2, 5, timed_out=True),
+    ]
+    issue_data = _issue_data()
+    limits = evaluate.ResourceLimits(memory=None)
+    comment = update_issue.apply_automated_checks(
+        issue_data, '* [ ] The charm has an icon.', deadline=10, limits=limits
+    )
+    assert comment == (
+        '* [x] The charm has an icon.\n\n### Automated checks\n\n'
+        'These checks did not finish in time, so need to be done by hand: `charmcraft_tooling`.'
+    )
+    assert mock_evaluate_iter.call_args.kwargs['deadline'] == 10
+    assert mock_evaluate_iter.call_args.kwargs['limits'] == limits
+    assert issue_data['form_errors'] == {}
+
+
+@mock.patch.object(update_issue, 'evaluate_iter')
+def test_apply_automated_checks_reports_wrong_charm_dir(mock_evaluate_iter):
+    charms = [
+        discovery.Charm('charms/my-charm', 'my-charm', 'charm', ''),
+        discovery.Charm('charms/other', 'other', 'charm', ''),
+    ]
+    mock_evaluate_iter.side_effect = evaluate.CharmDirError(
+        'wrong', 'charm/my-charm', charms, charms[:1]
+    )
+    issue_data = _issue_data()
+    issue_data['charm_dir'] = 'charm/my-charm'
+    comment = update_issue.apply_automated_checks(issue_data, '* [ ] The charm has an icon.')
+    assert comment == '* [ ] The charm has an icon.'
+    assert list(issue_data['form_errors']) == ['charm_dir']
+    problem = issue_data['form_errors']['charm_dir']
+    assert '`charm/my-charm` does not.' in problem
+    assert problem.endswith('Did you mean `charms/my-charm`?')
+
+    mock_evaluate_iter.side_effect = evaluate.CharmDirError('wrong', 'charm', charms, [])
+    issue_data = _issue_data()
+    issue_data['charm_dir'] = 'charm'
+    update_issue.apply_automated_checks(issue_data, '')
+    problem = issue_data['form_errors']['charm_dir']
+    assert problem.endswith(
+        'The charms in the repository are in `charms/my-charm`, `charms/other`.'
+    )
+
+    many = [discovery.Charm(f'charms/c{i}', f'c{i}', 'charm', '') for i in range(12)]
+    mock_evaluate_iter.side_effect = evaluate.CharmDirError('wrong', 'charm', many, [])
+    update_issue.apply_automated_checks(issue_data, '')
+    problem = issue_data['form_errors']['charm_dir']
+    assert problem.endswith('`charms/c9`, and 2 more.')
+
+
+@mock.patch.object(update_issue, '_prepare_review')
+def test_sweep(mock_prepare_review, capsys):
+    summary = 'Review `my-charm` for public listing on Charmhub'
+    client = mock.Mock(spec=github.GitHub)
+    # Find out what the bot comment looks like for an unchanged issue.
+    update_issue.update_gh_issue(_issue(assignees=['bob']), summary, 'same', client)
+    posted = client.update_issue.call_args.kwargs['comment']
+    client.reset_mock()
+    client.list_open_issues.return_value = [
+        _issue(['bob'], 1, summary, github.IssueComment('IC_1', 1, posted)),
+        _issue(['bob'], 2, summary, github.IssueComment('IC_2', 2, posted)),
+        _issue(['bob'], 3, summary),
+    ]
+
+    def prepare_review(issue, mirror_dir=None, cancel=None, deadline=None, limits=None):
+        if issue.number == 2:
+            return summary, 'changed'
+        if issue.number == 3:
+            raise RuntimeError('clone failed')
+        return summary, 'same'
+
+    mock_prepare_review.side_effect = prepare_review
+    updated, unchanged, failed = update_issue.sweep(client, concurrency=2)
+    assert (updated, unchanged, failed) == ([2], [1], [3])
+    client.list_open_issues.assert_called_once_with('listing-request')
+    client.update_issue.assert_called_once()
+    assert client.update_issue.call_args.args[0].number == 2
+    assert 'Could not review issue #3: clone failed' in capsys.readouterr().err
+
+
+def test_shard_index_is_stable():
+    assert update_issue.shard_index('my-charm', 'https://github.com/org/my-charm', 4) == (
+        update_issue.shard_index(' My-Charm', 'https://github.com/org/my-charm.git/', 4)
+    )
+    charms = [(f'charm-{i}', f'https://github.com/org/charm-{i}') for i in range(200)]
+    shards = [update_issue.shard_index(name, repo, 4) for name, repo in charms]
+    # Every charm is in exactly one shard, and the shards are reasonably even.
+    assert set(shards) == {0, 1, 2, 3}
+    assert all(shards.count(index) > 25 for index in range(4))
+
+
+@pytest.mark.parametrize('value', ['4/4', '-1/4', '1', 'a/b', '1/0'])
+def test_parse_shard_invalid(value):
+    with pytest.raises(ValueError):
+        update_issue.parse_shard(value)
+
+
+@mock.patch.object(update_issue, '_prepare_review')
+def test_sweep_shards_are_disjoint(mock_prepare_review):
+    mock_prepare_review.return_value = ('summary', 'comment')
+    issues = [
+        github.Issue(
+            number=i,
+            id=f'I_{i}',
+            title='',
+            body=f'### Charm name\ncharm-{i}\n\n### Project Repository\nhttps://github.com/o/c{i}\n',
+            assignees=['bob'],
+            bot_comment=None,
+        )
+        for i in range(1, 21)
+    ]
+    client = mock.Mock(spec=github.GitHub)
+    client.list_open_issues.return_value = issues
+    reports = []
+    for index in range(3):
+        result = update_issue.sweep(client, shard=(index, 3))
+        reports.append(update_issue.sweep_report(*result, shard=(index, 3)))
+    merged = update_issue.merge_reports(reports)
+    assert merged['shards'] == ['0/3', '1/3', '2/3']
+    assert merged['updated'] == list(range(1, 21))
+    assert client.update_issue.call_count == 20
+
+
+def test_merge_reports_requires_every_shard():
+    reports = [
+        update_issue.sweep_report([1], [], [], shard=(0, 3)),
+        update_issue.sweep_report([2], [], [], shard=(2, 3)),
+    ]
+    with pytest.raises(ValueError, match='exactly once'):
+        update_issue.merge_reports(reports)
+    with pytest.raises(ValueError, match='different shard counts'):
+        update_issue.merge_reports([*reports, update_issue.sweep_report([], [], [], (1, 2))])
+
+
+def test_main_rejects_invalid_tooling_limits(monkeypatch, capsys):
+    monkeypatch.setenv('CHARMHUB_LISTING_REVIEW_TOOLING_LIMITS', 'disk=1G')
+    monkeypatch.setattr('sys.argv', ['update-issue', '--issue-number', '1', '--assign-to', 'bob'])
+    with mock.patch.object(github, 'connect') as mock_connect, pytest.raises(SystemExit):
+        update_issue.main()
+    assert "Unknown tooling limit 'disk'" in capsys.readouterr().err
+    mock_connect.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    'argv,message',
+    [
+        (['--issue-number', '1', '--shard', '0/2'], '--shard can only be used with --sweep'),
+        (['--merge-reports', 'a.json', '--shard', '0/2'], '--shard can only be used'),
+        (['--issue-number', '1', '--report', 'r.json'], '--report can only be used'),
+    ],
+)
+def test_main_rejects_sweep_options_without_sweep(monkeypatch, capsys, argv, message):
+    monkeypatch.setattr('sys.argv', ['update-issue', '--assign-to', 'bob', *argv])
+    with mock.patch.object(github, 'connect') as mock_connect, pytest.raises(SystemExit):
+        update_issue.main()
+    assert message in capsys.readouterr().err
+    mock_connect.assert_not_called()
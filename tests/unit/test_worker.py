@@ -0,0 +1,84 @@
+# Copyright 2025 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the background self-review worker."""
+
+import subprocess  # noqa: S404
+import sys
+import threading
+import time
+
+import pytest
+
+from charmhub_listing_review import worker
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # Unix socket paths are limited to around 100 characters.
+    return tmp_path / 'w.sock'
+
+
+@pytest.fixture
+def running_worker(socket_path):
+    thread = threading.Thread(target=worker.serve, args=(socket_path, 5), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not socket_path.exists():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    yield socket_path
+
+
+def _client(socket_path, *args):
+    # The client runs in its own process, since the worker redirects this
+    # process's output while it runs a review.
+    script = (
+        'import pathlib, sys\n'
+        'from charmhub_listing_review import worker\n'
+        f'code = worker.run(sys.argv[1:], pathlib.Path({str(socket_path)!r}))\n'
+        'sys.exit(99 if code is None else code)\n'
+    )
+    return subprocess.run(
+        [sys.executable, '-c', script, *args], capture_output=True, text=True, check=False
+    )
+
+
+def test_run_without_worker(socket_path):
+    assert worker.run(['--help'], socket_path) is None
+
+
+def test_run_in_worker(running_worker):
+    result = _client(running_worker, '--help')
+    assert result.returncode == 0
+    assert result.stdout.startswith('usage: self-review')
+
+    result = _client(running_worker, '--charm-name', 'my-charm')
+    assert result.returncode == 2
+    assert 'one of the arguments --repository --path is required' in result.stderr
+
+    # An abbreviated --watch would block the worker, so isn't accepted.
+    result = _client(running_worker, '--path', '.', '--charm-name', 'my-charm', '--wat')
+    assert result.returncode == 2
+    assert 'unrecognized arguments: --wat' in result.stderr
+
+
+def test_only_one_worker(running_worker):
+    with pytest.raises(RuntimeError, match='already listening'):
+        worker.serve(running_worker)
+
+
+def test_exits_when_idle(socket_path):
+    worker.serve(socket_path, idle_timeout=0.05)
+    assert not socket_path.exists()